@@ -15,6 +15,8 @@ __all__ = [
     'verbosity',
     'ProfilerContext',
     'profilerDecoration',
+    'StartupPhase',
+    'getStartupProfile',
     'getContext',
     'resetContext',
     'unsafeResetContext',
@@ -26,7 +28,12 @@ from .consts import getVersionString
 
 from . import exceptions
 from .logger import log, verbosity
-from .profiler import ProfilerContext, profilerDecoration
+from .profiler import (
+    ProfilerContext,
+    profilerDecoration,
+    StartupPhase,
+    getStartupProfile,
+)
 
 from .contextmanager import (
     getContext,
@@ -8,6 +8,9 @@ Authors:
 * Miguel Guthridge [hdsq@outlook.com, HDSQ#2154]
 """
 
+import ui
+from typing import Optional
+
 from common.logger import log, verbosity
 from common.util.apifixes import (
     PluginIndex,
@@ -16,7 +19,19 @@ from common.util.apifixes import (
     EffectIndex,
     WindowIndex,
 )
-from common.util.apifixes import getFocusedPluginIndex, getFocusedWindowIndex
+from common.focuschanges import (
+    FocusChange,
+    FocusPublisher,
+    WindowChanged,
+    GeneratorChanged,
+    EffectChanged,
+    SplitToggled,
+)
+from common.util.apifixes import (
+    FocusSnapshot,
+    getFocusedPluginIndex,
+    getFocusedWindowIndex,
+)
 
 
 class ActivityState:
@@ -37,6 +52,13 @@ class ActivityState:
         self._plug_active = True if self._plugin is not None else False
         self._changed = False
         self._plug_unsafe = False
+        self._snapshot: Optional[FocusSnapshot] = None
+        self._focus_dirty = True
+        # Number of ticks where the previous snapshot was reused
+        self.reused_snapshots = 0
+        # Publishes focus changes to the parts of the script that depend on
+        # the focus
+        self.changes = FocusPublisher()
 
     def inspect(self):
         """
@@ -46,14 +68,51 @@ class ActivityState:
         print(f"Active: {'plugin' if self._plug_active else 'window'}")
         print(f"Updating: {self._doUpdate}")
         print(f"Split: {self._split}")
+        print(f"Focus: {self._snapshot}")
+        print(f"Reused focus snapshots: {self.reused_snapshots}")
         return ''
 
-    def _forcePlugUpdate(self) -> None:
+    def invalidateFocus(self) -> None:
+        """
+        Called when FL Studio indicates that the focused window has changed,
+        so that the focus is fully checked on the next tick, even if the
+        focused form ID is the same.
+        """
+        self._focus_dirty = True
+
+    def getFocusSnapshot(self) -> FocusSnapshot:
+        """
+        Returns a snapshot of the focused form, taking a new one only if the
+        focus may have changed since the last snapshot.
+
+        The focused form ID is checked every time. If it is unchanged and FL
+        Studio hasn't indicated that the focused window changed, the previous
+        snapshot is reused, saving calls to the FL Studio API.
+
+        ### Returns:
+        * `FocusSnapshot`: snapshot of focus
+        """
+        form_id = ui.getFocusedFormID()
+        if (
+            self._snapshot is not None
+            and not self._focus_dirty
+            and self._snapshot.form_id == form_id
+        ):
+            self.reused_snapshots += 1
+            return self._snapshot
+        self._focus_dirty = False
+        self._snapshot = FocusSnapshot(form_id)
+        return self._snapshot
+
+    def _forcePlugUpdate(self, snapshot: FocusSnapshot) -> None:
         """
         Update the active plugin when other things are active (eg windows).
         Used so that split windows and plugins behaves correctly.
+
+        ### Args:
+        * `snapshot` (`FocusSnapshot`): snapshot of focus for this tick
         """
-        plugin = getFocusedPluginIndex(force=True)
+        plugin = getFocusedPluginIndex(force=True, snapshot=snapshot)
         if plugin is None:
             if not self._plug_unsafe:
                 log(
@@ -71,14 +130,56 @@ class ActivityState:
         else:
             self._effect = plugin  # type: ignore
 
+    def _publishChanges(
+        self,
+        window: WindowIndex,
+        generator: GeneratorIndex,
+        effect: EffectIndex,
+        plug_active: bool,
+    ) -> None:
+        """
+        Publish events for anything that differs from the given previous
+        state
+
+        ### Args:
+        * `window` (`WindowIndex`): previous window
+        * `generator` (`GeneratorIndex`): previous generator
+        * `effect` (`EffectIndex`): previous effect
+        * `plug_active` (`bool`): whether plugins were previously addressed
+        """
+        events: list[FocusChange] = []
+        if window != self._window:
+            events.append(WindowChanged(window, self._window))
+        if generator != self._generator:
+            events.append(GeneratorChanged(generator, self._generator))
+        if effect != self._effect:
+            events.append(EffectChanged(effect, self._effect))
+        if plug_active != self._plug_active:
+            events.append(SplitToggled(self._plug_active))
+        if len(events):
+            log(
+                "state.active",
+                f"Focus changed: {events}",
+                verbosity.INFO,
+            )
+            self.changes.publish(events)
+
     def tick(self) -> None:
         """
         Called frequently when we need to update the current window
         """
         self._changed = False
         if self._doUpdate:
+            previous = (
+                self._window,
+                self._generator,
+                self._effect,
+                self._plug_active,
+            )
+            # Take a single snapshot of the focus, shared by everything below
+            snapshot = self.getFocusSnapshot()
             # Manually update plugin using selection
-            if (window := getFocusedWindowIndex()) is not None:
+            if (window := getFocusedWindowIndex(snapshot)) is not None:
                 if window != self._window:
                     self._changed = True
                 self._window = window
@@ -86,8 +187,10 @@ class ActivityState:
                     if self._plug_active:
                         self._changed = True
                     self._plug_active = False
-                self._forcePlugUpdate()
-            elif (plugin := getFocusedPluginIndex()) is not None:
+                self._forcePlugUpdate(snapshot)
+            elif (
+                plugin := getFocusedPluginIndex(snapshot=snapshot)
+            ) is not None:
                 self._plug_unsafe = False
                 if plugin != self._plugin:
                     self._changed = True
@@ -103,7 +206,8 @@ class ActivityState:
                         self._changed = True
                     self._plug_active = True
             else:
-                self._forcePlugUpdate()
+                self._forcePlugUpdate(snapshot)
+            self._publishChanges(*previous)
 
     def hasChanged(self) -> bool:
         """
@@ -212,6 +316,9 @@ class ActivityState:
                              "they are being addressed independently")
         else:
             self._changed = True
+            previous = self._plug_active
             self._plug_active = \
                 not self._plug_active if value is None else value
+            if previous != self._plug_active:
+                self.changes.publish([SplitToggled(self._plug_active)])
             return self._plug_active
@@ -0,0 +1,187 @@
+"""
+common > backgroundtasks
+
+Contains the TaskRunner class, which allows long-running work, such as
+scanning every mixer track, to be spread over multiple ticks.
+
+Tasks are generators, which yield after each small slice of work, and return
+their result when they finish. For example:
+
+>>> def scanTracks() -> Task[list[int]]:
+>>>     tracks = []
+>>>     for i in range(mixer.trackCount()):
+>>>         if mixer.isTrackSelected(i):
+>>>             tracks.append(i)
+>>>         yield
+>>>     return tracks
+>>>
+>>> getContext().tasks.submit("Scan tracks", scanTracks(), self.onScanned)
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+"""
+
+from time import perf_counter
+from typing import Callable, Generic, Optional, TypeVar
+from collections.abc import Generator
+
+# Imported as a module, since utilities that use this are imported by the
+# logger
+from common import logger
+
+T = TypeVar("T")
+
+# A generator that yields after each slice of work and returns its result
+Task = Generator[None, None, T]
+
+
+def runToCompletion(task: 'Task[T]') -> T:
+    """
+    Run a task immediately, rather than in the background
+
+    ### Args:
+    * `task` (`Task[T]`): task to run
+
+    ### Returns:
+    * `T`: result of the task
+    """
+    while True:
+        try:
+            next(task)
+        except StopIteration as e:
+            return e.value
+
+
+class BackgroundTask(Generic[T]):
+    """
+    A task that has been submitted to a TaskRunner
+    """
+
+    def __init__(
+        self,
+        name: str,
+        task: 'Task[T]',
+        callback: Optional[Callable[[T], None]],
+    ) -> None:
+        """
+        Create a BackgroundTask
+
+        ### Args:
+        * `name` (`str`): name of task, used for logging
+        * `task` (`Task[T]`): generator to resume
+        * `callback` (`Callable[[T], None]`, optional): function to call with
+          the result when the task finishes
+        """
+        self.name = name
+        self._task = task
+        self._callback = callback
+        self._done = False
+        self._steps = 0
+
+    def __repr__(self) -> str:
+        state = "done" if self._done else f"{self._steps} steps"
+        return f"BackgroundTask ({self.name}, {state})"
+
+    def isDone(self) -> bool:
+        """
+        Returns whether the task has finished or been cancelled
+
+        ### Returns:
+        * `bool`: whether the task is done
+        """
+        return self._done
+
+    def cancel(self) -> None:
+        """
+        Cancel the task, so that it isn't resumed, and its callback isn't
+        called
+        """
+        if not self._done:
+            self._done = True
+            self._task.close()
+
+    def step(self) -> None:
+        """
+        Resume the task for a single slice of work, calling its callback if it
+        finishes
+        """
+        if self._done:
+            return
+        self._steps += 1
+        try:
+            next(self._task)
+        except StopIteration as e:
+            self._done = True
+            logger.log(
+                "general.tasks",
+                f"Background task '{self.name}' finished after {self._steps} "
+                f"steps",
+                logger.verbosity.NOTE,
+            )
+            if self._callback is not None:
+                self._callback(e.value)
+        except Exception:
+            # Don't try to resume the task again
+            self._done = True
+            raise
+
+
+class TaskRunner:
+    """
+    Resumes background tasks a slice at a time, taking turns between tasks,
+    until the time budget for the tick is used up.
+    """
+
+    def __init__(self) -> None:
+        self._tasks: list[BackgroundTask] = []
+        self._next = 0
+
+    def __repr__(self) -> str:
+        return f"TaskRunner ({len(self._tasks)} tasks)"
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def submit(
+        self,
+        name: str,
+        task: 'Task[T]',
+        callback: Optional[Callable[[T], None]] = None,
+    ) -> BackgroundTask[T]:
+        """
+        Submit a task to be run in the background
+
+        ### Args:
+        * `name` (`str`): name of task, used for logging
+        * `task` (`Task[T]`): generator to resume
+        * `callback` (`Callable[[T], None]`, optional): function to call with
+          the result when the task finishes. Defaults to None.
+
+        ### Returns:
+        * `BackgroundTask[T]`: submitted task, which can be cancelled
+        """
+        t = BackgroundTask(name, task, callback)
+        self._tasks.append(t)
+        return t
+
+    def tick(self, budget: float) -> None:
+        """
+        Resume tasks until the budget is used up. At least one slice of work
+        is done, so that tasks always make progress.
+
+        ### Args:
+        * `budget` (`float`): time in ms to spend on tasks
+        """
+        start = perf_counter()
+        while len(self._tasks):
+            self._next %= len(self._tasks)
+            task = self._tasks[self._next]
+            try:
+                task.step()
+            finally:
+                if task.isDone():
+                    self._tasks.remove(task)
+                else:
+                    self._next += 1
+            if (perf_counter() - start) * 1000 >= budget:
+                break
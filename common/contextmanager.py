@@ -15,18 +15,28 @@ __all__ = [
     'unsafeResetContext'
 ]
 
+import midi
+
+import common
 from . import logger
 from typing import NoReturn, Optional, Callable, TYPE_CHECKING
-from time import time_ns
+from time import perf_counter, time_ns
 
 from .settings import Settings
 from .activitystate import ActivityState
+from .focuschanges import FocusChange
 
 from .util.apifixes import catchUnsafeOperation
 from .util.misc import NoneNoPrintout
 from .util.events import isEventForwarded, isEventForwardedHere
 from .types import EventData
-from .profiler import ProfilerManager
+from .profiler import ProfilerContext, ProfilerManager, StartupPhase
+from .scheduler import TickScheduler
+from .refresh import RefreshPublisher, decodeRefreshFlags
+from .inputqueue import InputQueue, isEventDeferrable
+from .loadcontroller import LoadController
+from .idledetector import IdleDetector
+from .backgroundtasks import TaskRunner
 
 from .states import (
     IScriptState,
@@ -38,6 +48,12 @@ if TYPE_CHECKING:
     from devices import Device
 
 
+# Refresh flags which indicate that the plugins that are loaded or focused may
+# have changed
+PLUGIN_REFRESH_FLAGS = \
+    midi.HW_Dirty_FocusedWindow | midi.HW_Dirty_Mixer_Display
+
+
 class DeviceContextManager:
     """Defines the context for the entire script, which allows the modular
     components of script to be dynamically refreshed and reloaded, as well as
@@ -50,7 +66,8 @@ class DeviceContextManager:
         """Initialise the context manager, including reloading any required
         modules
         """
-        self.settings = Settings()
+        with StartupPhase("Load settings"):
+            self.settings = Settings()
         self.active = ActivityState()
         # Set the state of the script to wait for the device to be recognised
         self.state: Optional[IScriptState] = None
@@ -58,12 +75,27 @@ class DeviceContextManager:
             self.profiler: Optional[ProfilerManager] = ProfilerManager()
         else:
             self.profiler = None
+        self.scheduler = TickScheduler()
+        self.refreshes = RefreshPublisher()
+        self.load = LoadController()
+        self.idle = IdleDetector()
+        self.tasks = TaskRunner()
+        self.active.changes.subscribe(self._onFocusChange)
+        # Events waiting to be processed on the next tick, if enabled
+        if self.settings.get("input.deferred"):
+            self.input_queue: Optional[InputQueue] = InputQueue(
+                self.settings.get("input.queue_size"))
+        else:
+            self.input_queue = None
         # Time the device last ticked at
         self._last_tick = time_ns()
         self._ticks = 0
         self._dropped_ticks = 0
         self._device: Optional['Device'] = None
 
+    def _onFocusChange(self, event: FocusChange) -> None:
+        self.idle.wake("focus changed")
+
     @catchStateChangeException
     def initialise(self, state: IScriptState) -> None:
         """Initialise the controller associated with this context manager.
@@ -99,6 +131,17 @@ class DeviceContextManager:
             return
         if self.state is None:
             raise MissingContextException("State not set")
+        self.idle.wake("input")
+        # Queue events that can wait until the next tick, so that the MIDI
+        # callback returns quickly
+        if self.input_queue is not None and isEventDeferrable(event):
+            if self.input_queue.push(event):
+                event.handled = True
+                return
+            # The queue is full, so process the events that are already
+            # queued first, so that older values don't overwrite this one
+            with ProfilerContext("Process queued events"):
+                self.state.processEventBatch(self.input_queue.drain())
         self.state.processEvent(event)
 
     @catchUnsafeOperation
@@ -111,17 +154,56 @@ class DeviceContextManager:
             raise MissingContextException("State not set")
         # Update number of ticks
         self._ticks += 1
-        # If the last tick was over 60 ms ago, then our script is getting laggy
-        # Skip this tick to compensate
         last_tick = self._last_tick
         self._last_tick = time_ns()
+        # If nothing is happening, only tick occasionally to save CPU. This
+        # only applies once the device is recognised, so that detection can
+        # time out
+        if self._device is not None and self.idle.shouldSkipTick():
+            return
+        # If the last tick was over 60 ms ago, then our script is getting laggy
+        # Only do essential work this tick to compensate
         if (self._last_tick - last_tick) / 1_000_000 > 60:
             self._dropped_ticks += 1
-            return
+            self.scheduler.beginTick(0.0)
+        else:
+            self.scheduler.beginTick(self.settings.get("tick.budget"))
+        start = perf_counter()
         # Tick active plugin
         self.active.tick()
+        # Process events that were queued since the last tick
+        if self.input_queue is not None and len(self.input_queue):
+            with ProfilerContext("Process queued events"):
+                self.state.processEventBatch(self.input_queue.drain())
         # The tick the current script state
         self.state.tick()
+        # Reduce the work done by later ticks if we're under load
+        self.load.record((perf_counter() - start) * 1000)
+
+    def refresh(self, flags: int) -> None:
+        """
+        Called when FL Studio indicates that something has changed, as given
+        by the flags
+
+        ### Args:
+        * `flags` (`int`): flags indicating what has changed
+        """
+        logger.log(
+            "general.refresh",
+            f"Refreshed: {', '.join(decodeRefreshFlags(flags))}",
+            logger.verbosity.EVENT,
+        )
+        if flags & PLUGIN_REFRESH_FLAGS:
+            # The plugins at each index may have changed
+            common.ExtensionManager.invalidatePluginIndexes()
+        if flags & midi.HW_Dirty_FocusedWindow:
+            # The focus may have changed without the form ID changing
+            self.active.invalidateFocus()
+        # Let plugins know what changed, so that they only poll FL Studio
+        # when required
+        self.refreshes.publish(flags)
+        self.idle.wake("refresh")
+        self.tick()
 
     def getTickNumber(self) -> int:
         """
@@ -136,7 +218,8 @@ class DeviceContextManager:
 
     def getDroppedTicks(self) -> str:
         """
-        Returns the number of ticks dropped by the controller
+        Returns the number of ticks dropped by the controller, where only
+        essential work was done since the script was lagging
 
         This is a good indicator of script performance
 
@@ -34,6 +34,48 @@ CONFIG = {
         # Whether performance profiling should be enabled
         "profiling": False
     },
+    # Settings used to manage the work done each tick
+    "tick": {
+        # The maximum time (in ms) to spend ticking plugins each tick. Plugins
+        # whose ticks are expected to take longer than the remaining time are
+        # deferred to the next tick. Applying plugins to the device is always
+        # done, regardless of this.
+        "budget": 15.0,
+        # The maximum rate (in Hz) at which plugins are ticked to read the
+        # state of FL Studio, unless they specify their own rate. Set to 0 to
+        # tick plugins every tick.
+        "poll_rate": 0,
+        # The maximum rate (in Hz) at which plugins are applied to update the
+        # device, unless they specify their own rate. Set to 0 to apply
+        # plugins every tick.
+        "apply_rate": 0,
+        # Average tick times (in ms) above which non-essential work is
+        # reduced, in stages. Each stage is undone once the average falls
+        # below 75% of its threshold. In order, the stages:
+        # * stop the press plugin fading controls
+        # * refresh Launchkey drum pad lights less often
+        # * only send annotations to the device every few ticks
+        # * poll standard and window plugins less often
+        "load_thresholds": [10.0, 15.0, 20.0, 25.0],
+        # The time (in seconds) without any input, refreshes from FL Studio,
+        # focus changes or playback, after which the script only ticks
+        # occasionally to reduce CPU usage. Set to 0 to disable this.
+        "idle_timeout": 5.0,
+        # The rate (in Hz) at which the script ticks while idle
+        "idle_tick_rate": 2.0,
+    },
+    # Settings used when processing MIDI events
+    "input": {
+        # Whether events (other than notes and sysex) should be queued and
+        # processed on the next tick, rather than when they are received.
+        # This keeps FL Studio's MIDI callback short under heavy controller
+        # traffic, and allows fader and knob movements to be merged, but
+        # means that events are never passed on to FL Studio.
+        "deferred": False,
+        # The maximum number of events to queue. Events received when the
+        # queue is full are processed immediately.
+        "queue_size": 64,
+    },
     # Settings used during script initialisation
     "bootstrap": {
         # Whether to skip sending sysex messages when attempting to recognise
@@ -65,7 +107,15 @@ CONFIG = {
         "general": {
             # Whether values that have a centred default should snap close
             # values to the default
-            "do_snap": True
+            "do_snap": True,
+            # The maximum number of standard and window plugin instances to
+            # keep loaded. Least recently used plugins are unloaded once this
+            # is reached. Set to 0 for no limit.
+            "cache_size": 16,
+            # The maximum time (in ms) to spend each tick instantiating
+            # plugins that are loaded in the project before they are used.
+            # Set to 0 to disable this.
+            "prewarm_budget": 1.0,
         },
         # FL Studio mixer
         "mixer": {
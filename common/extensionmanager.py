@@ -8,16 +8,50 @@ Authors:
 * Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
 """
 
-from typing import TYPE_CHECKING, Optional, overload
-
+import plugins
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Optional,
+    TypedDict,
+    TypeVar,
+    cast,
+    overload,
+)
+
+from common.contextmanager import getContext
 from common.exceptions import DeviceRecogniseError
+from common.profiler import StartupPhase, getStartupProfile
 from common.types.eventdata import EventData
 from common.util.consolehelpers import printReturn
+from common.util.lrucache import LruCache
 
 if TYPE_CHECKING:
-    from devices import Device
+    from devices import Device, BindingPlan
     from plugs import StandardPlugin, SpecialPlugin, WindowPlugin, Plugin
-    from common.util.apifixes import WindowIndex
+    from common.util.apifixes import PluginIndex, WindowIndex
+
+P = TypeVar('P', bound='Plugin')
+
+
+class DeviceManifestEntry(TypedDict):
+    """
+    An entry in the device manifest. Refer to `devices/manifest.py` for
+    details.
+    """
+    id: str
+    module: str
+    enquiry: Optional[list[Any]]
+    enquiry_match: bool
+
+
+def _teardownPlugin(plug: 'Plugin') -> None:
+    """
+    Tear down a plugin instance that has been discarded from a cache
+    """
+    plug.teardown()
+    # The plugin may still be cached by its index
+    ExtensionManager.invalidatePluginIndexes()
 
 
 # TODO: Clean up this awfulness - so much repeated code
@@ -29,11 +63,24 @@ class ExtensionManager:
 
     # Standard plugins
     _plugins: 'dict[str, type[StandardPlugin]]' = {}
-    _instantiated_plugins: 'dict[str, StandardPlugin]' = {}
+    # Instances are kept in an LRU cache, so that memory usage stays bounded
+    # when lots of plugins are used
+    _instantiated_plugins: 'LruCache[str, StandardPlugin]' \
+        = LruCache(on_discard=_teardownPlugin)
+    # Plugin IDs that no plugin supports, so that they aren't looked up again
+    # (and counted as cache misses) every tick
+    _unsupported_plugins: set[str] = set()
+
+    # Map plugin indexes to their plugin instance (or None if there isn't
+    # one), so that FL Studio doesn't need to be asked for the plugin's name
+    # for every event
+    _plugins_by_index: 'dict[PluginIndex, Optional[StandardPlugin]]' = {}
 
     # Window plugins
     _windows: 'dict[WindowIndex, type[WindowPlugin]]' = {}
-    _instantiated_windows: 'dict[WindowIndex, WindowPlugin]' = {}
+    _instantiated_windows: 'LruCache[WindowIndex, WindowPlugin]' \
+        = LruCache(on_discard=_teardownPlugin)
+    _unsupported_windows: 'set[WindowIndex]' = set()
 
     # Special plugins
     _special_plugins: 'list[type[SpecialPlugin]]' = []
@@ -47,8 +94,19 @@ class ExtensionManager:
     _instantiated_final_special_plugins: \
         'dict[type[SpecialPlugin], SpecialPlugin]' = {}
 
+    # Active special and final special plugins, cached until they are next
+    # refreshed (once per tick)
+    _active_special: 'Optional[list[SpecialPlugin]]' = None
+    _active_final_special: 'Optional[list[SpecialPlugin]]' = None
+    _active_all_special: 'Optional[list[SpecialPlugin]]' = None
+
     _devices: list[type['Device']] = []
 
+    # Binding plans for each type of device and plugin, which are kept when
+    # plugins are reset, so that plugins can be recreated quickly
+    _binding_plans: 'dict[tuple[type[Device], type[Plugin]], BindingPlan]' \
+        = {}
+
     def __init__(self) -> None:
         raise TypeError(
             "ExtensionManager is a static class and cannot be instantiated."
@@ -81,6 +139,7 @@ class ExtensionManager:
         """
         for plug_id in plugin.getPlugIds():
             cls._plugins[plug_id] = plugin
+            cls._unsupported_plugins.discard(plug_id)
 
     @classmethod
     def registerWindowPlugin(cls, plugin: type['WindowPlugin']) -> None:
@@ -108,6 +167,7 @@ class ExtensionManager:
         reset to their default state and control bindings are removed.
         """
         cls._windows[plugin.getWindowId()] = plugin
+        cls._unsupported_windows.discard(plugin.getWindowId())
 
     @classmethod
     def registerSpecialPlugin(cls, plugin: type['SpecialPlugin']) -> None:
@@ -190,6 +250,63 @@ class ExtensionManager:
         """
         cls._devices.append(device)
 
+    @staticmethod
+    def _matchEnquiryPrefix(prefix: list, sysex: bytes) -> bool:
+        """
+        Returns whether a sysex message matches an enquiry response prefix from
+        the device manifest
+
+        ### Args:
+        * `prefix` (`list`): prefix, where each byte is an `int`, a `tuple`
+          of allowed values, or `None` for any value
+        * `sysex` (`bytes`): sysex message
+
+        ### Returns:
+        * `bool`: whether there is a match
+        """
+        if len(prefix) > len(sysex):
+            return False
+        for expected, actual in zip(prefix, sysex):
+            if expected is None:
+                continue
+            if isinstance(expected, tuple):
+                if actual not in expected:
+                    return False
+            elif expected != actual:
+                return False
+        return True
+
+    @classmethod
+    def _importDevices(
+        cls,
+        id: Optional[str] = None,
+        sysex: Optional[bytes] = None,
+    ) -> None:
+        """
+        Import the modules of devices listed in the device manifest, so that
+        they are registered.
+
+        If an ID or a sysex message is given, only devices that could match it
+        are imported. Otherwise, all devices are imported.
+
+        ### Args:
+        * `id` (`str`, optional): device ID to import. Defaults to None.
+        * `sysex` (`bytes`, optional): universal device enquiry response to
+          import devices for. Defaults to None.
+        """
+        from devices.manifest import DEVICES
+        # The generated manifest isn't typed
+        for d in cast('list[DeviceManifestEntry]', DEVICES):
+            if id is not None and d['id'] != id:
+                continue
+            if sysex is not None:
+                if not d['enquiry_match']:
+                    continue
+                if d['enquiry'] is not None \
+                        and not cls._matchEnquiryPrefix(d['enquiry'], sysex):
+                    continue
+            getStartupProfile().importModule(d['module'])
+
     @overload
     @classmethod
     def getDevice(cls, arg: EventData) -> 'Device':
@@ -217,6 +334,9 @@ class ExtensionManager:
         """
         # Device name
         if isinstance(arg, str):
+            # Name matching can't be described by the manifest, so all devices
+            # are needed
+            cls._importDevices()
             for device in cls._devices:
                 if device.matchDeviceName(arg):
                     # If it matches the pattern, then we found the right device
@@ -226,6 +346,10 @@ class ExtensionManager:
         # elif isinstance(arg, eventData):
         # Can't runtime type check for MIDI events
         else:
+            if arg.sysex is None:
+                raise DeviceRecogniseError("Device not recognised")
+            # Only import devices whose enquiry response prefix matches
+            cls._importDevices(sysex=bytes(arg.sysex))
             for device in cls._devices:
                 pattern = device.getUniversalEnquiryResponsePattern()
                 if pattern is None:
@@ -248,6 +372,7 @@ class ExtensionManager:
         ### Returns:
         * `Device`: matching device
         """
+        cls._importDevices(id=id)
         for device in cls._devices:
             if device.__name__ == id:
                 return device.create(None)
@@ -256,10 +381,113 @@ class ExtensionManager:
     @classmethod
     def getAllDevices(cls) -> list[type['Device']]:
         """
-        Returns a list of all devices that have been registered
+        Returns a list of all devices, importing any that haven't been
+        registered yet
         """
+        cls._importDevices()
         return cls._devices
 
+    @classmethod
+    def _createPlugin(cls, plugin: type[P], device: 'Device') -> P:
+        """
+        Create an instance of a plugin, using a binding plan to speed up the
+        creation if one has been recorded for the plugin and device types.
+
+        If there is no plan yet, one is recorded while the plugin is created.
+
+        ### Args:
+        * `plugin` (`type[Plugin]`): plugin to create
+        * `device` (`Device`): current device
+
+        ### Returns:
+        * `Plugin`: plugin instance
+        """
+        from devices import DeviceShadow, BindingPlan
+        key = (type(device), plugin)
+        plan = cls._binding_plans.get(key)
+        if plan is None or not plan.matchesDevice(device):
+            plan = BindingPlan(device)
+        with StartupPhase(f"Create {plugin.__name__}"):
+            instance = plugin.create(DeviceShadow(device, plan))
+        if plan.isValid():
+            plan.finishRecording()
+            cls._binding_plans[key] = plan
+        else:
+            # Record it again next time
+            cls._binding_plans.pop(key, None)
+        return cast(P, instance)
+
+    @classmethod
+    def _importPlugin(cls, id: str) -> None:
+        """
+        Import the module defining the standard plugin with the given ID, if
+        it hasn't been imported yet, so that the plugin is registered.
+
+        ### Args:
+        * `id` (`str`): plugin ID
+        """
+        from plugs.manifest import PLUGINS
+        if id not in cls._plugins and id in PLUGINS:
+            getStartupProfile().importModule(PLUGINS[id])
+
+    @classmethod
+    def _importWindow(cls, id: 'WindowIndex') -> None:
+        """
+        Import the module defining the window plugin with the given ID, if it
+        hasn't been imported yet, so that the plugin is registered.
+
+        ### Args:
+        * `id` (`int`): window ID
+        """
+        from plugs.manifest import WINDOWS
+        if id not in cls._windows and id in WINDOWS:
+            getStartupProfile().importModule(WINDOWS[id])
+
+    @classmethod
+    def importAllPlugins(cls) -> None:
+        """
+        Import all plugin modules listed in the plugin manifest, so that every
+        plugin is registered.
+
+        This is slow, and should only be used when inspecting the script, for
+        example by `getAllStandardPlugins()` and `getAllWindowPlugins()`.
+        """
+        from plugs import manifest
+        for modules in (
+            manifest.PLUGINS,
+            manifest.WINDOWS,
+            manifest.SPECIAL_PLUGINS,
+            manifest.FINAL_SPECIAL_PLUGINS,
+        ):
+            for m in modules.values():
+                getStartupProfile().importModule(m)
+
+    @classmethod
+    def getWindowIds(cls) -> 'list[WindowIndex]':
+        """
+        Returns the IDs of all windows that have an associated plugin,
+        including plugins that haven't been imported yet.
+
+        ### Returns:
+        * `list[WindowIndex]`: window IDs
+        """
+        from plugs.manifest import WINDOWS
+        return list(WINDOWS.keys() | cls._windows.keys())
+
+    @staticmethod
+    def _getCacheCapacity() -> Optional[int]:
+        """
+        Returns the maximum number of standard and window plugin instances to
+        keep, as given in the settings
+
+        ### Returns:
+        * `int`: capacity, or None for no limit
+        """
+        capacity = getContext().settings.get("plugins.general.cache_size")
+        if capacity is None or capacity <= 0:
+            return None
+        return capacity
+
     @classmethod
     def getPluginById(
         cls,
@@ -280,17 +508,23 @@ class ExtensionManager:
         ### Returns:
         * `StandardPlugin`: plugin associated with ID
         """
-        from devices.deviceshadow import DeviceShadow
+        # No plugin supports this ID
+        if id in cls._unsupported_plugins:
+            return None
         # Plugin already instantiated
-        if id in cls._instantiated_plugins.keys():
-            return cls._instantiated_plugins[id]
+        plug = cls._instantiated_plugins.get(id)
+        if plug is not None:
+            return plug
+        cls._importPlugin(id)
         # Plugin exists but isn't instantiated
-        elif id in cls._plugins.keys():
-            cls._instantiated_plugins[id] \
-                = cls._plugins[id].create(DeviceShadow(device))
-            return cls._instantiated_plugins[id]
+        if id in cls._plugins.keys():
+            plug = cls._createPlugin(cls._plugins[id], device)
+            cls._instantiated_plugins.setCapacity(cls._getCacheCapacity())
+            cls._instantiated_plugins.add(id, plug)
+            return plug
         # Plugin doesn't exist
         else:
+            cls._unsupported_plugins.add(id)
             # log(
             #     "extensions.manager",
             #     f"No plugins associated with plugin ID '{id}'",
@@ -298,6 +532,47 @@ class ExtensionManager:
             # )
             return None
 
+    @classmethod
+    def getPluginByIndex(
+        cls,
+        index: 'PluginIndex',
+        device: 'Device',
+    ) -> Optional['StandardPlugin']:
+        """
+        Returns an instance of the standard plugin at the given index.
+
+        Results are cached until `invalidatePluginIndexes()` is called, which
+        should happen whenever the focused plugin changes, or when FL Studio
+        indicates that plugins may have changed.
+
+        ### Args:
+        * `index` (`PluginIndex`): index of plugin
+        * `device` (`Device`): current device
+
+        ### Returns:
+        * `StandardPlugin`: plugin at index, or None if there isn't one
+        """
+        try:
+            return cls._plugins_by_index[index]
+        except KeyError:
+            pass
+        try:
+            plug_id = plugins.getPluginName(*index)
+        except TypeError:
+            # Plugin not valid
+            plug_id = ""
+        plug = cls.getPluginById(plug_id, device)
+        cls._plugins_by_index[index] = plug
+        return plug
+
+    @classmethod
+    def invalidatePluginIndexes(cls) -> None:
+        """
+        Clear the cache of plugins by index, so that plugin names are checked
+        again
+        """
+        cls._plugins_by_index = {}
+
     @classmethod
     def getWindowById(
         cls,
@@ -318,17 +593,23 @@ class ExtensionManager:
         ### Returns:
         * `WindowPlugin`: plugin associated with ID
         """
-        from devices.deviceshadow import DeviceShadow
+        # No plugin supports this window
+        if id in cls._unsupported_windows:
+            return None
         # Plugin already instantiated
-        if id in cls._instantiated_windows.keys():
-            return cls._instantiated_windows[id]
+        window = cls._instantiated_windows.get(id)
+        if window is not None:
+            return window
+        cls._importWindow(id)
         # Plugin exists but isn't instantiated
-        elif id in cls._windows.keys():
-            cls._instantiated_windows[id] \
-                = cls._windows[id].create(DeviceShadow(device))
-            return cls._instantiated_windows[id]
+        if id in cls._windows.keys():
+            window = cls._createPlugin(cls._windows[id], device)
+            cls._instantiated_windows.setCapacity(cls._getCacheCapacity())
+            cls._instantiated_windows.add(id, window)
+            return window
         # Plugin doesn't exist
         else:
+            cls._unsupported_windows.add(id)
             # log(
             #     "extensions.manager",
             #     f"No plugins associated with window ID '{id}'",
@@ -337,41 +618,144 @@ class ExtensionManager:
             return None
 
     @classmethod
-    def getSpecialPlugins(cls, device: 'Device') -> list['SpecialPlugin']:
+    def prewarmPlugin(cls, id: str, device: 'Device') -> bool:
         """
-        Returns a list of the special plugins that are currently active and
-        should process the event
+        Instantiate the standard plugin matching the ID provided ahead of
+        time, so that there is no delay when it is first used.
+
+        Plugins are only instantiated if there is room for them in the plugin
+        cache, so that prewarming never evicts plugins that are in use.
+
+        ### Args:
+        * `id` (`str`): plugin ID
+        * `device` (`Device`): current device
+
+        ### Returns:
+        * `bool`: whether a plugin was instantiated
+        """
+        if id in cls._instantiated_plugins:
+            return False
+        cls._importPlugin(id)
+        if id not in cls._plugins:
+            return False
+        capacity = cls._getCacheCapacity()
+        if capacity is not None and len(cls._instantiated_plugins) >= capacity:
+            return False
+        cls._instantiated_plugins.add(
+            id, cls._createPlugin(cls._plugins[id], device))
+        return True
+
+    @classmethod
+    def prewarmWindow(cls, id: 'WindowIndex', device: 'Device') -> bool:
+        """
+        Instantiate the window plugin matching the ID provided ahead of time,
+        so that there is no delay when it is first used.
+
+        Plugins are only instantiated if there is room for them in the plugin
+        cache, so that prewarming never evicts plugins that are in use.
+
+        ### Args:
+        * `id` (`int`): window ID
+        * `device` (`Device`): current device
 
-        If an active plugin hasn't been instantiated, the device object will be
-        used to create one.
+        ### Returns:
+        * `bool`: whether a plugin was instantiated
+        """
+        if id in cls._instantiated_windows:
+            return False
+        cls._importWindow(id)
+        if id not in cls._windows:
+            return False
+        capacity = cls._getCacheCapacity()
+        if capacity is not None and len(cls._instantiated_windows) >= capacity:
+            return False
+        cls._instantiated_windows.add(
+            id, cls._createPlugin(cls._windows[id], device))
+        return True
+
+    @classmethod
+    def _findActiveSpecialPlugins(
+        cls,
+        plugins: list[type['SpecialPlugin']],
+        instantiated: 'dict[type[SpecialPlugin], SpecialPlugin]',
+        device: 'Device',
+    ) -> list['SpecialPlugin']:
+        """
+        Returns a list of the plugins that should currently be active,
+        instantiating them if required.
 
         ### Args:
+        * `plugins` (`list[type[SpecialPlugin]]`): registered plugins
+        * `instantiated` (`dict[type[SpecialPlugin], SpecialPlugin]`): map of
+          plugin types to their instances
         * `device` (`Device`): current device
 
         ### Returns:
         * `list[SpecialPlugin]`: list of active plugins
         """
-        from devices.deviceshadow import DeviceShadow
         ret: list[SpecialPlugin] = []
-        for p in cls._special_plugins:
+        for p in plugins:
             # If plugin should be active
             if p.shouldBeActive():
                 # If it hasn't been instantiated yet, instantiate it
-                if p not in cls._instantiated_special_plugins.keys():
-                    cls._instantiated_special_plugins[p] \
-                        = p.create(DeviceShadow(device))
-                ret.append(cls._instantiated_special_plugins[p])
-
+                if p not in instantiated.keys():
+                    instantiated[p] = cls._createPlugin(p, device)
+                ret.append(instantiated[p])
         return ret
 
+    @classmethod
+    def refreshSpecialPlugins(cls, device: 'Device') -> None:
+        """
+        Update the lists of active special and final special plugins.
+
+        This should be called once per tick, so that events received between
+        ticks can reuse the lists, rather than checking whether each plugin
+        should be active for every event.
+
+        ### Args:
+        * `device` (`Device`): current device
+        """
+        cls._active_special = cls._findActiveSpecialPlugins(
+            cls._special_plugins,
+            cls._instantiated_special_plugins,
+            device,
+        )
+        cls._active_final_special = cls._findActiveSpecialPlugins(
+            cls._final_special_plugins,
+            cls._instantiated_final_special_plugins,
+            device,
+        )
+        cls._active_all_special = \
+            cls._active_special + cls._active_final_special
+
+    @classmethod
+    def getSpecialPlugins(cls, device: 'Device') -> list['SpecialPlugin']:
+        """
+        Returns a list of the special plugins that are currently active and
+        should process the event
+
+        The list is cached until `refreshSpecialPlugins()` is next called, and
+        shouldn't be modified.
+
+        ### Args:
+        * `device` (`Device`): current device
+
+        ### Returns:
+        * `list[SpecialPlugin]`: list of active plugins
+        """
+        if cls._active_special is None:
+            cls.refreshSpecialPlugins(device)
+            assert cls._active_special is not None
+        return cls._active_special
+
     @classmethod
     def getFinalSpecialPlugins(cls, device: 'Device') -> list['SpecialPlugin']:
         """
         Returns a list of the final special plugins that are currently active
         and should process the event
 
-        If an active plugin hasn't been instantiated, the device object will be
-        used to create one.
+        The list is cached until `refreshSpecialPlugins()` is next called, and
+        shouldn't be modified.
 
         ### Args:
         * `device` (`Device`): current device
@@ -379,35 +763,65 @@ class ExtensionManager:
         ### Returns:
         * `list[SpecialPlugin]`: list of active plugins
         """
-        from devices.deviceshadow import DeviceShadow
-        ret: list[SpecialPlugin] = []
-        for p in cls._final_special_plugins:
-            # If plugin should be active
-            if p.shouldBeActive():
-                # If it hasn't been instantiated yet, instantiate it
-                if p not in cls._instantiated_final_special_plugins.keys():
-                    cls._instantiated_final_special_plugins[p] \
-                        = p.create(DeviceShadow(device))
-                ret.append(cls._instantiated_final_special_plugins[p])
+        if cls._active_final_special is None:
+            cls.refreshSpecialPlugins(device)
+            assert cls._active_final_special is not None
+        return cls._active_final_special
 
-        return ret
+    @classmethod
+    def getAllActiveSpecialPlugins(
+        cls,
+        device: 'Device',
+    ) -> list['SpecialPlugin']:
+        """
+        Returns a list of the special plugins followed by the final special
+        plugins that are currently active, in the order they should process
+        events
+
+        The list is cached until `refreshSpecialPlugins()` is next called, and
+        shouldn't be modified.
+
+        ### Args:
+        * `device` (`Device`): current device
+
+        ### Returns:
+        * `list[SpecialPlugin]`: list of active plugins
+        """
+        if cls._active_all_special is None:
+            cls.refreshSpecialPlugins(device)
+            assert cls._active_all_special is not None
+        return cls._active_all_special
 
     @classmethod
     def resetPlugins(cls) -> None:
         """
         Resets all active plugins (standard and special) which can account for
         a device change.
+
+        Binding plans are kept, since they are specific to the type of device.
         """
-        cls._instantiated_plugins = {}
+        cls._instantiated_plugins.clear()
+        cls._instantiated_windows.clear()
+        cls._plugins_by_index = {}
+        for p in cls._instantiated_special_plugins.values():
+            p.teardown()
+        for p in cls._instantiated_final_special_plugins.values():
+            p.teardown()
         cls._instantiated_special_plugins = {}
         cls._instantiated_final_special_plugins = {}
-        cls._instantiated_windows = {}
+        cls._active_special = None
+        cls._active_final_special = None
+        cls._active_all_special = None
 
     @classmethod
     def getAllStandardPlugins(cls) -> list[type]:
         """
-        Returns a list of all standard plugins
+        Returns a list of all standard plugins.
+
+        Plugins that haven't been imported yet are imported first, which is
+        slow, so this should only be used when inspecting the script.
         """
+        cls.importAllPlugins()
         return list(cls._plugins.values())
 
     @classmethod
@@ -427,9 +841,13 @@ class ExtensionManager:
     @classmethod
     def getAllWindowPlugins(cls) -> list[type]:
         """
-        Returns a list of all window plugins
+        Returns a list of all window plugins.
+
+        Plugins that haven't been imported yet are imported first, which is
+        slow, so this should only be used when inspecting the script.
         """
-        return cls._special_plugins
+        cls.importAllPlugins()
+        return list(cls._windows.values())
 
     @classmethod
     def getInfo(cls) -> str:
@@ -446,14 +864,18 @@ class ExtensionManager:
         def instantiated(obj) -> str:
             return f" ({len(obj)} instantiated)" if len(obj) else ""
 
-        # Number of devices
-        n_dev = f"{len(cls._devices)} device{plural(cls._devices)}"
-        # Number of plugins
-        n_plug = f"{len(cls._plugins)} plugin{plural(cls._plugins)}"
+        from plugs.manifest import PLUGINS
+        from devices.manifest import DEVICES
+        # Number of devices, including those that haven't been imported
+        n_dev = f"{len(DEVICES)} device{plural(DEVICES)}"
+        # Number of plugins, including those that haven't been imported
+        plug_ids = PLUGINS.keys() | cls._plugins.keys()
+        n_plug = f"{len(plug_ids)} plugin{plural(plug_ids)}"
         # Number of instantiated plugins
         ni_plug = instantiated(cls._instantiated_plugins)
         # Number of windows
-        n_wind = f"{len(cls._windows)} window plugin{plural(cls._windows)}"
+        window_ids = cls.getWindowIds()
+        n_wind = f"{len(window_ids)} window plugin{plural(window_ids)}"
         # Number of instantiated windows
         ni_wind = instantiated(cls._instantiated_windows)
         # Number of special plugins
@@ -475,6 +897,21 @@ class ExtensionManager:
             f"{nfs_plug}{nifs_plug}"
         )
 
+    @classmethod
+    @printReturn
+    def getCacheInfo(cls) -> str:
+        """
+        Returns statistics about the caches of standard and window plugin
+        instances
+
+        ### Returns:
+        * `str`: cache info
+        """
+        return (
+            f"Plugins: {cls._instantiated_plugins}\n"
+            f"Windows: {cls._instantiated_windows}"
+        )
+
     @classmethod
     def _formatPlugin(cls, plug: Optional['Plugin']) -> str:
         """
@@ -536,6 +973,7 @@ class ExtensionManager:
         ### Returns:
         * `str`: plugin info
         """
+        cls._importPlugin(id)
         if id in cls._instantiated_plugins.keys():
             return f"{id} associated with:\n\n{cls._instantiated_plugins[id]}"
         elif id in cls._plugins.keys():
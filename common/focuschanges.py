@@ -0,0 +1,139 @@
+"""
+common > focuschanges
+
+Contains the events published by the ActivityState when the focus changes,
+and the publisher used to deliver them, so that the parts of the script that
+depend on the focus can update once per change, rather than checking the
+focus on every tick and event.
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+"""
+
+from typing import Callable
+
+from common.util.apifixes import GeneratorIndex, EffectIndex, WindowIndex
+
+
+class FocusChange:
+    """
+    Base class for focus change events. Subscribe to this type to receive
+    every focus change.
+    """
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}"
+
+
+class WindowChanged(FocusChange):
+    """
+    The focused window changed
+    """
+
+    def __init__(self, old: WindowIndex, new: WindowIndex) -> None:
+        self.old = old
+        self.new = new
+
+    def __repr__(self) -> str:
+        return f"WindowChanged ({self.old} -> {self.new})"
+
+
+class GeneratorChanged(FocusChange):
+    """
+    The active generator plugin changed
+    """
+
+    def __init__(self, old: GeneratorIndex, new: GeneratorIndex) -> None:
+        self.old = old
+        self.new = new
+
+    def __repr__(self) -> str:
+        return f"GeneratorChanged ({self.old} -> {self.new})"
+
+
+class EffectChanged(FocusChange):
+    """
+    The active effect plugin changed
+    """
+
+    def __init__(self, old: EffectIndex, new: EffectIndex) -> None:
+        self.old = old
+        self.new = new
+
+    def __repr__(self) -> str:
+        return f"EffectChanged ({self.old} -> {self.new})"
+
+
+class SplitToggled(FocusChange):
+    """
+    The script switched between addressing plugins and windows, either
+    because the focus moved between them, or because the device toggled
+    between them while they are being addressed independently
+    """
+
+    def __init__(self, plugins: bool) -> None:
+        """
+        ### Args:
+        * `plugins` (`bool`): whether plugins (True) or windows (False) are
+          now being addressed
+        """
+        self.plugins = plugins
+
+    def __repr__(self) -> str:
+        return f"SplitToggled ({'plugins' if self.plugins else 'windows'})"
+
+
+FocusCallback = Callable[[FocusChange], None]
+
+
+class FocusPublisher:
+    """
+    Publishes focus change events to the callbacks that have subscribed to
+    them
+    """
+
+    def __init__(self) -> None:
+        self._subscribers: list[tuple[type[FocusChange], FocusCallback]] = []
+
+    def __repr__(self) -> str:
+        return f"FocusPublisher ({len(self._subscribers)} subscribers)"
+
+    def subscribe(
+        self,
+        callback: FocusCallback,
+        event_type: type[FocusChange] = FocusChange,
+    ) -> None:
+        """
+        Subscribe to a type of focus change
+
+        ### Args:
+        * `callback` (`FocusCallback`): function to call with each event of
+          the given type
+        * `event_type` (`type[FocusChange]`, optional): type of event to
+          subscribe to. Defaults to `FocusChange` (all events).
+        """
+        self._subscribers.append((event_type, callback))
+
+    def unsubscribe(self, callback: FocusCallback) -> None:
+        """
+        Remove all subscriptions for a callback
+
+        ### Args:
+        * `callback` (`FocusCallback`): callback to remove
+        """
+        self._subscribers = [
+            (t, c) for t, c in self._subscribers if c != callback
+        ]
+
+    def publish(self, events: list[FocusChange]) -> None:
+        """
+        Publish focus change events to the subscribers
+
+        ### Args:
+        * `events` (`list[FocusChange]`): events to publish, in the order
+          they happened
+        """
+        for e in events:
+            for t, callback in list(self._subscribers):
+                if isinstance(e, t):
+                    callback(e)
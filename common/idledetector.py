@@ -0,0 +1,97 @@
+"""
+common > idledetector
+
+Contains the IdleDetector class, which detects when nothing is happening, so
+that the script can tick less often to reduce its CPU usage.
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+"""
+
+import transport
+from time import perf_counter
+
+import common
+from common.logger import log, verbosity
+
+
+class IdleDetector:
+    """
+    Detects when the script is idle, meaning that no input has been received,
+    FL Studio hasn't refreshed the script, the focus hasn't changed and FL
+    Studio isn't playing, for the time given by the `tick.idle_timeout`
+    setting.
+
+    While idle, only low-frequency maintenance ticks are run, at the rate
+    given by the `tick.idle_tick_rate` setting. The script wakes as soon as
+    there is any activity.
+    """
+
+    def __init__(self) -> None:
+        self._idle = False
+        self._last_activity = perf_counter()
+        self._last_maintenance = 0.0
+        self.maintenance_ticks = 0
+        self.skipped_ticks = 0
+
+    def __repr__(self) -> str:
+        state = "idle" if self._idle else "active"
+        return (
+            f"IdleDetector ({state}, {self.skipped_ticks} ticks skipped, "
+            f"{self.maintenance_ticks} maintenance ticks)"
+        )
+
+    def isIdle(self) -> bool:
+        """
+        Returns whether the script is idle
+
+        ### Returns:
+        * `bool`: whether the script is idle
+        """
+        return self._idle
+
+    def wake(self, reason: str) -> None:
+        """
+        Record activity, waking the script if it is idle
+
+        ### Args:
+        * `reason` (`str`): type of activity, used for logging
+        """
+        self._last_activity = perf_counter()
+        if self._idle:
+            self._idle = False
+            log("general.idle", f"Woke from idle: {reason}", verbosity.INFO)
+
+    def shouldSkipTick(self) -> bool:
+        """
+        Returns whether the current tick should be skipped, entering idle mode
+        if there hasn't been any activity for long enough
+
+        ### Returns:
+        * `bool`: whether to skip this tick
+        """
+        now = perf_counter()
+        if not self._idle:
+            timeout = common.getContext().settings.get("tick.idle_timeout")
+            if not timeout:
+                return False
+            if transport.isPlaying():
+                # The beat LEDs and playback position are changing
+                self._last_activity = now
+                return False
+            if now - self._last_activity < timeout:
+                return False
+            self._idle = True
+            self._last_maintenance = now
+            log(
+                "general.idle",
+                f"Entered idle mode after {now - self._last_activity:.1f} s",
+                verbosity.INFO,
+            )
+        rate = common.getContext().settings.get("tick.idle_tick_rate")
+        if rate and now - self._last_maintenance >= 1 / rate:
+            self._last_maintenance = now
+            self.maintenance_ticks += 1
+            return False
+        self.skipped_ticks += 1
+        return True
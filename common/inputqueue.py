@@ -0,0 +1,117 @@
+"""
+common > inputqueue
+
+Contains the InputQueue class, a ring buffer used to defer the processing of
+MIDI events until the next tick, so that FL Studio's MIDI callback stays
+short under heavy controller traffic.
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+"""
+
+from typing import TYPE_CHECKING, Optional
+
+from common.types import EventData
+from common.types.eventdata import isEventSysex
+
+# Status bytes (with the channel removed) of events that are always processed
+# immediately: note off, note on and note aftertouch, which are used by notes
+# and drum pads
+IMMEDIATE_STATUSES = (0x80, 0x90, 0xA0)
+
+
+def isEventDeferrable(event: EventData) -> bool:
+    """
+    Returns whether an event can be deferred until the next tick.
+
+    Sysex events are never deferred, since they are used to recognise
+    devices and forward events, and notes are never deferred, since they need
+    to be played with as little latency as possible.
+
+    ### Args:
+    * `event` (`EventData`): event to check
+
+    ### Returns:
+    * `bool`: whether the event can be deferred
+    """
+    if isEventSysex(event) or event.status is None:
+        return False
+    return event.status & 0xF0 not in IMMEDIATE_STATUSES
+
+
+class InputQueue:
+    """
+    A fixed-size ring buffer of events waiting to be processed
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """
+        Create an InputQueue
+
+        ### Args:
+        * `capacity` (`int`): maximum number of events that can be queued
+        """
+        self._buffer: list[Optional[EventData]] = [None] * capacity
+        self._head = 0
+        self._count = 0
+        # Number of events that were processed immediately because the queue
+        # was full
+        self.overflows = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"InputQueue ({self._count}/{len(self._buffer)} events, "
+            f"{self.overflows} overflows)"
+        )
+
+    def __len__(self) -> int:
+        return self._count
+
+    def push(self, event: EventData) -> bool:
+        """
+        Add a copy of an event to the queue.
+
+        A copy is queued since FL Studio's event objects shouldn't be used
+        after the MIDI callback returns.
+
+        ### Args:
+        * `event` (`EventData`): event to add
+
+        ### Returns:
+        * `bool`: whether the event was queued. If the queue is full, the
+          queue should be drained and processed, followed by the event.
+        """
+        capacity = len(self._buffer)
+        if self._count == capacity:
+            self.overflows += 1
+            return False
+        # Only deferrable events are queued, and they aren't sysex events
+        if TYPE_CHECKING:
+            assert event.status is not None
+            assert event.data1 is not None
+            assert event.data2 is not None
+        self._buffer[(self._head + self._count) % capacity] = EventData(
+            event.status, event.data1, event.data2)
+        self._count += 1
+        return True
+
+    def drain(self) -> list[EventData]:
+        """
+        Remove all events from the queue
+
+        ### Returns:
+        * `list[EventData]`: events, in the order they were queued
+        """
+        if not self._count:
+            return []
+        capacity = len(self._buffer)
+        events: list[EventData] = []
+        for i in range(self._count):
+            idx = (self._head + i) % capacity
+            event = self._buffer[idx]
+            assert event is not None
+            events.append(event)
+            self._buffer[idx] = None
+        self._head = (self._head + self._count) % capacity
+        self._count = 0
+        return events
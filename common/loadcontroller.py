@@ -0,0 +1,142 @@
+"""
+common > loadcontroller
+
+Contains the LoadController class, which tracks how long ticks are taking,
+and reduces the amount of non-essential work the script does when it is
+under load.
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+"""
+
+import common
+from common.logger import log, verbosity
+
+# Degradation levels, in the order in which they are applied. Each level also
+# includes the degradations of all the levels below it.
+NORMAL = 0
+# Press plugin doesn't fade controls after they are tweaked
+NO_FADES = 1
+# Launchkey drum pads refresh their lights less often
+SLOW_DRUM_PADS = 2
+# Annotations are only sent to the device every few ticks
+FEWER_ANNOTATIONS = 3
+# Standard and window plugins are polled less often
+SLOW_POLLING = 4
+
+LEVEL_NAMES = [
+    "normal",
+    "no fades",
+    "slow drum pads",
+    "fewer annotations",
+    "slow polling",
+]
+
+# Weight given to the latest tick when calculating the moving average
+AVERAGE_WEIGHT = 0.1
+
+# Fraction of a level's threshold that the average must fall below before
+# the level is left, so that the level doesn't switch back and forth
+HYSTERESIS = 0.75
+
+# Number of ticks between annotation updates at the FEWER_ANNOTATIONS level
+ANNOTATION_INTERVAL = 4
+
+# Polling rate (Hz) for plugins that usually poll every tick, at the
+# SLOW_POLLING level
+SLOW_POLL_RATE = 10.0
+
+
+class LoadController:
+    """
+    Keeps a moving average of the time taken by each tick, and steps through
+    the degradation levels as it rises above the thresholds given in the
+    `tick.load_thresholds` setting. The level recovers automatically once the
+    load falls.
+    """
+
+    def __init__(self) -> None:
+        self._average = 0.0
+        self._level = NORMAL
+        self._ticks = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"LoadController ({LEVEL_NAMES[self._level]}, "
+            f"{self._average:.2f} ms average)"
+        )
+
+    def getLevel(self) -> int:
+        """
+        Returns the current degradation level
+
+        ### Returns:
+        * `int`: degradation level
+        """
+        return self._level
+
+    def getAverage(self) -> float:
+        """
+        Returns the moving average of the time taken by each tick
+
+        ### Returns:
+        * `float`: time in ms
+        """
+        return self._average
+
+    def _setLevel(self, level: int) -> None:
+        log(
+            "general.load",
+            f"Load level changed from '{LEVEL_NAMES[self._level]}' to "
+            f"'{LEVEL_NAMES[level]}' (average tick {self._average:.2f} ms)",
+            verbosity.INFO,
+        )
+        self._level = level
+
+    def record(self, duration: float) -> None:
+        """
+        Record the time taken by a tick, and update the degradation level
+
+        ### Args:
+        * `duration` (`float`): time taken in ms
+        """
+        self._ticks += 1
+        self._average += (duration - self._average) * AVERAGE_WEIGHT
+        thresholds: list[float] = common.getContext().settings.get(
+            "tick.load_thresholds")
+        # Step up one level at a time as the average rises
+        if self._level < len(thresholds) \
+                and self._average > thresholds[self._level]:
+            self._setLevel(self._level + 1)
+        # Step down once it falls far enough below the current level
+        elif self._level > 0 \
+                and self._average < thresholds[self._level - 1] * HYSTERESIS:
+            self._setLevel(self._level - 1)
+
+    def shouldUpdateAnnotations(self) -> bool:
+        """
+        Returns whether annotations should be sent to the device this tick
+
+        ### Returns:
+        * `bool`: whether to update annotations
+        """
+        if self._level < FEWER_ANNOTATIONS:
+            return True
+        return self._ticks % ANNOTATION_INTERVAL == 0
+
+    def scalePollRate(self, rate: float) -> float:
+        """
+        Returns the rate at which a plugin should be polled, given the rate it
+        asked for
+
+        ### Args:
+        * `rate` (`float`): requested rate in Hz, or 0 for every tick
+
+        ### Returns:
+        * `float`: rate to use in Hz, or 0 for every tick
+        """
+        if self._level < SLOW_POLLING:
+            return rate
+        if not rate:
+            return SLOW_POLL_RATE
+        return rate / 2
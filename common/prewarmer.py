@@ -0,0 +1,124 @@
+"""
+common > prewarmer
+
+Contains the PluginPrewarmer class, which instantiates plugins that are likely
+to be used during idle time, so that there is no delay when they are first
+focused.
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+"""
+
+import plugins
+import channels
+import mixer
+from time import perf_counter
+from typing import TYPE_CHECKING, Optional
+from collections.abc import Iterator
+
+import common
+from common.util.apifixes import UnsafeIndex
+
+if TYPE_CHECKING:
+    from devices import Device
+
+# Number of effect slots on each mixer track
+MIXER_SLOTS = 10
+
+# Time to wait after a scan finishes before scanning for plugins again
+RESCAN_INTERVAL = 10.0
+
+
+class PluginPrewarmer:
+    """
+    Gradually instantiates the plugins that are loaded in the project, as well
+    as window plugins, so that they are ready before they are needed.
+
+    Each tick, candidates are taken from a scan of the channel rack and mixer
+    slots until the time budget given in the settings is used up.
+    """
+
+    def __init__(self, device: 'Device') -> None:
+        """
+        Create a PluginPrewarmer
+
+        ### Args:
+        * `device` (`Device`): device to create plugins for
+        """
+        self._device = device
+        self._scan: Optional[Iterator[UnsafeIndex]] = None
+        # Time when the last scan finished
+        self._last_scan: Optional[float] = None
+
+    def __repr__(self) -> str:
+        state = "scanning" if self._scan is not None else "idle"
+        return f"PluginPrewarmer ({state})"
+
+    @staticmethod
+    def _candidates() -> Iterator[UnsafeIndex]:
+        """
+        Yields the indexes of windows and plugins that could be used, starting
+        with windows, then the channel rack, then mixer slots.
+
+        This is a generator so that scanning the project is spread over
+        multiple ticks.
+        """
+        yield from common.ExtensionManager.getWindowIds()
+        # Use the global channel count, so that channels outside the selected
+        # channel rack group are checked using their global index
+        for ch in range(channels.channelCount(1)):
+            if plugins.isValid(ch):
+                yield (ch,)
+        for track in range(mixer.trackCount()):
+            for slot in range(MIXER_SLOTS):
+                if plugins.isValid(track, slot):
+                    yield (track, slot)
+
+    def _prewarm(self, index: UnsafeIndex) -> None:
+        """
+        Instantiate the plugin associated with an index if required
+
+        ### Args:
+        * `index` (`UnsafeIndex`): index of window or plugin
+        """
+        if index is None:
+            return
+        if isinstance(index, int):
+            common.ExtensionManager.prewarmWindow(index, self._device)
+        else:
+            try:
+                plug_id = plugins.getPluginName(*index)
+            except TypeError:
+                # Plugin not valid
+                return
+            common.ExtensionManager.prewarmPlugin(plug_id, self._device)
+
+    def restart(self) -> None:
+        """
+        Start a new scan for plugins on the next tick
+        """
+        self._scan = None
+        self._last_scan = None
+
+    def tick(self) -> None:
+        """
+        Prewarm plugins until the time budget for this tick is used up
+        """
+        budget = common.getContext().settings.get(
+            "plugins.general.prewarm_budget") / 1000
+        if budget <= 0:
+            return
+        start = perf_counter()
+        if self._scan is None:
+            if self._last_scan is not None \
+                    and start - self._last_scan < RESCAN_INTERVAL:
+                return
+            self._scan = self._candidates()
+        while perf_counter() - start < budget:
+            try:
+                index = next(self._scan)
+            except StopIteration:
+                self._scan = None
+                self._last_scan = perf_counter()
+                return
+            self._prewarm(index)
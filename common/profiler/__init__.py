@@ -8,7 +8,11 @@ __all__ = [
     'ProfilerContext',
     'profilerDecoration',
     'ProfilerManager',
+    'StartupPhase',
+    'StartupProfile',
+    'getStartupProfile',
 ]
 
 from .profilecontext import ProfilerContext, profilerDecoration
 from .manager import ProfilerManager
+from .startup import StartupPhase, StartupProfile, getStartupProfile
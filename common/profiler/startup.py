@@ -0,0 +1,250 @@
+"""
+common > profiler > startup
+
+Contains the StartupProfile class, which records how long each phase of the
+script's startup takes, as well as how long each module that is imported
+during startup takes to import.
+
+Unlike the profiler manager, the startup profile is always active, since
+startup happens before the settings that enable profiling can be checked.
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+"""
+
+import sys
+from time import perf_counter
+from typing import Optional
+
+from common.util.misc import NoneNoPrintout
+
+MAX_NAME = 48
+
+
+class StartupPhase:
+    """
+    Context manager used to record a phase of the script's startup
+
+    Example usage:
+
+    >>> with StartupPhase("Load settings"):
+    >>>     loadSettings()
+    """
+    def __init__(self, name: str) -> None:
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = perf_counter()
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        _profile.addPhase(self._name, self._start)
+
+
+class StartupProfile:
+    """
+    Records the timestamp and duration of each phase of startup, and the time
+    taken to import each module, until the first tick of the main state.
+
+    All times are stored in milliseconds, relative to when the script started
+    being imported.
+    """
+    def __init__(self) -> None:
+        self._origin: Optional[float] = None
+        # Name, start and duration of each phase
+        self._phases: list[tuple[str, float, float]] = []
+        # Name and duration of each import
+        self._imports: list[tuple[str, float]] = []
+        self._finished = False
+
+    def __repr__(self) -> str:
+        state = "finished" if self._finished else "running"
+        return (
+            f"Startup profile ({state}, {len(self._phases)} phases, "
+            f"{len(self._imports)} imports, {self.getTotal():.2f} ms)"
+        )
+
+    def _offset(self, t: float) -> float:
+        """
+        Returns the time in ms since the start of the profile, starting the
+        profile if required
+        """
+        if self._origin is None:
+            self._origin = t
+        return (t - self._origin) * 1000
+
+    def start(self, at: Optional[float] = None) -> None:
+        """
+        Set the time that startup began. If this isn't called, the start of
+        the first phase is used.
+
+        ### Args:
+        * `at` (`float`, optional): value of `perf_counter()` when startup
+          began. Defaults to now.
+        """
+        if self._origin is None:
+            self._origin = perf_counter() if at is None else at
+
+    def isFinished(self) -> bool:
+        """
+        Returns whether startup has finished, meaning no more timings are
+        recorded
+
+        ### Returns:
+        * `bool`: whether startup has finished
+        """
+        return self._finished
+
+    def finish(self) -> None:
+        """
+        Mark startup as finished, so that no more timings are recorded
+        """
+        if not self._finished:
+            self.addPhase("Finished", perf_counter(), perf_counter())
+            self._finished = True
+
+    def addPhase(
+        self,
+        name: str,
+        start: float,
+        end: Optional[float] = None,
+    ) -> None:
+        """
+        Record a phase of startup
+
+        ### Args:
+        * `name` (`str`): name of phase
+        * `start` (`float`): value of `perf_counter()` when the phase started
+        * `end` (`float`, optional): value of `perf_counter()` when the phase
+          ended. Defaults to now.
+        """
+        if self._finished:
+            return
+        if end is None:
+            end = perf_counter()
+        self._phases.append(
+            (name, self._offset(start), (end - start) * 1000)
+        )
+
+    def mark(self, name: str) -> None:
+        """
+        Record an event during startup that has no duration, such as a
+        message being sent
+
+        ### Args:
+        * `name` (`str`): name of event
+        """
+        now = perf_counter()
+        self.addPhase(name, now, now)
+
+    def importModule(self, name: str) -> None:
+        """
+        Import a module, recording the time taken to import it if it hasn't
+        been imported yet
+
+        ### Args:
+        * `name` (`str`): full name of module
+        """
+        if self._finished or name in sys.modules:
+            # importlib isn't available in FL Studio, so use __import__
+            __import__(name)
+            return
+        start = perf_counter()
+        __import__(name)
+        self._offset(start)
+        self._imports.append((name, (perf_counter() - start) * 1000))
+
+    def getPhases(self) -> list[tuple[str, float, float]]:
+        """
+        Returns the phases of startup
+
+        ### Returns:
+        * `list[tuple[str, float, float]]`: name, start time and duration of
+          each phase, in ms
+        """
+        return list(self._phases)
+
+    def getImports(self) -> list[tuple[str, float]]:
+        """
+        Returns the modules imported during startup
+
+        ### Returns:
+        * `list[tuple[str, float]]`: name and import time of each module, in
+          ms
+        """
+        return list(self._imports)
+
+    def getTotal(self) -> float:
+        """
+        Returns the total time taken by startup so far
+
+        ### Returns:
+        * `float`: time in ms from the start of the profile to the end of the
+          latest phase
+        """
+        return max((s + d for _, s, d in self._phases), default=0.0)
+
+    def inspect(self):
+        """
+        Print a breakdown of the time taken by startup
+        """
+        print()
+        header = f" {'Phase'.ljust(MAX_NAME)} | Start (ms)   | Time (ms)"
+        print(header)
+        print('=' * len(header))
+        for name, start, duration in self._phases:
+            print(
+                f" {name[:MAX_NAME].ljust(MAX_NAME)} | {start: 12.3f} "
+                f"| {duration: 10.3f}"
+            )
+        print()
+        header = f" {'Module'.ljust(MAX_NAME)} | Time (ms)"
+        print(header)
+        print('=' * len(header))
+        for name, duration in self._imports:
+            print(f" {name[:MAX_NAME].ljust(MAX_NAME)} | {duration: 10.3f}")
+        print()
+        print(f" Total: {self.getTotal():.3f} ms")
+        print()
+        return NoneNoPrintout
+
+    def dump(self) -> str:
+        """
+        Returns the startup profile in JSON format, so that it can be saved
+        and compared between versions to track regressions.
+
+        The JSON is formatted manually, since the `json` module may not be
+        available in FL Studio.
+
+        ### Returns:
+        * `str`: JSON object containing the total time, phases and imports
+        """
+        def string(s: str) -> str:
+            return '"' + s.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+        phases = ', '.join(
+            f'{{"name": {string(n)}, "start": {s:.3f}, "time": {d:.3f}}}'
+            for n, s, d in self._phases
+        )
+        imports = ', '.join(
+            f'{{"module": {string(n)}, "time": {d:.3f}}}'
+            for n, d in self._imports
+        )
+        return (
+            f'{{"total": {self.getTotal():.3f}, '
+            f'"phases": [{phases}], '
+            f'"imports": [{imports}]}}'
+        )
+
+
+_profile = StartupProfile()
+
+
+def getStartupProfile() -> StartupProfile:
+    """
+    Returns the startup profile of the script
+
+    ### Returns:
+    * `StartupProfile`: startup profile
+    """
+    return _profile
@@ -0,0 +1,171 @@
+"""
+common > refresh
+
+Contains code used to decode the flags given by FL Studio when it refreshes
+the script, and to publish them to the parts of the script that depend on
+what changed, so that they can avoid polling FL Studio every tick.
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+"""
+
+import midi
+from typing import Callable
+
+import common
+
+# Refresh flags and their names. Flags that aren't available in the running
+# version of FL Studio are given a value of 0, and are never set.
+FLAG_NAMES: dict[int, str] = {
+    midi.HW_Dirty_Mixer_Sel: "Mixer selection",
+    midi.HW_Dirty_Mixer_Display: "Mixer display",
+    midi.HW_Dirty_Mixer_Controls: "Mixer controls",
+    midi.HW_Dirty_RemoteLinks: "Remote links",
+    midi.HW_Dirty_FocusedWindow: "Focused window",
+    midi.HW_Dirty_Performance: "Performance",
+    midi.HW_Dirty_LEDs: "LEDs",
+    midi.HW_Dirty_RemoteLinkValues: "Remote link values",
+    getattr(midi, "HW_Dirty_Patterns", 0): "Patterns",
+    getattr(midi, "HW_Dirty_Tracks", 0): "Tracks",
+    getattr(midi, "HW_Dirty_ControlValues", 0): "Control values",
+    getattr(midi, "HW_Dirty_Colors", 0): "Colors",
+    getattr(midi, "HW_Dirty_Names", 0): "Names",
+    getattr(midi, "HW_Dirty_ChannelRackGroup", 0): "Channel rack group",
+    getattr(midi, "HW_ChannelEvent", 0): "Channels",
+}
+FLAG_NAMES.pop(0, None)
+
+# Flags indicating that the mixer has changed
+MIXER = (
+    midi.HW_Dirty_Mixer_Sel
+    | midi.HW_Dirty_Mixer_Display
+    | midi.HW_Dirty_Mixer_Controls
+)
+
+# Flags indicating that channels, or the plugins on them, have changed
+CHANNELS = (
+    getattr(midi, "HW_Dirty_Colors", 0)
+    | getattr(midi, "HW_Dirty_Names", 0)
+    | getattr(midi, "HW_Dirty_ChannelRackGroup", 0)
+    | getattr(midi, "HW_ChannelEvent", 0)
+)
+
+# Flags indicating that the transport state has changed
+TRANSPORT = midi.HW_Dirty_LEDs
+
+RefreshCallback = Callable[[int], None]
+
+
+def decodeRefreshFlags(flags: int) -> list[str]:
+    """
+    Returns the names of the refresh flags that are set
+
+    ### Args:
+    * `flags` (`int`): flags given by FL Studio
+
+    ### Returns:
+    * `list[str]`: names of flags
+    """
+    return [name for flag, name in FLAG_NAMES.items() if flags & flag]
+
+
+class RefreshPublisher:
+    """
+    Publishes the flags given by FL Studio when it refreshes the script to
+    the callbacks that have subscribed to them
+    """
+
+    def __init__(self) -> None:
+        self._subscribers: list[tuple[int, RefreshCallback]] = []
+
+    def __repr__(self) -> str:
+        return f"RefreshPublisher ({len(self._subscribers)} subscribers)"
+
+    def subscribe(self, flags: int, callback: RefreshCallback) -> None:
+        """
+        Subscribe to a set of refresh flags
+
+        ### Args:
+        * `flags` (`int`): flags to subscribe to
+        * `callback` (`RefreshCallback`): function to call with the flags
+          that were set, when any of the given flags are set
+        """
+        self._subscribers.append((flags, callback))
+
+    def unsubscribe(self, callback: RefreshCallback) -> None:
+        """
+        Remove all subscriptions for a callback
+
+        ### Args:
+        * `callback` (`RefreshCallback`): callback to remove
+        """
+        self._subscribers = [
+            (f, c) for f, c in self._subscribers if c != callback
+        ]
+
+    def publish(self, flags: int) -> None:
+        """
+        Publish refresh flags to the subscribers
+
+        ### Args:
+        * `flags` (`int`): flags given by FL Studio
+        """
+        for f, callback in list(self._subscribers):
+            if flags & f:
+                callback(flags & f)
+
+
+class RefreshWatcher:
+    """
+    Tracks whether FL Studio has refreshed the script with any of a set of
+    flags since it was last checked, so that state only needs to be polled
+    after it changes.
+
+    If none of the flags are supported by the running version of FL Studio,
+    the state is always considered changed, so that it is polled every tick.
+    """
+
+    def __init__(self, flags: int) -> None:
+        """
+        Create a RefreshWatcher, which starts in the changed state
+
+        ### Args:
+        * `flags` (`int`): flags to watch
+        """
+        self._flags = flags
+        self._changed = True
+        self._publisher = common.getContext().refreshes
+        self._publisher.subscribe(flags, self._onRefresh)
+
+    def __repr__(self) -> str:
+        return f"RefreshWatcher ({decodeRefreshFlags(self._flags)})"
+
+    def _onRefresh(self, flags: int) -> None:
+        self._changed = True
+
+    def consume(self) -> bool:
+        """
+        Returns whether any of the flags have been set since the last call,
+        and resets the changed state
+
+        ### Returns:
+        * `bool`: whether the state may have changed
+        """
+        if not self._flags:
+            return True
+        publisher = common.getContext().refreshes
+        if publisher is not self._publisher:
+            # The context was reset, so we may have missed some refreshes
+            self._publisher.unsubscribe(self._onRefresh)
+            self._publisher = publisher
+            publisher.subscribe(self._flags, self._onRefresh)
+            self._changed = True
+        changed = self._changed
+        self._changed = False
+        return changed
+
+    def stop(self) -> None:
+        """
+        Stop watching for refreshes
+        """
+        self._publisher.unsubscribe(self._onRefresh)
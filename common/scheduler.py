@@ -0,0 +1,210 @@
+"""
+common > scheduler
+
+Contains the TickScheduler class, which runs the work done each tick within a
+time budget, so that expensive plugins can't starve the rest of the script.
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+"""
+
+from time import perf_counter
+from typing import Any, Callable, Optional
+
+from common.logger import log, verbosity
+from common.profiler import ProfilerContext
+from common.util.misc import NoneNoPrintout
+
+MAX_NAME = 48
+
+# Weight given to the latest duration of a task when estimating its cost
+ESTIMATE_WEIGHT = 0.5
+
+
+class TaskStats:
+    """
+    Statistics about a task run by the scheduler
+    """
+    def __init__(self) -> None:
+        self.runs = 0
+        self.deferrals = 0
+        self.overruns = 0
+        # Total and maximum times in ms
+        self.total = 0.0
+        self.max = 0.0
+        # Estimated time in ms that the task will take next time it runs
+        self.estimate = 0.0
+        # Value of perf_counter() when the task last started
+        self.last_run: Optional[float] = None
+
+    def __repr__(self) -> str:
+        return (
+            f"TaskStats ({self.runs} runs, {self.deferrals} deferrals, "
+            f"{self.overruns} overruns)"
+        )
+
+    def record(self, duration: float) -> None:
+        """
+        Record a run of the task
+
+        ### Args:
+        * `duration` (`float`): time taken in ms
+        """
+        self.runs += 1
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+        self.estimate += (duration - self.estimate) * ESTIMATE_WEIGHT
+
+
+class TickScheduler:
+    """
+    Runs the tasks that make up each tick within a time budget.
+
+    Tasks that aren't essential are deferred to a later tick if their
+    estimated cost is more than the remaining budget. A task that is deferred
+    is guaranteed to run on the next tick, so that expensive work is rotated
+    across ticks rather than being starved entirely.
+
+    Essential tasks, such as applying plugins to the device, always run.
+    """
+
+    def __init__(self) -> None:
+        self._stats: dict[str, TaskStats] = {}
+        # Tasks that were deferred during the previous tick
+        self._starved: set[str] = set()
+        # Tasks that were deferred during this tick
+        self._deferred: set[str] = set()
+        self._start = perf_counter()
+        self._budget = 0.0
+
+    def __repr__(self) -> str:
+        overruns = sum(s.overruns for s in self._stats.values())
+        return f"TickScheduler ({len(self._stats)} tasks, {overruns} overruns)"
+
+    def beginTick(self, budget: float) -> None:
+        """
+        Start a new tick
+
+        ### Args:
+        * `budget` (`float`): time in ms that tasks can use this tick
+        """
+        self._starved = self._deferred
+        self._deferred = set()
+        self._start = perf_counter()
+        self._budget = budget
+
+    def getRemaining(self) -> float:
+        """
+        Returns the remaining time budget for this tick
+
+        ### Returns:
+        * `float`: remaining time in ms, which is negative if the budget has
+          been exceeded
+        """
+        return self._budget - (perf_counter() - self._start) * 1000
+
+    def _getStats(self, name: str) -> TaskStats:
+        try:
+            return self._stats[name]
+        except KeyError:
+            stats = TaskStats()
+            self._stats[name] = stats
+            return stats
+
+    def run(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        *args: Any,
+        essential: bool = False,
+        rate: Optional[float] = None,
+        **kwargs: Any,
+    ) -> bool:
+        """
+        Run a task, unless it isn't essential and there isn't enough time left
+        in this tick, or it has been run more recently than its rate allows
+
+        ### Args:
+        * `name` (`str`): name of task, used for profiling and statistics
+        * `func` (`Callable`): function to run
+        * `*args`, `**kwargs`: arguments to pass to the function
+        * `essential` (`bool`, optional): whether the task must be run
+          regardless of the budget. Defaults to False.
+        * `rate` (`float`, optional): maximum rate in Hz at which the task
+          should be run, even if it is essential. If this is None or 0, the
+          task can run every tick. Defaults to None.
+
+        ### Returns:
+        * `bool`: whether the task was run
+        """
+        stats = self._getStats(name)
+        now = perf_counter()
+        if rate and stats.last_run is not None \
+                and now - stats.last_run < 1 / rate:
+            return False
+        remaining = self.getRemaining()
+        if not essential and name not in self._starved and (
+            remaining <= 0 or stats.estimate > remaining
+        ):
+            stats.deferrals += 1
+            self._deferred.add(name)
+            return False
+        start = perf_counter()
+        stats.last_run = start
+        with ProfilerContext(name):
+            func(*args, **kwargs)
+        duration = (perf_counter() - start) * 1000
+        stats.record(duration)
+        # Only count overruns for tasks that started within the budget
+        if 0 < remaining < duration:
+            stats.overruns += 1
+            log(
+                "general.scheduler",
+                f"{name} overran the tick budget by "
+                f"{duration - remaining:.2f} ms",
+                verbosity.NOTE,
+            )
+        return True
+
+    def getStats(self) -> dict[str, TaskStats]:
+        """
+        Returns statistics about each task that has been scheduled
+
+        ### Returns:
+        * `dict[str, TaskStats]`: task names mapped to their statistics
+        """
+        return dict(self._stats)
+
+    def getOverruns(self) -> dict[str, int]:
+        """
+        Returns the number of times each task has overrun the tick budget
+
+        ### Returns:
+        * `dict[str, int]`: task names mapped to their overrun counts, for
+          tasks that have overrun at least once
+        """
+        return {
+            name: s.overruns for name, s in self._stats.items() if s.overruns
+        }
+
+    def inspect(self):
+        """
+        Print statistics about each task that has been scheduled
+        """
+        header = (
+            f" {'Task'.ljust(MAX_NAME)} | Runs    | Deferred | Overruns "
+            f"| Ave (ms)   | Max (ms)"
+        )
+        print()
+        print(header)
+        print('=' * len(header))
+        for name, s in self._stats.items():
+            ave = s.total / s.runs if s.runs else 0.0
+            print(
+                f" {name[:MAX_NAME].ljust(MAX_NAME)} | {s.runs:7} "
+                f"| {s.deferrals:8} | {s.overruns:8} | {ave: 10.5f} "
+                f"| {s.max: 10.5f}"
+            )
+        print()
+        return NoneNoPrintout
@@ -9,14 +9,161 @@ Authors:
 """
 
 __all__ = [
-    'Settings'
+    'Settings',
+    'SettingHandle',
 ]
 
-from typing import Any
+from typing import Any, Callable, Optional
 
 from .util import dicttools, hotreload
 
 from . import defaultconfig as d
+from .logger import log, verbosity
+
+try:
+    import os
+except ImportError:
+    # Without os, changes to the config file can't be detected, so it is
+    # reloaded every time
+    os = None  # type: ignore
+
+# Called with the keys of the settings that changed when the config is
+# reloaded
+SettingsCallback = Callable[[list[str]], None]
+
+
+class ConfigCache:
+    """
+    Caches the user configuration merged with the default configuration, so
+    that it is only reloaded when the config file changes, as detected by its
+    modification time and size.
+    """
+
+    def __init__(self) -> None:
+        self._path: Optional[str] = None
+        self._file_key: Optional[tuple[float, int]] = None
+        self._merged: Optional[dict[str, Any]] = None
+        self._flat: Optional[dict[str, Any]] = None
+        self._subscribers: list[SettingsCallback] = []
+        # Number of times the config file was actually loaded
+        self.loads = 0
+
+    def __repr__(self) -> str:
+        return f"ConfigCache ({self._path}, {self.loads} loads)"
+
+    def _getFileKey(self) -> Optional[tuple[float, int]]:
+        """
+        Returns the modification time and size of the config file, or None if
+        they can't be found
+        """
+        if os is None or self._path is None:
+            return None
+        try:
+            stat = os.stat(self._path)
+        except OSError:
+            return None
+        return stat.st_mtime, stat.st_size
+
+    def subscribe(self, callback: SettingsCallback) -> None:
+        """
+        Subscribe to changes to the settings when the config file is reloaded
+
+        ### Args:
+        * `callback` (`SettingsCallback`): function to call with the keys of
+          the settings that changed
+        """
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: SettingsCallback) -> None:
+        """
+        Remove a subscription
+
+        ### Args:
+        * `callback` (`SettingsCallback`): callback to remove
+        """
+        self._subscribers = [c for c in self._subscribers if c != callback]
+
+    def notify(self, changed: list[str]) -> None:
+        """
+        Notify subscribers that settings changed
+
+        ### Args:
+        * `changed` (`list[str]`): keys of the settings that changed
+        """
+        if not len(changed):
+            return
+        log(
+            "general.settings",
+            f"Settings changed: {', '.join(changed)}",
+            verbosity.INFO,
+        )
+        for callback in list(self._subscribers):
+            callback(changed)
+
+    def _copy(self) -> dict[str, Any]:
+        """
+        Returns a flattened copy of the cached configuration, so that changes
+        to the categories of one settings object don't affect settings
+        objects created later
+        """
+        assert self._merged is not None
+        return dicttools.flattenDict(dicttools.copyCategories(self._merged))
+
+    def load(self) -> tuple[dict[str, Any], list[str]]:
+        """
+        Returns a copy of the merged configuration, reloading it if the config
+        file has changed since it was last loaded.
+
+        ### Returns:
+        * `dict[str, Any]`: flattened configuration
+        * `list[str]`: keys of the settings that changed since the
+          configuration was last loaded, which should be passed to `notify()`
+        """
+        if self._merged is not None and self._flat is not None:
+            file_key = self._getFileKey()
+            if file_key is not None and file_key == self._file_key:
+                return self._copy(), []
+        c = hotreload.getTemporaryModule('config')
+        self._path = getattr(c, '__file__', None)
+        self._file_key = self._getFileKey()
+        config = dicttools.expandDictShorthand(c.CONFIG)
+        merged = dicttools.recursiveMergeDictionaries(d.CONFIG, config)
+        flat = dicttools.flattenDict(merged)
+        self.loads += 1
+        previous = self._flat
+        self._merged, self._flat = merged, flat
+        if previous is None:
+            return self._copy(), []
+        # Only report the settings themselves, not their categories
+        changed = [
+            k for k, v in flat.items()
+            if type(v) is not dict and previous.get(k) != v
+        ]
+        return self._copy(), changed
+
+
+# Shared between all settings objects, so that the config file isn't
+# reloaded each time the context is reset
+_cache = ConfigCache()
+
+
+class SettingHandle:
+    """
+    A precomputed accessor for a single setting, which allows code on hot
+    paths to read the setting with a single attribute access.
+
+    Handles are kept up to date with the most recently loaded settings, which
+    are those of the current context.
+    """
+
+    __slots__ = ('key', 'value')
+
+    def __init__(self, key: str, value: Any) -> None:
+        self.key = key
+        self.value = value
+
+    def __repr__(self) -> str:
+        return f"SettingHandle ({self.key} = {self.value!r})"
 
 
 class Settings:
@@ -26,34 +173,68 @@ class Settings:
     Used to avoid having to deal with the awfulness of pulling things out of
     dictionaries. Also manages the differences between the default config and
     any user modifications.
+
+    Settings are flattened when they are loaded, so that they can be looked
+    up by their dotted path without searching through nested dictionaries.
+    The config file is only reloaded when it changes.
     """
 
+    # Handles to settings, shared between all settings objects
+    _handles: dict[str, SettingHandle] = {}
+    # Flattened values of the most recently loaded settings
+    _latest: Optional[dict[str, Any]] = None
+
     def __init__(self) -> None:
         """
         Initialise and load the script's settings
         """
 
-        c = hotreload.getTemporaryModule('config')
-        config = dicttools.expandDictShorthand(c.CONFIG)
-        self._settings_dict = dicttools.recursiveMergeDictionaries(
-            d.CONFIG, config)
+        self._flat, changed = _cache.load()
+        self._updateHandles()
+        _cache.notify(changed)
+
+    def _updateHandles(self) -> None:
+        """
+        Update handles to use the values of these settings
+        """
+        Settings._latest = self._flat
+        for key, h in Settings._handles.items():
+            h.value = self._flat[key]
+
+    def reload(self) -> None:
+        """
+        Reload the settings if the config file has changed, notifying
+        subscribers of any settings that changed
+        """
+        self._flat, changed = _cache.load()
+        self._updateHandles()
+        _cache.notify(changed)
 
     @staticmethod
-    def _recursiveGet(keys: list[str], settings: dict) -> Any:
+    def subscribe(callback: SettingsCallback) -> None:
         """
-        Recursive function for getting settings value
+        Subscribe to changes to the settings when the config file is reloaded,
+        either by resetting the context, or by calling `reload()`.
+
+        When the context is being reset, subscribers are notified before the
+        new context is available, so new values should be read using
+        handles, rather than using `getContext()`.
 
         ### Args:
-        * `keys` (`list[str]`): list of keys
-        * `settings` (`dict`): settings dictionary to search
+        * `callback` (`SettingsCallback`): function to call with the keys of
+          the settings that changed
+        """
+        _cache.subscribe(callback)
 
-        ### Returns:
-        * any: value
+    @staticmethod
+    def unsubscribe(callback: SettingsCallback) -> None:
+        """
+        Remove a subscription to changes to the settings
+
+        ### Args:
+        * `callback` (`SettingsCallback`): callback to remove
         """
-        if len(keys) == 1:
-            return settings[keys[0]]
-        else:
-            return Settings._recursiveGet(keys[1:], settings[keys[0]])
+        _cache.unsubscribe(callback)
 
     def get(self, key: str) -> Any:
         """
@@ -69,10 +250,42 @@ class Settings:
         * any: Value
         """
         try:
-            return Settings._recursiveGet(key.split('.'), self._settings_dict)
-        except KeyError as e:
-            raise KeyError(
-                f"Unable to find setting at '{key}'. Failed for key {e}"
-            ) from None
-        except IndexError:
+            return self._flat[key]
+        except KeyError:
+            raise KeyError(f"Unable to find setting at '{key}'") from None
+
+    @classmethod
+    def handle(cls, key: str) -> SettingHandle:
+        """
+        Returns a handle to a setting, which can be stored so that the setting
+        can be read quickly on hot paths. For example:
+
+        >>> DOUBLE_PRESS_TIME = Settings.handle("controls.double_press_time")
+        >>> ...
+        >>> if t - self._press <= DOUBLE_PRESS_TIME.value:
+
+        If the settings haven't been loaded yet, the handle gives the default
+        value until they are.
+
+        ### Args:
+        * `key` (`str`): key of setting
+
+        ### Raises:
+        * `KeyError`: Unable to find setting
+
+        ### Returns:
+        * `SettingHandle`: handle to the setting
+        """
+        try:
+            return cls._handles[key]
+        except KeyError:
+            pass
+        values = cls._latest
+        if values is None:
+            values = dicttools.flattenDict(d.CONFIG)
+        try:
+            h = SettingHandle(key, values[key])
+        except KeyError:
             raise KeyError(f"Unable to find setting at '{key}'") from None
+        cls._handles[key] = h
+        return h
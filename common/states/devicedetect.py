@@ -9,17 +9,21 @@ Authors:
 """
 
 import time
-from typing import Optional
+from time import perf_counter
+from typing import TYPE_CHECKING, NoReturn, Optional
 import device
 
 import common
 from common.exceptions import DeviceRecogniseError
-from common import log, verbosity
+from common import log, verbosity, getStartupProfile
 from common.types.eventdata import isEventSysex, EventData
 from common.util.events import eventToString
 
 from . import IScriptState, DeviceNotRecognised, DeviceState
 
+if TYPE_CHECKING:
+    from devices import Device
+
 LOG_CAT = "bootstrap.device.type_detect"
 
 
@@ -36,9 +40,29 @@ class WaitingForDevice(IScriptState):
           recognised
         """
         self._init_time: Optional[float] = None
+        # Time when detection started, for the startup profile
+        self._detect_start: Optional[float] = None
         self._sent_enquiry = False
         self._to = switch_to
 
+    def recognise(self, dev: 'Device', method: str) -> NoReturn:
+        """
+        Switch to the next state, once the device has been recognised
+
+        ### Args:
+        * `dev` (`Device`): device that was recognised
+        * `method` (`str`): method used to recognise the device
+
+        ### Raises:
+        * `StateChangeException`: state changed successfully
+        """
+        if self._detect_start is not None:
+            getStartupProfile().addPhase(
+                f"Detect device (via {method})",
+                self._detect_start,
+            )
+        common.getContext().setState(self._to.create(dev))
+
     def nameAssociations(self) -> None:
         """
         Uses the name associations setting to get device mappings
@@ -61,7 +85,7 @@ class WaitingForDevice(IScriptState):
                         f"{dev.getId()}",
                         verbosity.INFO
                     )
-                    common.getContext().setState(self._to.create(dev))
+                    self.recognise(dev, "name associations")
                 except DeviceRecogniseError:
                     log(
                         "bootstrap.device.type_detect",
@@ -90,7 +114,7 @@ class WaitingForDevice(IScriptState):
                 f"Recognised device via fallback: {dev.getId()}",
                 verbosity.INFO
             )
-            common.getContext().setState(self._to.create(dev))
+            self.recognise(dev, "fallback")
         except DeviceRecogniseError:
             log(
                 LOG_CAT,
@@ -111,10 +135,12 @@ class WaitingForDevice(IScriptState):
             self.detectFallback()
         else:
             device.midiOutSysex(bytes([0xF0, 0x7E, 0x7F, 0x06, 0x01, 0xF7]))
+            getStartupProfile().mark("Send device enquiry")
             log(LOG_CAT, "Sent universal device enquiry", verbosity.INFO)
 
     def initialise(self) -> None:
         self._init_time = time.time()
+        self._detect_start = perf_counter()
         # Check if there's an association between the device name and a device
         # If so, a StateChangeException will be raised so this function will
         # return early
@@ -146,6 +172,7 @@ class WaitingForDevice(IScriptState):
                     f"{(time.time() - self._init_time):.2f} seconds",
                     verbosity.INFO
                 )
+                getStartupProfile().mark("Device enquiry timeout")
                 self.detectFallback()
         else:
             self.sendEnquiry()
@@ -164,7 +191,7 @@ class WaitingForDevice(IScriptState):
                     eventToString(event)
                 )
                 event.handled = True
-                common.getContext().setState(self._to.create(dev))
+                self.recognise(dev, "sysex")
             except DeviceRecogniseError:
                 log(
                     LOG_CAT,
@@ -5,18 +5,23 @@ Represents the script in its main state, where the device is recognised and
 behaving as expected.
 """
 
-import plugins
-from typing import TYPE_CHECKING
+from time import perf_counter
+from typing import TYPE_CHECKING, Optional
 
 import common
 from common import ProfilerContext, profilerDecoration
+from common import StartupPhase, getStartupProfile
 from common import log, verbosity
 from common.types import EventData
 from common.util.events import eventToString
+from common.prewarmer import PluginPrewarmer
+from common.focuschanges import FocusChange
 from .devstate import DeviceState
 
 if TYPE_CHECKING:
+    from controlsurfaces import ControlEvent
     from devices import Device
+    from plugs import Plugin
 
 
 class MainState(DeviceState):
@@ -34,69 +39,210 @@ class MainState(DeviceState):
             )
         common.getContext().registerDevice(device)
         self._device = device
+        self._prewarmer = PluginPrewarmer(device)
+        # Plugins are imported after the common module is initialised
+        from plugs import RoutingTable
+        self._routes = RoutingTable()
+        # The active plugin or window index is only updated when the focus
+        # changes, rather than being checked on every tick and event
+        self._active_idx = common.getContext().active.getActive()
+        self._focus_changed = False
+        common.getContext().active.changes.subscribe(self._onFocusChange)
 
     @classmethod
     def create(cls, device: 'Device') -> 'DeviceState':
         return cls(device)
 
     def initialise(self) -> None:
-        self._device.initialise()
+        with StartupPhase("Initialise device"):
+            self._device.initialise()
 
     def deinitialise(self) -> None:
-        pass
+        common.getContext().active.changes.unsubscribe(self._onFocusChange)
+
+    def _onFocusChange(self, event: FocusChange) -> None:
+        """
+        Called when the focus changes, to update the active index
+
+        ### Args:
+        * `event` (`FocusChange`): focus change event
+        """
+        idx = common.getContext().active.getActive()
+        if idx != self._active_idx:
+            self._active_idx = idx
+            self._focus_changed = True
+            # Events may arrive before the next tick, so the routes must be
+            # rebuilt for the new plugin when the next one is dispatched
+            self._routes.invalidate()
+
+    def _getActivePlugin(self) -> Optional['Plugin']:
+        """
+        Returns the active standard plugin or window plugin, if there is one
+
+        ### Returns:
+        * `Plugin`: active plugin, or None
+        """
+        plug_idx = self._active_idx
+        if plug_idx is None:
+            return None
+        elif isinstance(plug_idx, tuple):
+            return common.ExtensionManager.getPluginByIndex(
+                plug_idx, self._device)
+        else:
+            return common.ExtensionManager.getWindowById(
+                plug_idx, self._device)
+
+    def _updateRoutes(self, active: Optional['Plugin']) -> None:
+        """
+        Update the routing table so that events are routed to the active
+        plugin, then to the active special plugins
+
+        ### Args:
+        * `active` (`Plugin`, optional): active standard or window plugin
+        """
+        layers: list[Plugin] = [] if active is None else [active]
+        layers.extend(
+            common.ExtensionManager.getAllActiveSpecialPlugins(self._device))
+        self._routes.update(layers)
+
+    def _applyLayer(
+        self,
+        plug: 'Plugin',
+        thorough: bool,
+        rate: Optional[float],
+    ) -> None:
+        """
+        Apply a plugin as a layer of the compositor's frame. If the plugin
+        isn't applied because of its rate, its previous layer is reused, so
+        that it still overrides the layers below it.
+
+        ### Args:
+        * `plug` (`Plugin`): plugin to apply
+        * `thorough` (`bool`): whether to apply all values
+        * `rate` (`float`, optional): maximum rate at which to apply the
+          plugin
+        """
+        compositor = self._device.getCompositor()
+        compositor.beginLayer(plug, merge=not thorough)
+        applied = common.getContext().scheduler.run(
+            f"Apply {type(plug)}", plug.apply,
+            thorough=thorough, compositor=compositor, essential=True,
+            rate=rate,
+        )
+        compositor.endLayer(applied)
 
     @profilerDecoration("tick")
     def tick(self) -> None:
-        with ProfilerContext("Device tick"):
-            self._device.doTick()
+        tick_start = perf_counter()
+        # Plugin ticks are run within the tick budget, so that an expensive
+        # plugin can't starve device updates. Applying plugins is essential,
+        # so that LEDs are always updated. Each plugin can also limit the
+        # rates at which it is ticked and applied. When a plugin isn't
+        # applied, the compositor reuses its previous layer
+        scheduler = common.getContext().scheduler
+        # When under load, some work is reduced
+        load = common.getContext().load
+        scheduler.run("Device tick", self._device.doTick, essential=True)
+
+        # Plugins are applied as layers of a single frame, which is committed
+        # once all the plugins have been applied, so that controls are only
+        # updated once per tick
+        compositor = self._device.getCompositor()
+
+        # Find the special plugins that are active for this tick, so that
+        # events can reuse the lists until the next tick
+        with ProfilerContext("Refresh special plugins"):
+            common.ExtensionManager.refreshSpecialPlugins(self._device)
 
         # Tick special plugins
         for p in common.ExtensionManager.getSpecialPlugins(self._device):
-            if p.shouldBeActive():
-                with ProfilerContext(f"Tick {type(p)}"):
-                    p.tick()
-                with ProfilerContext(f"Apply {type(p)}"):
-                    p.apply(thorough=True)
+            scheduler.run(f"Tick {type(p)}", p.tick, rate=p.getPollRate())
+            self._applyLayer(p, True, p.getApplyRate())
 
         # Tick active standard plugin or window
-        with ProfilerContext("getActive"):
-            plug_idx = common.getContext().active.getActive()
-            changed = common.getContext().active.hasChanged()
+        plug_idx = self._active_idx
+        changed = self._focus_changed
+        self._focus_changed = False
+        if changed:
+            # Plugin indexes may now refer to different plugins
+            common.ExtensionManager.invalidatePluginIndexes()
+        active: Optional[Plugin] = None
         if plug_idx is not None:
             if isinstance(plug_idx, tuple):
-                try:
-                    plug_id = plugins.getPluginName(*plug_idx)
-                except TypeError:
-                    # Plugin not valid
-                    plug_id = ""
-                plug = common.ExtensionManager.getPluginById(
-                    plug_id, self._device
+                plug = common.ExtensionManager.getPluginByIndex(
+                    plug_idx, self._device
                 )
                 if plug is not None:
-                    with ProfilerContext(f"Tick {type(plug)}"):
-                        plug.tick(plug_idx)
-                    with ProfilerContext(f"Apply {type(plug)}"):
-                        plug.apply(thorough=changed)
+                    active = plug
+                    # Newly focused plugins must be ticked and applied
+                    # straight away
+                    scheduler.run(
+                        f"Tick {type(plug)}", plug.tick, plug_idx,
+                        essential=changed,
+                        rate=None if changed else load.scalePollRate(
+                            plug.getPollRate()),
+                    )
+                    self._applyLayer(
+                        plug, changed,
+                        None if changed else plug.getApplyRate(),
+                    )
             else:
                 window = common.ExtensionManager.getWindowById(
                     plug_idx, self._device
                 )
                 if window is not None:
-                    with ProfilerContext(f"Tick {type(window)}"):
-                        window.tick()
-                    with ProfilerContext(f"Apply {type(window)}"):
-                        window.apply(thorough=changed)
+                    active = window
+                    scheduler.run(
+                        f"Tick {type(window)}", window.tick,
+                        essential=changed,
+                        rate=None if changed else load.scalePollRate(
+                            window.getPollRate()),
+                    )
+                    self._applyLayer(
+                        window, changed,
+                        None if changed else window.getApplyRate(),
+                    )
 
         # Tick final special plugins
         for p in common.ExtensionManager.getFinalSpecialPlugins(self._device):
-            if p.shouldBeActive():
-                with ProfilerContext(f"Tick {type(p)}"):
-                    p.tick()
-                with ProfilerContext(f"Apply {type(p)}"):
-                    p.apply(thorough=True)
+            scheduler.run(f"Tick {type(p)}", p.tick, rate=p.getPollRate())
+            self._applyLayer(p, True, p.getApplyRate())
 
-    @profilerDecoration("processEvent")
-    def processEvent(self, event: EventData) -> None:
+        with ProfilerContext("Commit frame"):
+            compositor.commit(annotations=load.shouldUpdateAnnotations())
+
+        # Resume long-running work that plugins have submitted, using the
+        # rest of the tick budget
+        tasks = common.getContext().tasks
+        if len(tasks):
+            scheduler.run(
+                "Background tasks", tasks.tick, scheduler.getRemaining())
+
+        # Update the routing table in case the focus or bindings changed
+        with ProfilerContext("Update routes"):
+            self._updateRoutes(active)
+
+        # If nothing changed, use the spare time to instantiate plugins that
+        # are likely to be used soon
+        if not changed:
+            scheduler.run("Prewarm", self._prewarmer.tick)
+
+        # Startup is complete once the first tick has finished
+        if not getStartupProfile().isFinished():
+            getStartupProfile().addPhase("First tick", tick_start)
+            getStartupProfile().finish()
+
+    def _matchEvent(self, event: EventData) -> Optional['ControlEvent']:
+        """
+        Match an event to a control on the device
+
+        ### Args:
+        * `event` (`EventData`): event to match
+
+        ### Returns:
+        * `ControlEvent`: control associated with the event, or None if it
+          wasn't recognised, in which case the event is marked as handled
+        """
         with ProfilerContext("Match event"):
             mapping = self._device.matchEvent(event)
         if mapping is None:
@@ -112,8 +258,7 @@ class MainState(DeviceState):
             #     f"Couldn't identify event: "
             #     f"{eventToString(event)}"
             # )
-            return
-
+            return None
         else:
             log(
                 "device.event.in",
@@ -121,40 +266,60 @@ class MainState(DeviceState):
                 verbosity.EVENT,
                 detailed_msg=eventToString(event)
             )
-        # Get active standard plugin
-        plug_idx = common.getContext().active.getActive()
-        if plug_idx is not None:
-            if isinstance(plug_idx, tuple):
-                try:
-                    plug_id = plugins.getPluginName(*plug_idx)
-                except TypeError:
-                    # Plugin not valid
-                    plug_id = ""
-                plug = common.ExtensionManager.getPluginById(
-                    plug_id, self._device
-                )
-                if plug is not None:
-                    with ProfilerContext(f"Process {type(plug)}"):
-                        if plug.processEvent(mapping, plug_idx):
-                            event.handled = True
-                            return
-            else:
-                window = common.ExtensionManager.getWindowById(
-                    plug_idx, self._device
-                )
-                if window is not None:
-                    with ProfilerContext(f"Process {type(window)}"):
-                        if window.processEvent(mapping, plug_idx):
-                            event.handled = True
-                            return
-
-        # Get special plugins
-        for p in (
-            common.ExtensionManager.getSpecialPlugins(self._device)
-            + common.ExtensionManager.getFinalSpecialPlugins(self._device)
-        ):
-            if p.shouldBeActive():
-                with ProfilerContext(f"Process {type(p)}"):
-                    if p.processEvent(mapping, plug_idx):
-                        event.handled = True
-                        return
+            return mapping
+
+    def _dispatchEvent(self, event: EventData, mapping: 'ControlEvent'):
+        """
+        Route a recognised event to the active plugin, followed by the special
+        plugins, until one of them handles it
+
+        ### Args:
+        * `event` (`EventData`): event to dispatch
+        * `mapping` (`ControlEvent`): control associated with the event
+        """
+        # If we haven't ticked yet, or the focus changed since the last tick,
+        # the routing table needs to be built
+        if not self._routes.isBuilt():
+            with ProfilerContext("Update routes"):
+                self._updateRoutes(self._getActivePlugin())
+        with ProfilerContext("Route event"):
+            if self._routes.processEvent(mapping, self._active_idx):
+                event.handled = True
+
+    @profilerDecoration("processEvent")
+    def processEvent(self, event: EventData) -> None:
+        mapping = self._matchEvent(event)
+        if mapping is not None:
+            self._dispatchEvent(event, mapping)
+
+    @profilerDecoration("processEventBatch")
+    def processEventBatch(self, events: list[EventData]) -> None:
+        # Control surfaces are imported after the common module is initialised
+        from controlsurfaces import (
+            ControlSurface,
+            Fader,
+            MasterFader,
+            Knob,
+            MasterKnob,
+            ModWheel,
+            PitchWheel,
+            ChannelAfterTouch,
+        )
+        coalesced = (
+            Fader, MasterFader, Knob, MasterKnob,
+            ModWheel, PitchWheel, ChannelAfterTouch,
+        )
+        matched: list[tuple[EventData, 'ControlEvent']] = []
+        for e in events:
+            mapping = self._matchEvent(e)
+            if mapping is not None:
+                matched.append((e, mapping))
+        # Only the latest value of each absolute control needs to be
+        # processed, since earlier values would be overwritten straight away
+        latest: dict[ControlSurface, int] = {}
+        for i, (_, mapping) in enumerate(matched):
+            if isinstance(mapping.getControl(), coalesced):
+                latest[mapping.getControl()] = i
+        for i, (e, mapping) in enumerate(matched):
+            if latest.get(mapping.getControl(), i) == i:
+                self._dispatchEvent(e, mapping)
@@ -54,6 +54,19 @@ class IScriptState:
             "This method must be overridden by child classes"
         )
 
+    def processEventBatch(self, events: list[EventData]) -> None:
+        """
+        Process a batch of MIDI events that were queued since the last tick
+
+        By default, the events are processed in order, but this can be
+        overridden to merge redundant events.
+
+        ### Args:
+        * `events` (`list[EventData]`): events to process
+        """
+        for e in events:
+            self.processEvent(e)
+
     @abstractmethod
     def tick(self) -> None:
         """
@@ -13,6 +13,7 @@ import playlist
 
 from typing import Union, Optional
 from common.consts import PARAM_CC_START
+from common.backgroundtasks import Task, runToCompletion
 
 GeneratorIndex = tuple[int]
 UnsafeGeneratorIndex = Optional[GeneratorIndex]
@@ -29,7 +30,38 @@ UnsafeWindowIndex = Optional[int]
 UnsafeIndex = Union[UnsafePluginIndex, UnsafeWindowIndex]
 
 
-def getFocusedPluginIndex(force: bool = False) -> UnsafePluginIndex:
+class FocusSnapshot:
+    """
+    A snapshot of which form is focused in FL Studio.
+
+    This is taken once, then shared by the functions that find the focused
+    plugin or window, so that they don't repeatedly call the FL Studio API.
+    """
+
+    def __init__(self, form_id: Optional[int] = None) -> None:
+        """
+        Take a snapshot of the focused form
+
+        ### Args:
+        * `form_id` (`int`, optional): value of `ui.getFocusedFormID()`, if
+          it has already been found. Defaults to None.
+        """
+        self.form_id: int = \
+            ui.getFocusedFormID() if form_id is None else form_id
+        self.mixer_plugin = bool(ui.getFocused(6))
+        self.channel_plugin = bool(ui.getFocused(7))
+
+    def __repr__(self) -> str:
+        return (
+            f"FocusSnapshot (form {self.form_id}, mixer plugin: "
+            f"{self.mixer_plugin}, channel plugin: {self.channel_plugin})"
+        )
+
+
+def getFocusedPluginIndex(
+    force: bool = False,
+    snapshot: Optional[FocusSnapshot] = None,
+) -> UnsafePluginIndex:
     """
     Fixes the horrible ui.getFocusedFormIndex() function
 
@@ -38,24 +70,26 @@ def getFocusedPluginIndex(force: bool = False) -> UnsafePluginIndex:
     Args:
     * `force` (`bool`, optional): whether to return the selected plugin on the
       channel rack if none are explicitly active
+    * `snapshot` (`FocusSnapshot`, optional): snapshot of the focused form to
+      use. Defaults to taking a new snapshot.
 
     Returns:
     * `None`: if no plugin is focused
     * `int`: grouped index of a channel rack plugin if one is focused
     * `int, int`: index of a mixer plugin if one is focused
     """
-    # Check if a channel rack plugin is focused
-    # if ui.getFocused(7):
-    form_id = ui.getFocusedFormID()
+    if snapshot is None:
+        snapshot = FocusSnapshot()
+    form_id = snapshot.form_id
 
     # If a mixer plugin is focused
-    if ui.getFocused(6):
+    if snapshot.mixer_plugin:
         track = form_id // 4194304
         slot = (form_id - 4194304 * track) // 65536
         return track, slot
     # Otherwise, assume that a channel is selected
     # Use the channel rack index so that we always have one
-    elif ui.getFocused(7):
+    elif snapshot.channel_plugin:
         # NOTE: When using groups, ui.getFocusedFormID() returns the index
         # respecting groups, instead of the global index, yuck
         if form_id == -1:
@@ -69,21 +103,29 @@ def getFocusedPluginIndex(force: bool = False) -> UnsafePluginIndex:
             return None
 
 
-def getFocusedWindowIndex() -> Optional[int]:
+def getFocusedWindowIndex(
+    snapshot: Optional[FocusSnapshot] = None,
+) -> Optional[int]:
     """
     Fixes the horrible ui.getFocusedFormIndex() function
 
     Values are returned as tuples so that they can be unwrapped when
 
+    Args:
+    * `snapshot` (`FocusSnapshot`, optional): snapshot of the focused form to
+      use. Defaults to taking a new snapshot.
+
     Returns:
         * `None`: if no window is focused
         * `int`: index of window
     """
+    if snapshot is None:
+        snapshot = FocusSnapshot()
     # Check if a channel rack plugin is focused
-    if getFocusedPluginIndex() is not None:
+    if getFocusedPluginIndex(snapshot=snapshot) is not None:
         return None
     else:
-        ret = ui.getFocusedFormID()
+        ret = snapshot.form_id
         if ret == -1:
             return None
         return ret
@@ -127,20 +169,37 @@ def isPluginVst(index: PluginIndex) -> bool:
     return plugins.getParamCount(*index) > PARAM_CC_START
 
 
-def getSelectedPlaylistTrack() -> int:
+# Number of tracks to check during each slice of a background scan
+SCAN_SLICE = 16
+
+
+def scanSelectedPlaylistTrack() -> Task[int]:
     """
-    Returns the index of the first currently selected playlist track, or `1` if
-    no tracks are currently selected
+    Background task version of `getSelectedPlaylistTrack()`, which checks a
+    slice of tracks each time it is resumed
 
     ### Returns:
-    * `int`: selected track
+    * `Task[int]`: task returning the selected track
     """
     for i in range(1, playlist.trackCount()):
         if playlist.isTrackSelected(i):
             return i
+        if i % SCAN_SLICE == 0:
+            yield
     return 1
 
 
+def getSelectedPlaylistTrack() -> int:
+    """
+    Returns the index of the first currently selected playlist track, or `1` if
+    no tracks are currently selected
+
+    ### Returns:
+    * `int`: selected track
+    """
+    return runToCompletion(scanSelectedPlaylistTrack())
+
+
 def catchUnsafeOperation(func):
     """
     Decorator to prevent exceptions due to unsafe operations
@@ -181,22 +240,35 @@ def getSelectedDockMixerTracks() -> dict[int, list[int]]:
     return tracks
 
 
-def getSelectedMixerTracks() -> list[int]:
+def scanSelectedMixerTracks() -> Task[list[int]]:
     """
-    Returns a list of the selected mixer tracks, not including master or
-    current
+    Background task version of `getSelectedMixerTracks()`, which checks a
+    slice of tracks each time it is resumed
 
     ### Returns:
-    * `list[int]`: track selections
+    * `Task[list[int]]`: task returning the track selections
     """
     tracks: list[int] = []
     for i in range(1, mixer.trackCount() - 1):
         if mixer.isTrackSelected(i):
             tracks.append(i)
+        if i % SCAN_SLICE == 0:
+            yield
 
     return tracks
 
 
+def getSelectedMixerTracks() -> list[int]:
+    """
+    Returns a list of the selected mixer tracks, not including master or
+    current
+
+    ### Returns:
+    * `list[int]`: track selections
+    """
+    return runToCompletion(scanSelectedMixerTracks())
+
+
 def getMixerDockSides() -> dict[int, list[int]]:
     """
     Returns a list of the dock sides for tracks on the mixer
@@ -72,6 +72,9 @@ help = ConsoleCommand(
     f"    * log.details(entry_number): print info about a log entry\n"
     f" * credits(): print credits for the script\n"
     f" * reset(): reset the script and reload modular components\n"
+    f" * getStartupProfile(): get the time taken by the script's startup\n"
+    f"    * getStartupProfile().inspect(): print a breakdown of startup\n"
+    f"    * getStartupProfile().dump(): get the breakdown as JSON\n"
 )
 
 # Damn this is an awful way of formatting this, but I can't think of anything
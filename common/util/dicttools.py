@@ -167,6 +167,67 @@ def expandDictShorthand(d: dict[str, Any], path: str = '') -> dict:
     return new
 
 
+def copyCategories(d: dict[str, Any]) -> dict[str, Any]:
+    """
+    Returns a copy of a nested dictionary, where the nested categories are
+    also copied, so that changes to the copy's categories don't affect the
+    original. Other values aren't copied.
+
+    ### Args:
+    * `d` (`dict[str, Any]`): dictionary to copy
+
+    ### Returns:
+    * `dict[str, Any]`: copy of dictionary
+    """
+    return {
+        key: copyCategories(value) if type(value) is dict else value
+        for key, value in d.items()
+    }
+
+
+def flattenDict(d: dict[str, Any], path: str = '') -> dict[str, Any]:
+    """
+    Flattens a nested dictionary into a single dictionary keyed by the dotted
+    path to each value. Categories are included as well as the values within
+    them.
+
+    For example,
+    ```py
+    {
+        "foo": {
+            "bar": 1
+        },
+        "bat": 3
+    }
+    ```
+    would flatten to
+    ```py
+    {
+        "foo": {"bar": 1},
+        "foo.bar": 1,
+        "bat": 3
+    }
+    ```
+
+    ### Args:
+    * `d` (`dict[str, Any]`): dictionary to flatten
+    * `path` (`str`, optional): path of the dictionary, which is prepended to
+      its keys. Defaults to ''.
+
+    ### Returns:
+    * `dict[str, Any]`: flattened dictionary
+    """
+    flat: dict[str, Any] = {}
+    for key, value in d.items():
+        full_key = f"{path}.{key}" if path else key
+        flat[full_key] = value
+        # Like recursiveMergeDictionaries(), only plain dictionaries are
+        # treated as categories
+        if type(value) is dict:
+            flat.update(flattenDict(value, full_key))
+    return flat
+
+
 def greatestKey(d: dict[K, V]) -> K:
     """
     Returns the key which maps to the greatest value
@@ -0,0 +1,212 @@
+"""
+common > util > genmanifest
+
+Generates the manifests used to import extension modules lazily. This should
+be run whenever a plugin is added, removed or renamed:
+
+```
+python -m common.util.genmanifest
+```
+
+This is a development tool, and isn't used by the script within FL Studio.
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+"""
+
+import os
+from typing import Any, Optional
+
+# Root directory of the script
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+# Packages whose modules are listed in the plugin manifest
+PLUGIN_PACKAGES = ['plugs.standard', 'plugs.windows', 'plugs.special']
+
+# Packages whose modules are listed in the device manifest
+DEVICE_PACKAGES = ['devices']
+
+
+def _importAll(package: str) -> None:
+    """
+    Import every module within a package and its subpackages
+
+    ### Args:
+    * `package` (`str`): name of package to import
+    """
+    base = os.path.join(ROOT, *package.split('.'))
+    for dirpath, _, filenames in os.walk(base):
+        if '__init__.py' not in filenames:
+            continue
+        rel = os.path.relpath(dirpath, ROOT)
+        prefix = '.'.join(rel.split(os.sep))
+        for f in sorted(filenames):
+            if f.endswith('.py') and f != '__init__.py':
+                __import__(f"{prefix}.{f[:-3]}")
+
+
+def _formatDict(name: str, d: dict[Any, str]) -> str:
+    """
+    Format a dictionary as Python source
+
+    ### Args:
+    * `name` (`str`): name of variable
+    * `d` (`dict[Any, str]`): dictionary to format
+
+    ### Returns:
+    * `str`: source code
+    """
+    lines = [f"{name} = {{"]
+    for key, value in d.items():
+        line = f"    {key!r}: {value!r},"
+        # Keep within the line length limit
+        if len(line) > 79:
+            line = f"    {key!r}:\n        {value!r},"
+        lines.append(line)
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def _enquiryPrefix(pattern: Any) -> Optional[list[Any]]:
+    """
+    Convert a universal device enquiry response pattern to a prefix that
+    can be stored in the device manifest.
+
+    Each byte of the prefix is either an `int`, a `tuple` of allowed values,
+    or `None` to match any value.
+
+    ### Args:
+    * `pattern` (`IEventPattern`): pattern to convert
+
+    ### Returns:
+    * `list`: prefix, or None if the pattern can't be represented, meaning
+      the device's module must be imported to check for a match
+    """
+    from common.eventpattern import BasicPattern
+    if not isinstance(pattern, BasicPattern) or not pattern.sysex_event:
+        return None
+    prefix: list[Any] = []
+    for b in pattern.sysex:
+        if isinstance(b, int):
+            prefix.append(b)
+        elif isinstance(b, range):
+            prefix.append(tuple(b))
+        elif isinstance(b, tuple):
+            prefix.append(tuple(
+                v for r in b
+                for v in (r if isinstance(r, range) else (r,))
+            ))
+        else:
+            prefix.append(None)
+    return prefix
+
+
+def generateDeviceManifest() -> str:
+    """
+    Returns the source code of the device manifest (`devices/manifest.py`)
+
+    ### Returns:
+    * `str`: source code
+    """
+    from common import ExtensionManager as em
+    for p in DEVICE_PACKAGES:
+        _importAll(p)
+
+    entries = []
+    for d in em._devices:
+        pattern = d.getUniversalEnquiryResponsePattern()
+        entries.append(
+            "    {\n"
+            f"        'id': {d.__name__!r},\n"
+            f"        'module': {d.__module__!r},\n"
+            f"        'enquiry': {_enquiryPrefix(pattern)!r},\n"
+            f"        'enquiry_match': {pattern is not None!r},\n"
+            "    },"
+        )
+
+    return "\n\n".join([
+        '"""\n'
+        'devices > manifest\n'
+        '\n'
+        'Lists the devices that can be recognised, along with the modules '
+        'that define\nthem, so that only the module of the device that is '
+        'recognised needs to be\nimported.\n'
+        '\n'
+        'Each entry contains:\n'
+        '* `id`: the name of the device class, as used by name '
+        'associations\n'
+        '* `module`: the module that defines the device\n'
+        '* `enquiry`: the universal device enquiry response prefix, where '
+        'each byte is\n'
+        '  an `int`, a `tuple` of allowed values, or `None` for any value. If '
+        'this is\n'
+        '  `None`, the module must be imported to check for a match.\n'
+        '* `enquiry_match`: whether the device can be recognised using a '
+        'universal\n'
+        '  device enquiry\n'
+        '\n'
+        'This file is generated by `common/util/genmanifest.py`, and '
+        'shouldn\'t be\nedited manually.\n'
+        '"""',
+        "DEVICES = [\n" + "\n".join(entries) + "\n]",
+    ]) + "\n"
+
+
+def generatePluginManifest() -> str:
+    """
+    Returns the source code of the plugin manifest (`plugs/manifest.py`)
+
+    ### Returns:
+    * `str`: source code
+    """
+    from common import ExtensionManager as em
+    for p in PLUGIN_PACKAGES:
+        _importAll(p)
+
+    plugins = {
+        id: p.__module__ for id, p in sorted(em._plugins.items())
+    }
+    windows = {
+        id: p.__module__ for id, p in sorted(em._windows.items())
+    }
+    # Keep the registration order of special plugins, since it determines
+    # the order in which they process events
+    special = {p.__name__: p.__module__ for p in em._special_plugins}
+    final_special = {
+        p.__name__: p.__module__ for p in em._final_special_plugins
+    }
+
+    return "\n\n".join([
+        '"""\n'
+        'plugs > manifest\n'
+        '\n'
+        'Maps plugin IDs, window IDs and special plugin names to the modules '
+        'that\ndefine them, so that plugin modules can be imported when they '
+        'are first used.\n'
+        '\n'
+        'This file is generated by `common/util/genmanifest.py`, and '
+        'shouldn\'t be\nedited manually.\n'
+        '"""',
+        "# Standard plugins\n" + _formatDict("PLUGINS", plugins),
+        "# Window plugins\n" + _formatDict("WINDOWS", windows),
+        "# Special plugins\n" + _formatDict("SPECIAL_PLUGINS", special),
+        "# Final special plugins\n"
+        + _formatDict("FINAL_SPECIAL_PLUGINS", final_special),
+    ]) + "\n"
+
+
+def main() -> None:
+    """
+    Write the manifests to their files
+    """
+    for path, generator in [
+        (os.path.join(ROOT, 'plugs', 'manifest.py'), generatePluginManifest),
+        (os.path.join(ROOT, 'devices', 'manifest.py'), generateDeviceManifest),
+    ]:
+        with open(path, 'w') as f:
+            f.write(generator())
+        print(f"Wrote {path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""
+common > util > lrucache
+
+Contains the LruCache class, a dictionary-like container which is bounded
+by discarding its least recently used items.
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+"""
+
+from collections import OrderedDict
+from typing import Callable, Generic, Optional, TypeVar
+from collections.abc import Hashable, KeysView, ValuesView
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+
+class LruCache(Generic[K, V]):
+    """
+    A cache which holds up to a given number of items, discarding the least
+    recently used item when it becomes full.
+
+    The number of hits, misses and evictions are recorded so that the
+    effectiveness of the cache can be checked.
+    """
+
+    def __init__(
+        self,
+        capacity: Optional[int] = None,
+        on_discard: Optional[Callable[[V], None]] = None,
+    ) -> None:
+        """
+        Create an LRU cache
+
+        ### Args:
+        * `capacity` (`int`, optional): maximum number of items. Defaults to
+          None, meaning the cache is unbounded.
+        * `on_discard` (`Callable[[V], None]`, optional): function called
+          with each item that is evicted or cleared from the cache. Defaults
+          to None.
+        """
+        self._items: OrderedDict[K, V] = OrderedDict()
+        self._capacity = capacity
+        self._on_discard = on_discard
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"LruCache ({len(self)}/{self._capacity} items, "
+            f"{self.hits} hits, {self.misses} misses, "
+            f"{self.evictions} evictions)"
+        )
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._items
+
+    def __getitem__(self, key: K) -> V:
+        """
+        Returns an item without counting it as a use
+        """
+        return self._items[key]
+
+    def keys(self) -> KeysView[K]:
+        return self._items.keys()
+
+    def values(self) -> ValuesView[V]:
+        return self._items.values()
+
+    def _discard(self, item: V) -> None:
+        if self._on_discard is not None:
+            self._on_discard(item)
+
+    def _evict(self) -> None:
+        """
+        Evict the least recently used items until the cache is within its
+        capacity
+        """
+        if self._capacity is None:
+            return
+        while len(self._items) > self._capacity:
+            _, item = self._items.popitem(last=False)
+            self.evictions += 1
+            self._discard(item)
+
+    def setCapacity(self, capacity: Optional[int]) -> None:
+        """
+        Set the maximum number of items in the cache, evicting items if
+        required
+
+        ### Args:
+        * `capacity` (`int`, optional): maximum number of items, or None for
+          no limit
+        """
+        self._capacity = capacity
+        self._evict()
+
+    def get(self, key: K) -> Optional[V]:
+        """
+        Returns an item from the cache and marks it as recently used, or
+        returns None if it isn't in the cache
+
+        ### Args:
+        * `key` (`K`): key to get
+
+        ### Returns:
+        * `V`: item, or None if it wasn't found
+        """
+        try:
+            item = self._items[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._items.move_to_end(key)
+        return item
+
+    def add(self, key: K, item: V) -> None:
+        """
+        Add an item to the cache, evicting the least recently used items if
+        the cache is full
+
+        ### Args:
+        * `key` (`K`): key to add
+        * `item` (`V`): item to add
+        """
+        self._items[key] = item
+        self._items.move_to_end(key)
+        self._evict()
+
+    def clear(self) -> None:
+        """
+        Discard all items in the cache. Statistics are kept.
+        """
+        items = self._items
+        self._items = OrderedDict()
+        for item in items.values():
+            self._discard(item)
@@ -4,10 +4,12 @@ common > util > snap
 Contains functions to help with snapping to a default value
 """
 
-import common
+from common.settings import Settings
 
 SNAP_AMOUNT = 0.02
 
+DO_SNAP = Settings.handle("plugins.general.do_snap")
+
 
 def snap(value: float, to: float) -> float:
     """
@@ -22,7 +24,7 @@ def snap(value: float, to: float) -> float:
     * `float`: snapped value
     """
 
-    if not common.getContext().settings.get("plugins.general.do_snap"):
+    if not DO_SNAP.value:
         return value
 
     if abs(value - to) <= SNAP_AMOUNT:
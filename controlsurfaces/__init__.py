@@ -12,6 +12,9 @@ __all__ = [
     # Base types
     'ControlSurface',
     'ControlShadow',
+    'TickRegistry',
+    'Compositor',
+    'ControlFrame',
     # Control mappings
     'IControlHash',
     'ControlMapping',
@@ -100,6 +103,8 @@ __all__ = [
 
 from .controlsurface import ControlSurface
 from .controlshadow import ControlShadow
+from .tickregistry import TickRegistry
+from .compositor import Compositor, ControlFrame
 from .controlmapping import (
     IControlHash,
     ControlMapping,
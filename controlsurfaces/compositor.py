@@ -0,0 +1,317 @@
+"""
+controlsurfaces > compositor
+
+Contains the Compositor class, which merges the layers applied by plugins
+during a tick into a single frame, so that each control is only updated once
+per tick.
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+"""
+
+from typing import TYPE_CHECKING, Any, Hashable, Optional
+from common.types import Color
+
+if TYPE_CHECKING:
+    from .controlsurface import ControlSurface
+
+
+class ControlFrame:
+    """
+    The state of a control within a frame.
+
+    This mirrors the properties and update flags of a ControlSurface, so that
+    control shadows can be applied to it in the same way as they would be
+    applied to the control itself, without sending any events to the device.
+    """
+
+    def __init__(
+        self,
+        control: 'ControlSurface',
+        compositor: Optional['Compositor'] = None,
+    ) -> None:
+        """
+        Create a frame of a control, starting with its current state
+
+        ### Args:
+        * `control` (`ControlSurface`): control to create a frame of
+        * `compositor` (`Compositor`, optional): compositor that the frame
+          belongs to, which records the properties set by each layer.
+          Defaults to None.
+        """
+        self._control = control
+        self._compositor = compositor
+        self._color = control.color
+        self._annotation = control.annotation
+        self._value = control.value
+        self._needs_update = control.needs_update
+        self._got_update = control.got_update
+        self._color_set = False
+        self._annotation_set = False
+        self._value_set = False
+
+    def __repr__(self) -> str:
+        return f"Frame of {self._control}"
+
+    def getControl(self) -> 'ControlSurface':
+        """
+        Returns the control that this frame represents
+
+        ### Returns:
+        * `ControlSurface`: control
+        """
+        return self._control
+
+    @property
+    def color(self) -> Color:
+        """
+        The color of the control in this frame
+        """
+        return self._color
+
+    @color.setter
+    def color(self, c: Color) -> None:
+        self._got_update = True
+        self._color = c
+        self._color_set = True
+        if self._compositor is not None:
+            self._compositor.recordSet(self._control, "color", c)
+
+    @property
+    def annotation(self) -> str:
+        """
+        The annotation of the control in this frame
+        """
+        return self._annotation
+
+    @annotation.setter
+    def annotation(self, a: str) -> None:
+        self._annotation = a
+        self._annotation_set = True
+        if self._compositor is not None:
+            self._compositor.recordSet(self._control, "annotation", a)
+
+    @property
+    def value(self) -> float:
+        """
+        The value of the control in this frame
+        """
+        return self._value
+
+    @value.setter
+    def value(self, v: float) -> None:
+        if not (0 <= v <= 1):
+            raise ValueError(
+                "Value for control must be between 0 and 1"
+            )
+        if self._compositor is not None:
+            self._compositor.recordSet(self._control, "value", v)
+        if self._value != v:
+            self._value = v
+            self._value_set = True
+            self._needs_update = True
+            self._got_update = False
+
+    @property
+    def needs_update(self) -> bool:
+        """
+        Whether the value of the control has changed since the last time the
+        color was set, including changes made earlier in this frame.
+        """
+        return self._needs_update
+
+    @property
+    def got_update(self) -> bool:
+        """
+        Whether the value of the control has changed since the last time the
+        color was set, and was since updated, including changes made earlier
+        in this frame.
+        """
+        return self._got_update
+
+    def getSetAnnotation(self) -> Optional[str]:
+        """
+        Returns the annotation that was set during this frame
+
+        ### Returns:
+        * `str`: annotation, or None if it wasn't set
+        """
+        return self._annotation if self._annotation_set else None
+
+    def commit(self, annotations: bool = True) -> None:
+        """
+        Write the final state of the frame to the control.
+
+        Only properties that were set during the frame are written, and the
+        control only sends an update to the device if the property's final
+        value differs from its current value.
+
+        ### Args:
+        * `annotations` (`bool`, optional): whether to write the annotation.
+          Defaults to True.
+        """
+        write_annotation = annotations and self._annotation_set
+        # If the colour was set after the value changed, the colour must be
+        # set last so that the control's update flags match
+        if self._got_update:
+            if self._value_set:
+                self._control.value = self._value
+            if write_annotation:
+                self._control.annotation = self._annotation
+            if self._color_set:
+                self._control.color = self._color
+        else:
+            if self._color_set:
+                self._control.color = self._color
+            if write_annotation:
+                self._control.annotation = self._annotation
+            if self._value_set:
+                self._control.value = self._value
+
+
+class Compositor:
+    """
+    Merges the layers applied by plugins during a tick into a single frame.
+
+    While a frame is open, control shadows are applied to ControlFrame
+    objects rather than to the controls themselves. When the frame is
+    committed, only the final state of each control is written, so that
+    controls which are changed by multiple layers don't send intermediate
+    updates to the device.
+
+    Each layer's contribution to the frame is kept, so that a layer which
+    isn't applied during a tick (for example because of its apply rate) can
+    be reused, and still override the layers below it.
+    """
+
+    def __init__(self) -> None:
+        self._frames: dict['ControlSurface', ControlFrame] = {}
+        # Annotations that haven't been written yet, since annotations were
+        # skipped when their frame was committed
+        self._pending_annotations: dict['ControlSurface', str] = {}
+        # The last properties that each layer set on each control
+        self._layers: dict[
+            Hashable, dict['ControlSurface', dict[str, Any]]] = {}
+        # The layer currently being applied, and the properties it has set
+        self._layer: Optional[Hashable] = None
+        self._layer_merge = False
+        self._recorded: dict['ControlSurface', dict[str, Any]] = {}
+
+    def __repr__(self) -> str:
+        return f"Compositor ({len(self._frames)} controls in frame)"
+
+    def getFrame(self, control: 'ControlSurface') -> ControlFrame:
+        """
+        Returns the frame of a control, creating it if it hasn't been modified
+        yet during this frame.
+
+        ### Args:
+        * `control` (`ControlSurface`): control to get the frame of
+
+        ### Returns:
+        * `ControlFrame`: frame of control
+        """
+        try:
+            return self._frames[control]
+        except KeyError:
+            frame = ControlFrame(control, self)
+            self._frames[control] = frame
+            return frame
+
+    def recordSet(
+        self,
+        control: 'ControlSurface',
+        prop: str,
+        value: Any,
+    ) -> None:
+        """
+        Called by frames when a property is set, so that the contribution of
+        the current layer can be reused on ticks where it isn't applied
+
+        ### Args:
+        * `control` (`ControlSurface`): control whose property was set
+        * `prop` (`str`): name of property (`"color"`, `"annotation"` or
+          `"value"`)
+        * `value` (`Any`): value that was set
+        """
+        if self._layer is not None:
+            self._recorded.setdefault(control, {})[prop] = value
+
+    def beginLayer(self, key: Hashable, merge: bool = False) -> None:
+        """
+        Start recording the contribution of a layer to the frame
+
+        ### Args:
+        * `key` (`Hashable`): key used to identify the layer between frames,
+          usually the plugin that applies it
+        * `merge` (`bool`, optional): whether the layer only sets the
+          properties that changed, so that its contribution should be merged
+          into its previous contribution, rather than replacing it. Defaults
+          to False.
+        """
+        self._layer = key
+        self._layer_merge = merge
+        self._recorded = {}
+
+    def endLayer(self, applied: bool = True) -> None:
+        """
+        Finish the current layer.
+
+        If the layer was applied, its contribution is kept for future frames.
+        Otherwise, its previous contribution is applied again, so that it
+        still overrides the layers below it.
+
+        ### Args:
+        * `applied` (`bool`, optional): whether the layer was applied during
+          this frame. Defaults to True.
+        """
+        key = self._layer
+        recorded = self._recorded
+        self._layer = None
+        self._recorded = {}
+        if key is None:
+            return
+        if applied:
+            if self._layer_merge and key in self._layers:
+                layer = self._layers[key]
+                for control, props in recorded.items():
+                    layer.setdefault(control, {}).update(props)
+            else:
+                self._layers[key] = recorded
+            return
+        for control, props in self._layers.get(key, {}).items():
+            frame = self.getFrame(control)
+            # Set the properties in the same order as control shadows do
+            if "color" in props:
+                frame.color = props["color"]
+            if "annotation" in props:
+                frame.annotation = props["annotation"]
+            if "value" in props:
+                frame.value = props["value"]
+
+    def commit(self, annotations: bool = True) -> None:
+        """
+        Write the frame to the controls, and start a new frame.
+
+        ### Args:
+        * `annotations` (`bool`, optional): whether to write annotations.
+          If False, annotations are kept until the next frame that writes
+          them, which reduces the number of updates sent to the device.
+          Defaults to True.
+        """
+        frames = self._frames
+        self._frames = {}
+        for f in frames.values():
+            if not annotations:
+                a = f.getSetAnnotation()
+                if a is not None:
+                    self._pending_annotations[f.getControl()] = a
+            f.commit(annotations)
+        if annotations and self._pending_annotations:
+            pending = self._pending_annotations
+            self._pending_annotations = {}
+            for control, a in pending.items():
+                # Newer annotations were written with their frame
+                if control not in frames \
+                        or frames[control].getSetAnnotation() is None:
+                    control.annotation = a
@@ -8,12 +8,13 @@ Authors:
 * Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
 """
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional, Union
 from common.types import Color
 from .controlmapping import ControlMapping
 
 if TYPE_CHECKING:
     from . import ControlSurface
+    from .compositor import Compositor, ControlFrame
 
 
 class ControlShadow:
@@ -115,33 +116,72 @@ class ControlShadow:
         """
         return self._control.coordinate
 
-    def apply(self, thorough: bool, transparent: bool) -> None:
+    def apply(
+        self,
+        thorough: bool,
+        transparent: bool,
+        compositor: Optional['Compositor'] = None,
+    ) -> None:
         """
         Apply the configuration of the control shadow to the control it
-        representsApply the configuration of the control shadow to the control
-        it represents
+        represents
 
         ### Args:
         * `thorough` (`bool`): whether we should always apply the values,
           regardless of whether they changed or not
         * `transparent` (`bool`): whether we should only set colours, and treat
           black as transparent
+        * `compositor` (`Compositor`, optional): compositor to apply to. If
+          given, the configuration is applied to the control's frame rather
+          than to the control itself. Defaults to None.
         """
+        target: Union['ControlSurface', 'ControlFrame'] = self._control \
+            if compositor is None else compositor.getFrame(self._control)
         # If our device shadow is transparent, we should only set the colour
         if transparent:
             if self.color != Color():
                 # IDEA: Superimpose the added colour
                 # Requires smarter updating of plugins and stuff
-                self._control.color = self.color
+                target.color = self.color
                 self._changed = False
             elif self._changed:
-                if not self._control.got_update:
-                    self._control.color = self.color
+                if not target.got_update:
+                    target.color = self.color
                 self._changed = False
         # If we're being thorough, or the shadow has changed since last time,
         # or if the control needs an update
-        elif thorough or self._changed or self._control.needs_update:
-            self._control.color = self.color
-            self._control.annotation = self.annotation
-            self._control.value = self.value
+        elif thorough or self._changed or target.needs_update:
+            target.color = self.color
+            target.annotation = self.annotation
+            target.value = self.value
             self._changed = False
+
+    @staticmethod
+    def applyDefault(
+        control: 'ControlSurface',
+        transparent: bool,
+        compositor: Optional['Compositor'] = None,
+    ) -> None:
+        """
+        Apply the default state of a control shadow to a control, as if a
+        newly created shadow of it were applied thoroughly.
+
+        This is used by device shadows so that shadows don't need to be
+        created for controls that are never bound or modified.
+
+        ### Args:
+        * `control` (`ControlSurface`): control to apply to
+        * `transparent` (`bool`): whether we should only set colours, and treat
+          black as transparent
+        * `compositor` (`Compositor`, optional): compositor to apply to.
+          Defaults to None.
+        """
+        # Default shadows are black and unchanged, so transparent shadows
+        # leave the control alone
+        if transparent:
+            return
+        target: Union['ControlSurface', 'ControlFrame'] = control \
+            if compositor is None else compositor.getFrame(control)
+        target.color = Color()
+        target.annotation = ""
+        target.value = 0.0
@@ -10,10 +10,10 @@ Authors:
 # from __future__ import annotations
 
 from time import time
-from typing import Optional, final
+from typing import TYPE_CHECKING, Optional, final
 from abc import abstractmethod
 
-from common import getContext
+from common.settings import Settings
 from common.eventpattern import IEventPattern
 from common.types import EventData, Color
 
@@ -21,6 +21,12 @@ from .valuestrategies import IValueStrategy
 
 from .controlmapping import ControlEvent, ControlMapping
 
+if TYPE_CHECKING:
+    from .tickregistry import TickRegistry
+
+# Read for every press, so a handle is used to avoid looking it up each time
+DOUBLE_PRESS_TIME = Settings.handle("controls.double_press_time")
+
 
 class ControlSurface:
     """
@@ -94,6 +100,8 @@ class ControlSurface:
         self._coord = coordinate
         self._needs_update = False
         self._got_update = False
+        # Registry used to request ticks when required
+        self._tick_registry: Optional['TickRegistry'] = None
 
         # The time that this control was pressed last
         self._press = 0.0
@@ -141,8 +149,7 @@ class ControlSurface:
             t = time()
             self._tweak = t
             if self.isPress(self.value):
-                double_press = t - self._press \
-                    <= getContext().settings.get("controls.double_press_time")
+                double_press = t - self._press <= DOUBLE_PRESS_TIME.value
                 self._press = t
             else:
                 double_press = False
@@ -180,6 +187,8 @@ class ControlSurface:
     @color.setter
     def color(self, c: Color):
         self._got_update = True
+        if self._tick_registry is not None:
+            self._tick_registry.requestTick(self)
         if self._color != c:
             self._color = c
             self.onColorChange()
@@ -280,6 +289,33 @@ class ControlSurface:
         required, so that the value can be shown on compatible controls.
         """
 
+    @final
+    def setTickRegistry(self, registry: 'TickRegistry') -> None:
+        """
+        Set the tick registry used by this control to request ticks when its
+        update flags need to be cleared.
+
+        This is called by the tick registry when the control is registered,
+        and shouldn't be called elsewhere.
+
+        ### Args:
+        * `registry` (`TickRegistry`): registry to use
+        """
+        self._tick_registry = registry
+
+    @classmethod
+    @final
+    def overridesTick(cls) -> bool:
+        """
+        Returns whether this type of control overrides the `tick()` method,
+        meaning it needs to be ticked every tick, rather than only when its
+        update flags need to be cleared.
+
+        ### Returns:
+        * `bool`: whether `tick()` is overridden
+        """
+        return cls.tick is not ControlSurface.tick
+
     @final
     def doTick(self) -> None:
         """
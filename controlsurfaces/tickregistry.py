@@ -0,0 +1,86 @@
+"""
+controlsurfaces > tickregistry
+
+Contains the TickRegistry class, which keeps track of which control surfaces
+actually need to be ticked, so that idle controls can be skipped.
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+"""
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from . import ControlSurface
+
+
+class TickRegistry:
+    """
+    Keeps track of the controls that are interested in ticks.
+
+    Controls are only ticked if they override the `tick()` method (eg to
+    maintain their lighting), or if they have a pending update flag that
+    needs to be cleared. All other controls are skipped, which avoids ticking
+    every control on the device (including 128 notes) every tick.
+    """
+
+    def __init__(self) -> None:
+        """
+        Create a TickRegistry
+        """
+        # Controls that override tick(), which are always ticked
+        self._always: list['ControlSurface'] = []
+        self._always_set: set['ControlSurface'] = set()
+        # Controls that requested a tick since the last one
+        # Using a dict so that insertion order is kept
+        self._pending: dict['ControlSurface', None] = {}
+
+    def __repr__(self) -> str:
+        return (
+            f"TickRegistry ({len(self._always)} ticking controls, "
+            f"{len(self._pending)} pending)"
+        )
+
+    def register(self, control: 'ControlSurface') -> None:
+        """
+        Register a control with this registry, so that it can request ticks
+
+        ### Args:
+        * `control` (`ControlSurface`): control to register
+        """
+        control.setTickRegistry(self)
+        if control.overridesTick():
+            if control not in self._always_set:
+                self._always.append(control)
+                self._always_set.add(control)
+        elif control.got_update:
+            self._pending[control] = None
+
+    def requestTick(self, control: 'ControlSurface') -> None:
+        """
+        Request that a control be ticked during the next tick
+
+        This is called by controls when their update flags are set.
+
+        ### Args:
+        * `control` (`ControlSurface`): control requesting a tick
+        """
+        if control not in self._always_set:
+            self._pending[control] = None
+
+    def getActive(self) -> 'Iterator[ControlSurface]':
+        """
+        Returns the controls that should be ticked during this tick, and
+        clears the set of pending controls.
+
+        Controls that request a tick while the returned controls are being
+        ticked will be ticked next time.
+
+        ### Returns:
+        * `Iterator[ControlSurface]`: controls to tick
+        """
+        pending = self._pending
+        self._pending = {}
+        yield from self._always
+        yield from pending
@@ -14,6 +14,10 @@ Refer to module `common.consts` for a list of authors for the project
 """
 # flake8: noqa
 
+# Record when the script started loading, so that startup can be profiled
+from time import perf_counter
+_import_start = perf_counter()
+
 # Add our additional includes to the Python environment
 import fl_typing
 
@@ -33,6 +37,11 @@ from common.states import WaitingForDevice, MainState
 # Import console helpers
 from common.util.consolehelpers import *
 
+# Record the time taken to import the script's core modules
+from common import getStartupProfile
+getStartupProfile().start(_import_start)
+getStartupProfile().addPhase("Import core modules", _import_start)
+
 
 class OverallDevice:
     @catchContextResetException
@@ -51,6 +60,10 @@ class OverallDevice:
     def onIdle(self) -> None:
         getContext().tick()
 
+    @catchContextResetException
+    def onRefresh(self, flags: int) -> None:
+        getContext().refresh(flags)
+
     @catchContextResetException
     def bootstrap(self):
         log("bootstrap.initialize", "Load success", verbosity.INFO)
@@ -80,7 +93,7 @@ def OnIdle():
 
 
 def OnRefresh(flags: int):
-    device.onIdle()
+    device.onRefresh(flags)
 
 
 def bootstrap():
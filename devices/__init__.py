@@ -10,6 +10,7 @@ Authors:
 __all__ = [
     'Device',
     'DeviceShadow',
+    'BindingPlan',
     'EventCallback',
     'IControlMatcher',
     'BasicControlMatcher',
@@ -17,14 +18,8 @@ __all__ = [
 
 from .matchers import IControlMatcher, BasicControlMatcher
 from .device import Device
+from .bindingplan import BindingPlan
 from .deviceshadow import DeviceShadow, EventCallback
 
-# Device manufacturers
-from . import (
-    novation,
-    maudio
-)
-del (
-    novation,
-    maudio
-)
+# Device definitions are imported when they are needed, as listed in
+# devices.manifest
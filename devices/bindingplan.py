@@ -0,0 +1,176 @@
+"""
+devices > bindingplan
+
+Contains the BindingPlan class, which records the controls found when a plugin
+binds to a device, so that later instances of the plugin can bind to the same
+controls without searching for them again.
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+"""
+
+from typing import TYPE_CHECKING, Any, Optional, Union
+
+from controlsurfaces import ControlSurface
+
+if TYPE_CHECKING:
+    from . import Device
+
+# The arguments given to a search for controls
+SearchKey = tuple[Any, ...]
+# The version of a device's controls, along with the type, group and
+# coordinate of each control, in order
+DeviceLayout = tuple[int, tuple[tuple[type, str, tuple[int, int]], ...]]
+# Either the IDs of the controls found, or the error message if the search
+# failed
+SearchResult = Union[tuple[int, ...], str]
+
+
+class BindingPlan:
+    """
+    A binding plan records the results of each search for controls made while
+    a plugin is being created, in the order they were made.
+
+    Plans are recorded the first time a type of plugin is created for a type of
+    device. Later instances of the plugin replay the plan, so that each search
+    returns the recorded controls directly. If a plugin makes different
+    searches to the ones that were recorded, the plan is invalidated, and
+    searches are made normally.
+    """
+
+    def __init__(self, device: 'Device') -> None:
+        """
+        Create a binding plan, ready for recording
+
+        ### Args:
+        * `device` (`Device`): device that the plan is being recorded for
+        """
+        self._layout = BindingPlan._getLayout(device)
+        self._steps: list[tuple[SearchKey, SearchResult]] = []
+        self._recorded = False
+        self._valid = True
+
+    def __repr__(self) -> str:
+        if not self._valid:
+            state = "invalid"
+        elif self._recorded:
+            state = "recorded"
+        else:
+            state = "recording"
+        return f"BindingPlan ({len(self._steps)} steps, {state})"
+
+    def isRecorded(self) -> bool:
+        """
+        Returns whether the plan has finished recording, and can be replayed
+
+        ### Returns:
+        * `bool`: whether the plan is recorded
+        """
+        return self._recorded
+
+    def isValid(self) -> bool:
+        """
+        Returns whether the plan is still valid
+
+        ### Returns:
+        * `bool`: whether the plan is valid
+        """
+        return self._valid
+
+    def invalidate(self) -> None:
+        """
+        Mark the plan as invalid, so that it won't be used again
+        """
+        self._valid = False
+
+    def finishRecording(self) -> None:
+        """
+        Finish recording the plan, so that it can be replayed
+        """
+        self._recorded = True
+
+    @staticmethod
+    def _getLayout(device: 'Device') -> DeviceLayout:
+        """
+        Returns the layout of a device's controls, which must match for the
+        recorded control IDs to refer to the same controls
+
+        ### Args:
+        * `device` (`Device`): device to get the layout of
+
+        ### Returns:
+        * `DeviceLayout`: layout of controls
+        """
+        return device.getControlVersion(), tuple(
+            (type(c), c.group, c.coordinate) for c in device.getControls()
+        )
+
+    def matchesDevice(self, device: 'Device') -> bool:
+        """
+        Returns whether this plan can be used with the given device
+
+        ### Args:
+        * `device` (`Device`): device to check
+
+        ### Returns:
+        * `bool`: whether the device has the same controls, in the same
+          order, as the one the plan was recorded for
+        """
+        return BindingPlan._getLayout(device) == self._layout
+
+    def record(
+        self,
+        key: SearchKey,
+        result: 'list[ControlSurface] | ValueError',
+        device: 'Device',
+    ) -> None:
+        """
+        Record the result of a search for controls
+
+        ### Args:
+        * `key` (`SearchKey`): arguments given to the search
+        * `result` (`list[ControlSurface] | ValueError`): controls found by the
+          search, or the error it raised
+        * `device` (`Device`): device the controls belong to
+        """
+        if self._recorded:
+            raise ValueError("Can't record to a plan that is already recorded")
+        if isinstance(result, ValueError):
+            self._steps.append((key, str(result)))
+        else:
+            index = device.getControlIndex()
+            self._steps.append(
+                (key, tuple(index.getControlId(c) for c in result))
+            )
+
+    def replay(
+        self,
+        step: int,
+        key: SearchKey,
+        device: 'Device',
+    ) -> Optional[list[ControlSurface]]:
+        """
+        Replay a step of the plan
+
+        ### Args:
+        * `step` (`int`): step number to replay
+        * `key` (`SearchKey`): arguments given to the search, which must match
+          the ones that were recorded
+        * `device` (`Device`): device to get the controls from
+
+        ### Raises:
+        * `ValueError`: the recorded search raised an error
+
+        ### Returns:
+        * `list[ControlSurface]`: controls found by the recorded search
+        * `None`: the search doesn't match the plan, meaning the plan has been
+          invalidated and a search should be made normally
+        """
+        if step >= len(self._steps) or self._steps[step][0] != key:
+            self.invalidate()
+            return None
+        result = self._steps[step][1]
+        if isinstance(result, str):
+            raise ValueError(result)
+        index = device.getControlIndex()
+        return [index.getControlById(i) for i in result]
@@ -0,0 +1,135 @@
+"""
+devices > controlindex
+
+Contains the ControlIndex class, which indexes the controls of a device by
+type and group, so that device shadows can find matching controls without
+scanning every control on the device.
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+"""
+
+from typing import Union
+from controlsurfaces import ControlSurface
+from .matchers import IControlMatcher
+
+ControlTypes = Union[
+    type[ControlSurface],
+    tuple[type[ControlSurface], ...],
+]
+
+
+class ControlIndex:
+    """
+    An index of a device's controls, mapping control types to the groups of
+    matching controls, where each group is sorted by coordinate.
+
+    Entries are computed the first time a type is requested, and are shared
+    by all the shadows of a device. The index is rebuilt if the controls of
+    the device change.
+    """
+
+    def __init__(self, matcher: IControlMatcher) -> None:
+        """
+        Create a ControlIndex
+
+        ### Args:
+        * `matcher` (`IControlMatcher`): control matcher whose controls should
+          be indexed
+        """
+        self._matcher = matcher
+        self._version = matcher.getVersion()
+        self._index: dict[ControlTypes, dict[str, list[ControlSurface]]] = {}
+        # Map controls to their position in the list of controls
+        self._ids: dict[ControlSurface, int] = {}
+
+    def __repr__(self) -> str:
+        return f"ControlIndex ({len(self._index)} types indexed)"
+
+    def _checkVersion(self) -> None:
+        """
+        Clear the index if the controls of the matcher have changed
+        """
+        version = self._matcher.getVersion()
+        if version != self._version:
+            self._index = {}
+            self._ids = {}
+            self._version = version
+
+    def getControlId(self, control: ControlSurface) -> int:
+        """
+        Returns the ID of a control, which is its position in the list of
+        the device's controls.
+
+        IDs are the same between instances of a device type, so they can be
+        used to refer to controls independently of a device instance.
+
+        ### Args:
+        * `control` (`ControlSurface`): control to get the ID of
+
+        ### Raises:
+        * `KeyError`: control isn't a control of this device
+
+        ### Returns:
+        * `int`: control ID
+        """
+        self._checkVersion()
+        if not len(self._ids):
+            self._ids = {
+                c: i for i, c in enumerate(self._matcher.getControls())
+            }
+        return self._ids[control]
+
+    def getControlById(self, id: int) -> ControlSurface:
+        """
+        Returns the control with the given ID
+
+        ### Args:
+        * `id` (`int`): control ID
+
+        ### Raises:
+        * `IndexError`: no control with that ID
+
+        ### Returns:
+        * `ControlSurface`: control
+        """
+        return self._matcher.getControls()[id]
+
+    def getMatches(
+        self,
+        control_types: ControlTypes,
+    ) -> dict[str, list[ControlSurface]]:
+        """
+        Returns the controls matching the given type (or any of the given
+        types), grouped by their group, where each group is sorted by
+        coordinate.
+
+        The returned dictionary is shared, and so shouldn't be modified.
+
+        ### Args:
+        * `control_types` (`type[ControlSurface] | tuple[type, ...]`): type or
+          tuple of types to match
+
+        ### Returns:
+        * `dict[str, list[ControlSurface]]`: matching controls for each group
+        """
+        self._checkVersion()
+        try:
+            return self._index[control_types]
+        except KeyError:
+            pass
+        groups: dict[str, list[ControlSurface]] = {}
+        for c in self._matcher.getControls():
+            if isinstance(c, control_types):
+                if c.group in groups:
+                    groups[c.group].append(c)
+                else:
+                    groups[c.group] = [c]
+
+        # Sort the matches based on coordinate
+        def sort_key(c): return c.coordinate
+        for g in groups.values():
+            g.sort(key=sort_key)
+
+        self._index[control_types] = groups
+        return groups
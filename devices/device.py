@@ -12,10 +12,16 @@ Authors:
 from typing import Optional, final
 from common.eventpattern import IEventPattern
 from common.types import EventData
-from controlsurfaces import ControlShadow
+from controlsurfaces import (
+    ControlShadow,
+    ControlSurface,
+    TickRegistry,
+    Compositor,
+)
 
 from controlsurfaces import ControlEvent
 from devices import IControlMatcher
+from .controlindex import ControlIndex
 from abc import abstractmethod
 
 
@@ -37,8 +43,25 @@ class Device:
 
         ### Args:
         * `control_matcher` (`IControlMatcher`): Control matching strategy.
+          All controls should be added to the matcher before this is called,
+          so that they can be registered to receive ticks.
         """
         self._matcher = control_matcher
+        # Only controls that need ticking are ticked
+        self._registerControls()
+        # Index of controls by type and group, shared between device shadows
+        self._control_index = ControlIndex(control_matcher)
+        # Compositor used to merge the layers applied by plugins each tick
+        self._compositor = Compositor()
+
+    def _registerControls(self) -> None:
+        """
+        Build the tick registry from the controls in the matcher
+        """
+        self._tick_version = self._matcher.getVersion()
+        self._tick_registry = TickRegistry()
+        for c in self._matcher.getControls():
+            self._tick_registry.register(c)
 
     @classmethod
     @abstractmethod
@@ -160,8 +183,14 @@ class Device:
 
         This method forwards ticks onto other parts of the controller as well
         as to its own tick() method which is overridden by child classes
+
+        Only controls that override their tick() method or that have pending
+        updates are ticked.
         """
-        for c in self._matcher.getControls():
+        # Register any controls that were added since the registry was built
+        if self._matcher.getVersion() != self._tick_version:
+            self._registerControls()
+        for c in self._tick_registry.getActive():
             # with ProfilerContext("Tick control"):
             c.doTick()
 
@@ -185,6 +214,24 @@ class Device:
         """
         return self._matcher.matchEvent(event)
 
+    @final
+    def getControls(self, group: str = None) -> list[ControlSurface]:
+        """
+        Returns a list of all the controls available on the device.
+
+        The returned list may be cached by the device's control matcher, so
+        it shouldn't be modified.
+
+        This shouldn't be overridden by child classes.
+
+        ### Args:
+        * `group` (`str`, optional): Group to filter by. Defaults to `None`.
+
+        ### Returns:
+        * `list[ControlSurface]`: Controls
+        """
+        return self._matcher.getControls(group)
+
     @final
     def getControlShadows(self, group: str = None) -> list[ControlShadow]:
         """
@@ -196,7 +243,49 @@ class Device:
         ### Returns:
         * `list[ControlSurface]`: Control shadows
         """
-        return [ControlShadow(c) for c in self._matcher.getControls(group)]
+        return [ControlShadow(c) for c in self.getControls(group)]
+
+    @final
+    def getControlVersion(self) -> int:
+        """
+        Returns the version number of the device's set of controls, which
+        changes whenever controls are added to the device's control matcher.
+
+        This can be used to invalidate caches that depend on the device's
+        controls.
+
+        This shouldn't be overridden by child classes.
+
+        ### Returns:
+        * `int`: version number
+        """
+        return self._matcher.getVersion()
+
+    @final
+    def getControlIndex(self) -> ControlIndex:
+        """
+        Returns the index of the device's controls by type and group, which
+        is shared by all shadows of this device.
+
+        This shouldn't be overridden by child classes.
+
+        ### Returns:
+        * `ControlIndex`: control index
+        """
+        return self._control_index
+
+    @final
+    def getCompositor(self) -> Compositor:
+        """
+        Returns the compositor used to merge the layers applied by plugins
+        into a single frame each tick.
+
+        This shouldn't be overridden by child classes.
+
+        ### Returns:
+        * `Compositor`: compositor
+        """
+        return self._compositor
 
     @final
     def getGroups(self) -> set[str]:
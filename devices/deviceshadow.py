@@ -14,9 +14,12 @@ from common.util.apifixes import UnsafeIndex
 from common.util.dicttools import lowestValueGrEqTarget, greatestKey
 from controlsurfaces import ControlSurface
 from . import Device
+from .controlindex import ControlTypes
+from .bindingplan import BindingPlan
 
 from controlsurfaces import (
     ControlShadow,
+    Compositor,
     IControlHash,
     ControlEvent,
     ControlShadowEvent
@@ -48,6 +51,9 @@ StandardEventCallback = Union[
 
 EventCallback = StandardEventCallback
 
+# A control's shadow, along with its callback function and extra arguments
+Binding = tuple[ControlShadow, EventCallback, tuple]
+
 
 class DeviceShadow:
     """
@@ -56,20 +62,32 @@ class DeviceShadow:
     affecting the actual device unless the script chooses to apply this shadow.
     """
 
-    def __init__(self, device: Device) -> None:
+    def __init__(self, device: Device, plan: BindingPlan = None) -> None:
         """
         Create a device shadow
 
         ### Args:
         * `device` (`Device`): device to shadow
+        * `plan` (`BindingPlan`, optional): binding plan to record searches
+          for controls into, or to replay searches from if it has already
+          been recorded. Defaults to `None` (no plan).
         """
         self._device = device
-        self._all_controls = device.getControlShadows()
-        self._free_controls = self._all_controls.copy()
+        self._plan = plan
+        self._plan_step = 0
+        # Map controls to their shadows. Shadows are created lazily when a
+        # control is bound or its state is accessed. Controls without a
+        # shadow are treated as being in the default state.
+        self._shadows: dict[ControlSurface, ControlShadow] = {}
+        # Set of bound controls. All other controls of the device are free.
+        self._bound_controls: set[ControlSurface] = set()
         self._assigned_controls: dict[
             IControlHash,
-            tuple[ControlShadow, EventCallback, tuple]
+            Binding,
         ] = {}
+        # Incremented whenever a control is bound, so that anything caching
+        # the bindings knows to update
+        self._binding_version = 0
         self._minimal = False
         self._transparent = False
 
@@ -102,12 +120,9 @@ class DeviceShadow:
             in self._assigned_controls.items()
         ])
 
-        # unassigned = "Unassigned controls:\n" + "\n".join([
-        #     f" * {control.getControl()}"
-        #     for control in self._free_controls
-        # ])
-
-        unassigned = f"{len(self._free_controls)} free controls"
+        num_free = \
+            len(self._device.getControls()) - len(self._bound_controls)
+        unassigned = f"{num_free} free controls"
 
         return f"{header}\n\n{assigned}\n\n{unassigned}"
 
@@ -146,37 +161,63 @@ class DeviceShadow:
         """
         self._transparent = value
 
+    def _getShadow(self, control: ControlSurface) -> ControlShadow:
+        """
+        Returns the shadow of a control, creating it if it doesn't exist yet
+
+        ### Args:
+        * `control` (`ControlSurface`): control to get the shadow of
+
+        ### Returns:
+        * `ControlShadow`: shadow of the control
+        """
+        try:
+            return self._shadows[control]
+        except KeyError:
+            shadow = ControlShadow(control)
+            self._shadows[control] = shadow
+            return shadow
+
     def _getMatches(
         self,
-        expr: Callable[[ControlSurface], bool],
-        target_num: int = None
-    ) -> list[ControlShadow]:
+        control_types: ControlTypes,
+        target_num: int = None,
+        limit: int = None,
+    ) -> list[ControlSurface]:
         """
-        Returns a list of control matches for a give condition lambda
+        Returns a list of free control matches for the given control types
 
-        This function is called by getControlMatches and getSubsControlMatches
-        to remove repeated code. Calling this function from outside this class
-        is not recommended.
+        This function is called by getControlMatches to remove repeated code.
+        Calling this function from outside this class is not recommended.
+
+        Matches are found using the device's control index, and the number of
+        free controls in each group is found by discounting the controls that
+        are already bound, so that the cost scales with the number of bound
+        controls rather than the size of the device.
 
         ### Args:
-        * `expr` (`Callable[[ControlSurface], bool]`): Expression to check
-          types
+        * `control_types` (`type | tuple[type, ...]`): Types to match
         * `target_num` (`int`, optional): Target number to get, so that we
-          don't use more space than necessary. Defaults to `...`.
+          don't use more space than necessary. Defaults to `None`.
+        * `limit` (`int`, optional): Maximum number of matches to return.
+          Defaults to `None` (no limit).
 
         ### Returns:
-        * `list[ControlShadow]`: List of available controls
-        """
-        num_group_matches = dict.fromkeys(self._device.getGroups(), 0)
-        group_matches: dict[str, list] = {g: []
-                                          for g in self._device.getGroups()}
-        for c in self._free_controls:
-            if expr(c.getControl()):
-                num_group_matches[c.group] += 1
-                if c.group in group_matches:
-                    group_matches[c.group].append(c)
-                else:
-                    group_matches[c.group] = [c]
+        * `list[ControlSurface]`: List of available controls, sorted by
+          coordinate
+        """
+        group_matches = \
+            self._device.getControlIndex().getMatches(control_types)
+        if not len(group_matches):
+            return []
+
+        # Count free controls by discounting bound controls from each group
+        num_group_matches = {g: len(c) for g, c in group_matches.items()}
+        for shadow, _, _ in self._assigned_controls.values():
+            c = shadow.getControl()
+            if c.group in num_group_matches \
+                    and isinstance(c, control_types):
+                num_group_matches[c.group] -= 1
 
         if target_num is None:
             highest = greatestKey(num_group_matches)
@@ -188,7 +229,14 @@ class DeviceShadow:
                 # If that fails, just use the highest value available
                 highest = greatestKey(num_group_matches)
 
-        return group_matches[highest]
+        ret: list[ControlSurface] = []
+        bound = self._bound_controls
+        for c in group_matches[highest]:
+            if c not in bound:
+                ret.append(c)
+                if limit is not None and len(ret) >= limit:
+                    break
+        return ret
 
     def getControlMatches(
         self,
@@ -237,39 +285,103 @@ class DeviceShadow:
         ### Returns:
         * `list[ControlShadow]`: List of matches
         """
+        return [self._getShadow(c) for c in self._getControlMatches(
+            control,
+            allow_substitution,
+            target_num,
+            trim,
+            exact,
+            raise_on_zero,
+        )]
+
+    def _getControlMatches(
+        self,
+        control: type[ControlSurface],
+        allow_substitution: bool = False,
+        target_num: int = None,
+        trim: bool = True,
+        exact: bool = True,
+        raise_on_zero: bool = False
+    ) -> list[ControlSurface]:
+        """
+        Returns a list of matching controls, without creating shadows for
+        them.
 
-        # Determine what lambda to use depending on if we are allowing control
-        # substitution
-        def no_subs(x): return isinstance(x, control)
+        Refer to the documentation for getControlMatches() for details on the
+        arguments.
+        """
+        plan = self._plan
+        if plan is None or not plan.isValid():
+            return self._searchControlMatches(
+                control,
+                allow_substitution,
+                target_num,
+                trim,
+                exact,
+                raise_on_zero,
+            )
+        key = (
+            control,
+            allow_substitution,
+            target_num,
+            trim,
+            exact,
+            raise_on_zero,
+        )
+        step = self._plan_step
+        self._plan_step += 1
+        # Replay recorded plans
+        if plan.isRecorded():
+            ret = plan.replay(step, key, self._device)
+            if ret is not None:
+                if not any(c in self._bound_controls for c in ret):
+                    return ret
+                plan.invalidate()
+            return self._searchControlMatches(*key)
+        # Otherwise, record the results of the search
+        try:
+            ret = self._searchControlMatches(*key)
+        except ValueError as e:
+            plan.record(key, e, self._device)
+            raise
+        plan.record(key, ret, self._device)
+        return ret
 
-        def subs(x): return isinstance(
-            x, control.getControlAssignmentPriorities()
-        ) or isinstance(x, control)
+    def _searchControlMatches(
+        self,
+        control: type[ControlSurface],
+        allow_substitution: bool,
+        target_num: Optional[int],
+        trim: bool,
+        exact: bool,
+        raise_on_zero: bool,
+    ) -> list[ControlSurface]:
+        """
+        Search the device for matching controls.
+
+        Refer to the documentation for getControlMatches() for details on the
+        arguments.
+        """
+        # Only collect as many matches as we'll return, unless we need to
+        # check for too many matches
+        if target_num is not None and exact and trim:
+            limit: Optional[int] = target_num
+        else:
+            limit = None
+
+        ret = self._getMatches(control, target_num, limit)
 
         if allow_substitution:
-            ret = self._getMatches(
-                no_subs,
-                target_num
-            )
             t = target_num if target_num is not None else 1
             # If we didn't get enough matches, then we should try substitution
             # TODO: Improve this
             if len(ret) < t:
                 ret = self._getMatches(
-                    subs,
-                    target_num
+                    (control,) + control.getControlAssignmentPriorities(),
+                    target_num,
+                    limit
                 )
 
-        else:
-            ret = self._getMatches(
-                no_subs,
-                target_num
-            )
-
-        # Sort the matches based on coordinate
-        def sort_key(c): return c.coordinate
-        ret.sort(key=sort_key)
-
         # Make sure we have results
         if raise_on_zero and len(ret) == 0:
             raise ValueError("No matching controls found")
@@ -313,12 +425,27 @@ class DeviceShadow:
         ### Returns:
         * `int`: number of types that match
         """
-        return len(self.getControlMatches(
+        return len(self._getControlMatches(
             control,
             allow_substitution,
             raise_on_zero=False
         ))
 
+    def _isFree(self, control: ControlShadow) -> bool:
+        """
+        Returns whether a control shadow belongs to this device shadow and is
+        free to bind to
+
+        ### Args:
+        * `control` (`ControlShadow`): control to check
+
+        ### Returns:
+        * `bool`: whether it is free
+        """
+        c = control.getControl()
+        return self._shadows.get(c) is control \
+            and c not in self._bound_controls
+
     def bindControl(
         self,
         control: ControlShadow,
@@ -340,7 +467,7 @@ class DeviceShadow:
         * `ValueError`: Control isn't free to bind to. This indicates a logic
           error in the code assigning controls
         """
-        if control not in self._free_controls:
+        if not self._isFree(control):
             raise ValueError("Control must be free to bind to")
 
         if args is None:
@@ -349,11 +476,12 @@ class DeviceShadow:
             args_ = args
 
         # Remove from free controls
-        self._free_controls.remove(control)
+        self._bound_controls.add(control.getControl())
 
         # Bind to callable
         self._assigned_controls[control.getMapping()] = (
             control, bind_to, args_)
+        self._binding_version += 1
 
     def bindControls(
         self,
@@ -421,7 +549,7 @@ class DeviceShadow:
                 args_iter = args_iterable
 
         # Ensure all controls are assignable
-        if not all(c in self._free_controls for c in controls):
+        if not all(self._isFree(c) for c in controls):
             raise ValueError("All controls must be free to bind to")
 
         # Bind each control, using the index of it as the argument
@@ -591,11 +719,31 @@ class DeviceShadow:
         """
         # Get control's mapping if it's assigned
         try:
-            control_shadow, fn, args = self._assigned_controls[control]
+            binding = self._assigned_controls[control]
         except KeyError:
             # If we get a KeyError, the control isn't assigned and we should do
             # nothing
             return False
+        return self.callBinding(binding, control, index)
+
+    @staticmethod
+    def callBinding(
+        binding: 'Binding',
+        control: ControlEvent,
+        index: UnsafeIndex,
+    ) -> bool:
+        """
+        Call the callback function of a binding to process an event
+
+        ### Args:
+        * `binding` (`Binding`): binding, as returned by `getBindings()`
+        * `control` (`ControlEvent`): control associated with the event
+        * `index` (`UnsafeIndex`): index of the selected plugin or window
+
+        ### Returns:
+        * `bool`: whether the event has been handled
+        """
+        control_shadow, fn, args = binding
         # Set the value of the control as required
         control_shadow.value = control.value
         # Generate a control shadow mapping to send to the device
@@ -603,14 +751,53 @@ class DeviceShadow:
         # Call the bound function with any extra required args
         return fn(mapping, index, *args)
 
-    def apply(self, thorough: bool) -> None:
+    def getBindings(self) -> 'dict[IControlHash, Binding]':
+        """
+        Returns the bindings of this shadow, mapping controls to their
+        shadow, callback function and arguments.
+
+        The returned dictionary is shared, and so shouldn't be modified.
+
+        ### Returns:
+        * `dict[IControlHash, Binding]`: bindings
+        """
+        return self._assigned_controls
+
+    def getBindingVersion(self) -> int:
+        """
+        Returns a number which changes whenever a control is bound
+
+        ### Returns:
+        * `int`: binding version
+        """
+        return self._binding_version
+
+    def apply(
+        self,
+        thorough: bool,
+        compositor: Optional[Compositor] = None,
+    ) -> None:
         """
         Apply the configuration of the device shadow to the control it
         represents
+
+        Controls that don't have a shadow are applied in their default state.
+
+        ### Args:
+        * `thorough` (`bool`): whether to apply all values, regardless of
+          whether they changed
+        * `compositor` (`Compositor`, optional): compositor to apply to, so
+          that this shadow is applied as a layer of the current frame.
+          Defaults to None, meaning it is applied to the device directly.
         """
         if self._minimal or not thorough:
-            controls = (c for c, _, _ in self._assigned_controls.values())
+            for c, _, _ in self._assigned_controls.values():
+                c.apply(thorough, self._transparent, compositor)
         else:
-            controls = (c for c in self._all_controls)
-        for c in controls:
-            c.apply(thorough, self._transparent)
+            for control in self._device.getControls():
+                shadow = self._shadows.get(control)
+                if shadow is not None:
+                    shadow.apply(thorough, self._transparent, compositor)
+                else:
+                    ControlShadow.applyDefault(
+                        control, self._transparent, compositor)
@@ -0,0 +1,40 @@
+"""
+devices > manifest
+
+Lists the devices that can be recognised, along with the modules that define
+them, so that only the module of the device that is recognised needs to be
+imported.
+
+Each entry contains:
+* `id`: the name of the device class, as used by name associations
+* `module`: the module that defines the device
+* `enquiry`: the universal device enquiry response prefix, where each byte is
+  an `int`, a `tuple` of allowed values, or `None` for any value. If this is
+  `None`, the module must be imported to check for a match.
+* `enquiry_match`: whether the device can be recognised using a universal
+  device enquiry
+
+This file is generated by `common/util/genmanifest.py`, and shouldn't be
+edited manually.
+"""
+
+DEVICES = [
+    {
+        'id': 'LaunchkeyMk2_49_61',
+        'module': 'devices.novation.launchkey.mk2.launchkey',
+        'enquiry': [240, 126, None, 6, 2, 0, 32, 41, (124, 125)],
+        'enquiry_match': True,
+    },
+    {
+        'id': 'LaunchkeyMk2_25',
+        'module': 'devices.novation.launchkey.mk2.launchkey',
+        'enquiry': [240, 126, 0, 6, 2, 0, 32, 41, 123],
+        'enquiry_match': True,
+    },
+    {
+        'id': 'Hammer88Pro',
+        'module': 'devices.maudio.hammer88pro.hammer88pro',
+        'enquiry': [240, 126, None, 6, 2, 0, 1, 5, 0, 60],
+        'enquiry_match': True,
+    },
+]
@@ -23,6 +23,9 @@ class BasicControlMatcher(IControlMatcher):
     controllers with many controls, it may have poor performance compared to
     hard-coded custom matchers, which can be created by extending
     the IControlMatcher class.
+
+    The flattened list of controls and the groups they belong to are cached,
+    and only rebuilt when controls or sub-matchers are added.
     """
 
     def __init__(self) -> None:
@@ -30,6 +33,13 @@ class BasicControlMatcher(IControlMatcher):
         self._controls: dict[int, list[ControlSurface]] = {}
         self._groups: set[str] = set()
         self._sub_matchers: dict[int, list[IControlMatcher]] = {}
+        # Incremented whenever controls or sub-matchers are added
+        self._version = 0
+        # Cached registry of controls, rebuilt when the version changes
+        self._cache_version = -1
+        self._all_controls: list[ControlSurface] = []
+        self._group_controls: dict[str, list[ControlSurface]] = {}
+        self._all_groups: set[str] = set()
 
     def addControls(
         self,
@@ -62,6 +72,7 @@ class BasicControlMatcher(IControlMatcher):
             self._priorities.add(priority)
             self._controls[priority] = [control]
         self._groups.add(control.group)
+        self._version += 1
 
     def addSubMatcher(
         self,
@@ -85,6 +96,7 @@ class BasicControlMatcher(IControlMatcher):
         else:
             self._priorities.add(priority)
             self._sub_matchers[priority] = [matcher]
+        self._version += 1
 
     def matchEvent(self, event: EventData) -> Optional[ControlEvent]:
         # Work through in order of priority
@@ -99,25 +111,51 @@ class BasicControlMatcher(IControlMatcher):
                         return m
         return None
 
-    def getGroups(self) -> set[str]:
-        g = self._groups
+    def getVersion(self) -> int:
+        # Sub-matcher versions never decrease, so the sum changes whenever
+        # any of them changes
+        version = self._version
         for p in self._sub_matchers:
             for s in self._sub_matchers[p]:
-                g |= s.getGroups()
-        return g
+                version += s.getVersion()
+        return version
 
-    def getControls(self, group: str = None) -> list[ControlSurface]:
-        controls = []
+    def _refreshRegistry(self) -> None:
+        """
+        Rebuild the flattened list of controls and the indexes of controls by
+        group, if the controls have changed since they were last built.
+        """
+        version = self.getVersion()
+        if version == self._cache_version:
+            return
+        controls: list[ControlSurface] = []
         for p in self._controls:
             controls += self._controls[p]
+        groups = set(self._groups)
         for p in self._sub_matchers:
             for s in self._sub_matchers[p]:
                 controls += s.getControls()
+                groups |= s.getGroups()
+        group_controls: dict[str, list[ControlSurface]] = {}
+        for c in controls:
+            if c.group in group_controls:
+                group_controls[c.group].append(c)
+            else:
+                group_controls[c.group] = [c]
+        groups |= group_controls.keys()
+
+        self._all_controls = controls
+        self._group_controls = group_controls
+        self._all_groups = groups
+        self._cache_version = version
+
+    def getGroups(self) -> set[str]:
+        self._refreshRegistry()
+        return self._all_groups
+
+    def getControls(self, group: str = None) -> list[ControlSurface]:
+        self._refreshRegistry()
         if group is None:
-            return controls
+            return self._all_controls
         else:
-            ret = []
-            for c in controls:
-                if c.group == group:
-                    ret.append(c)
-            return ret
+            return self._group_controls.get(group, [])
@@ -55,7 +55,9 @@ class IControlMatcher:
         """
         Returns a list of controls contained by the control matcher.
 
-        The group option can be used to filter by group if required
+        The group option can be used to filter by group if required. The
+        returned list may be cached by the matcher, so it shouldn't be
+        modified.
 
         ### Args:
         * `group` (`str`, optional): Group to filter by. Defaults to `None`.
@@ -65,3 +67,19 @@ class IControlMatcher:
         """
         raise NotImplementedError("This function should be implemented by "
                                   "child classes")
+
+    def getVersion(self) -> int:
+        """
+        Returns the version number of the set of controls managed by this
+        matcher.
+
+        The version number changes whenever controls are added to the matcher
+        (or any of its components), so that caches that depend on the
+        controls of the matcher can be invalidated when required. Matchers
+        whose controls never change can leave this as the default, which
+        always returns `0`.
+
+        ### Returns:
+        * `int`: version number
+        """
+        return 0
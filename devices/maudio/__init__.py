@@ -1,6 +1,6 @@
 
 __all__ = [
-    'hammer88pro'
+    'hammer88pro',
 ]
 
-from . import hammer88pro
+# Modules are imported when they are needed, as listed in devices.manifest
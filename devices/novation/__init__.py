@@ -1,6 +1,6 @@
 
 __all__ = [
-    'launchkey'
+    'launchkey',
 ]
 
-from . import launchkey
+# Modules are imported when they are needed, as listed in devices.manifest
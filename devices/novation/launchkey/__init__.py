@@ -1,6 +1,6 @@
 
 __all__ = [
-    'mk2'
+    'mk2',
 ]
 
-from . import mk2
+# Modules are imported when they are needed, as listed in devices.manifest
@@ -7,7 +7,8 @@ Authors:
 * Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
 """
 
-from common import profilerDecoration
+from common import getContext, profilerDecoration
+from common.loadcontroller import SLOW_DRUM_PADS
 from common.eventpattern import ForwardedPattern
 from common.eventpattern.notepattern import NotePattern
 from common.types import EventData
@@ -21,6 +22,25 @@ DRUM_PADS = [
     [0x70, 0x71, 0x72, 0x73, 0x74, 0x75, 0x76, 0x77],  # Also 0x78
 ]
 
+# Number of ticks between refreshes of the lights
+REFRESH_INTERVAL = 20
+# Number of ticks between refreshes of the lights when the script is under
+# load
+SLOW_REFRESH_INTERVAL = 80
+
+
+def getRefreshInterval() -> int:
+    """
+    Returns the number of ticks between refreshes of the lights, which is
+    increased when the script is under load
+
+    ### Returns:
+    * `int`: number of ticks
+    """
+    if getContext().load.getLevel() >= SLOW_DRUM_PADS:
+        return SLOW_REFRESH_INTERVAL
+    return REFRESH_INTERVAL
+
 
 class LkDrumPad(DrumPad):
     """
@@ -45,7 +65,7 @@ class LkDrumPad(DrumPad):
 
     def tick(self) -> None:
         # Occasionally refresh lights since launchkey lights are sorta buggy
-        if self._ticker_timer % 20 == 0:
+        if self._ticker_timer % getRefreshInterval() == 0:
             self.onColorChange()
         self._ticker_timer += 1
 
@@ -65,7 +85,7 @@ class LkControlSwitchButton(ControlSwitchButton):
         forwardEvent(EventData(0x9F, self._note_num, c_num), 2)
 
     def tick(self) -> None:
-        if self._ticker_timer % 20 == 0:
+        if self._ticker_timer % getRefreshInterval() == 0:
             self.onColorChange()
         self._ticker_timer += 1
 
@@ -84,6 +104,6 @@ class LkMetronomeButton(MetronomeButton):
         forwardEvent(EventData(0x9F, self._note_num, c_num), 2)
 
     def tick(self) -> None:
-        if self._ticker_timer % 20 == 0:
+        if self._ticker_timer % getRefreshInterval() == 0:
             self.onColorChange()
         self._ticker_timer += 1
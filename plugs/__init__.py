@@ -13,6 +13,7 @@ __all__ = [
     'SpecialPlugin',
     'StandardPlugin',
     'WindowPlugin',
+    'RoutingTable',
 ]
 
 from .mappingstrategies import (
@@ -23,15 +24,9 @@ from .mappingstrategies import (
 )
 
 from .plugin import Plugin, SpecialPlugin, StandardPlugin, WindowPlugin
+from .routingtable import RoutingTable
 
-# Register plugins
-from . import (
-    special,
-    windows,
-    standard
-)
-del (
-    special,
-    windows,
-    standard
-)
+# Register special plugins, which are always needed. Standard and window
+# plugins are imported when they are first used, as listed in plugs.manifest
+from . import special
+del special
@@ -0,0 +1,59 @@
+"""
+plugs > manifest
+
+Maps plugin IDs, window IDs and special plugin names to the modules that
+define them, so that plugin modules can be imported when they are first used.
+
+This file is generated by `common/util/genmanifest.py`, and shouldn't be
+edited manually.
+"""
+
+# Standard plugins
+PLUGINS = {
+    'Abbey Road One': 'plugs.standard.spitfire.spitfiregeneric',
+    'BBC Symphony Orchestra': 'plugs.standard.spitfire.spitfiregeneric',
+    'Eric Whitacre Choir': 'plugs.standard.spitfire.spitfiregeneric',
+    'FLEX': 'plugs.standard.fl.flex',
+    'FPC': 'plugs.standard.fl.fpc',
+    'Fruity parametric EQ 2': 'plugs.standard.fl.parametriceq',
+    'Hans Zimmer Strings': 'plugs.standard.spitfire.spitfiregeneric',
+    'LABS': 'plugs.standard.spitfire.spitfiregeneric',
+    'Originals - Cimbalom': 'plugs.standard.spitfire.spitfiregeneric',
+    'Originals - Cinematic Frozen Strings':
+        'plugs.standard.spitfire.spitfiregeneric',
+    'Originals - Cinematic Pads': 'plugs.standard.spitfire.spitfiregeneric',
+    'Originals - Cinematic Percussion':
+        'plugs.standard.spitfire.spitfiregeneric',
+    'Originals - Cinematic Soft Piano':
+        'plugs.standard.spitfire.spitfiregeneric',
+    'Originals - Drumline': 'plugs.standard.spitfire.spitfiregeneric',
+    'Originals - Epic Brass & Woodwinds':
+        'plugs.standard.spitfire.spitfiregeneric',
+    'Originals - Epic Strings': 'plugs.standard.spitfire.spitfiregeneric',
+    'Originals - Felt Piano': 'plugs.standard.spitfire.spitfiregeneric',
+    'Originals - Firewood Piano': 'plugs.standard.spitfire.spitfiregeneric',
+    'Originals - Intimate Strings': 'plugs.standard.spitfire.spitfiregeneric',
+    'Originals - Jangle Box Piano': 'plugs.standard.spitfire.spitfiregeneric',
+    'Originals - Media Toolkit': 'plugs.standard.spitfire.spitfiregeneric',
+    'Originals - Mrs Mills Piano': 'plugs.standard.spitfire.spitfiregeneric',
+    'Vital': 'plugs.standard.matttytel.vital',
+}
+
+# Window plugins
+WINDOWS = {
+    0: 'plugs.windows.mixer',
+    1: 'plugs.windows.channel_rack',
+    2: 'plugs.windows.playlist',
+}
+
+# Special plugins
+SPECIAL_PLUGINS = {
+    'Transport': 'plugs.special.transport',
+    'Fallback': 'plugs.special.fallback',
+    'Macro': 'plugs.special.macro',
+}
+
+# Final special plugins
+FINAL_SPECIAL_PLUGINS = {
+    'Press': 'plugs.special.pressed',
+}
@@ -5,13 +5,13 @@ Contains the definition of the Plugin base class, and its two main types
 StandardPlugin and SpecialPlugin.
 """
 
-from common import log, verbosity
+from common import log, verbosity, getContext
 from common.util.apifixes import UnsafeIndex, WindowIndex, PluginIndex
-from controlsurfaces import ControlEvent
+from controlsurfaces import ControlEvent, Compositor
 from devices import DeviceShadow
 from plugs.mappingstrategies import IMappingStrategy
 from abc import abstractmethod
-from typing import final
+from typing import Optional, final
 
 
 class Plugin:
@@ -53,11 +53,68 @@ class Plugin:
         """
         return f"Plugin at {type(self)}:\n\n{self._shadow}"
 
-    def apply(self, thorough: bool) -> None:
+    @final
+    def getShadow(self) -> DeviceShadow:
+        """
+        Returns the device shadow that this plugin interacts with
+
+        ### Returns:
+        * `DeviceShadow`: device shadow
+        """
+        return self._shadow
+
+    def apply(
+        self,
+        thorough: bool,
+        compositor: Optional[Compositor] = None,
+    ) -> None:
         """
         Apply the current state of this plugin to the device
+
+        ### Args:
+        * `thorough` (`bool`): whether to apply all values, regardless of
+          whether they changed
+        * `compositor` (`Compositor`, optional): compositor to apply the
+          plugin's layer to. Defaults to None.
+        """
+        self._shadow.apply(thorough, compositor)
+
+    @classmethod
+    def getPollRate(cls) -> float:
+        """
+        Returns the maximum rate at which this plugin should be ticked to read
+        the state of FL Studio.
+
+        This can be overridden by plugins whose ticks are expensive, and don't
+        need to be up-to-date every tick. By default, the `tick.poll_rate`
+        setting is used.
+
+        ### Returns:
+        * `float`: rate in Hz, or 0 to tick every tick
+        """
+        return getContext().settings.get("tick.poll_rate")
+
+    @classmethod
+    def getApplyRate(cls) -> float:
+        """
+        Returns the maximum rate at which this plugin should be applied to
+        update the device.
+
+        This can be overridden by plugins whose output doesn't need to be
+        updated every tick. By default, the `tick.apply_rate` setting is used.
+
+        ### Returns:
+        * `float`: rate in Hz, or 0 to apply every tick
+        """
+        return getContext().settings.get("tick.apply_rate")
+
+    def teardown(self) -> None:
+        """
+        Called when this plugin instance is discarded, either because it was
+        evicted from the plugin cache or because plugins were reset.
+
+        This can be overridden by plugins that need to release resources.
         """
-        self._shadow.apply(thorough)
 
     @classmethod
     @abstractmethod
@@ -0,0 +1,104 @@
+"""
+plugs > routingtable
+
+Contains the RoutingTable class, which maps each control to the callbacks
+that are bound to it across all active plugins, so that events can be routed
+to the plugins that handle them without trying every plugin in turn.
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+"""
+
+from typing import Optional
+from common import log, verbosity
+from common.util.apifixes import UnsafeIndex
+from controlsurfaces import ControlEvent, ControlSurface
+from devices import DeviceShadow
+from devices.deviceshadow import Binding
+from .plugin import Plugin
+
+# A plugin, along with one of its bindings
+Route = tuple[Plugin, Binding]
+
+
+class RoutingTable:
+    """
+    Maps each control to an ordered list of the plugins that have bound it,
+    along with their callback and arguments.
+
+    The table is rebuilt when the layers of plugins change, or when any of
+    them bind new controls.
+    """
+
+    def __init__(self) -> None:
+        self._routes: dict[ControlSurface, list[Route]] = {}
+        # The plugins and binding versions the table was built from
+        self._signature: Optional[tuple[tuple[int, int], ...]] = None
+
+    def __repr__(self) -> str:
+        return f"RoutingTable ({len(self._routes)} controls routed)"
+
+    def isBuilt(self) -> bool:
+        """
+        Returns whether the table has been built
+
+        ### Returns:
+        * `bool`: whether the table has been built
+        """
+        return self._signature is not None
+
+    def invalidate(self) -> None:
+        """
+        Clear the table, so that it is rebuilt on the next update
+        """
+        self._routes = {}
+        self._signature = None
+
+    def update(self, layers: list[Plugin]) -> None:
+        """
+        Update the table for the given plugins, rebuilding it if the plugins
+        or their bindings have changed
+
+        ### Args:
+        * `layers` (`list[Plugin]`): plugins in the order in which they should
+          process events
+        """
+        signature = tuple(
+            (id(p), p.getShadow().getBindingVersion()) for p in layers
+        )
+        if signature == self._signature:
+            return
+        routes: dict[ControlSurface, list[Route]] = {}
+        for p in layers:
+            for control, binding in p.getShadow().getBindings().items():
+                c = control.getControl()
+                if c in routes:
+                    routes[c].append((p, binding))
+                else:
+                    routes[c] = [(p, binding)]
+        self._routes = routes
+        self._signature = signature
+
+    def processEvent(self, control: ControlEvent, index: UnsafeIndex) -> bool:
+        """
+        Process an event by calling the callbacks bound to its control, in
+        order, until one of them handles it
+
+        ### Args:
+        * `control` (`ControlEvent`): control associated with the event
+        * `index` (`UnsafeIndex`): index of the selected plugin or window
+
+        ### Returns:
+        * `bool`: whether the event was handled
+        """
+        try:
+            routes = self._routes[control.getControl()]
+        except KeyError:
+            # No plugins have bound this control
+            return False
+        for plug, binding in routes:
+            log("plugins",
+                f"Processing event at {type(plug)}", verbosity=verbosity.EVENT)
+            if DeviceShadow.callBinding(binding, control, index):
+                return True
+        return False
@@ -9,6 +9,8 @@ Authors:
 
 from typing import Any
 from time import time
+from common import getContext
+from common.loadcontroller import NO_FADES
 from common.types import Color
 from common.extensionmanager import ExtensionManager
 from common.util.apifixes import UnsafeIndex
@@ -115,6 +117,13 @@ class Press(SpecialPlugin):
                 c.color = OFF
 
     def tickOthers(self):
+        # Fading controls changes their colour every tick, so when under load,
+        # just turn them off once the fade time has passed
+        if getContext().load.getLevel() >= NO_FADES:
+            for c in self._others:
+                control = c.getControl()
+                c.color = ON if fadeOverTime(control) else OFF
+            return
         for c in self._others:
             control = c.getControl()
             c.color = Color.fade(OFF, ON, fadeOverTime(control))
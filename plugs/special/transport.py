@@ -13,6 +13,7 @@ import ui
 from typing import Any
 
 from common.extensionmanager import ExtensionManager
+from common.refresh import TRANSPORT, RefreshWatcher
 from common.types import Color
 from common.util.apifixes import UnsafeIndex
 from controlsurfaces import (
@@ -101,6 +102,9 @@ class Transport(SpecialPlugin):
         self._hint = shadow.bindMatch(
             HintMsg, self.nullEvent, raise_on_failure=False
         )
+        # The loop mode and recording state only need updating when FL Studio
+        # indicates that the transport has changed
+        self._refresh = RefreshWatcher(TRANSPORT)
         super().__init__(shadow, [])
 
     @classmethod
@@ -197,10 +201,15 @@ class Transport(SpecialPlugin):
             return False
         return True
 
+    def teardown(self) -> None:
+        self._refresh.stop()
+
     def tick(self):
-        self.tickLoopMode()
+        if self._refresh.consume():
+            self.tickLoopMode()
+            self.tickRec()
+        # The beat and hint message change without a refresh
         self.tickPlayback()
-        self.tickRec()
         self.tickMetro()
         self.tickHint()
 
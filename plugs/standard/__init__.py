@@ -5,6 +5,4 @@ __all__ = [
     'matttytel',
 ]
 
-from . import fl
-from . import spitfire
-from . import matttytel
+# Modules are imported when they are first used, as listed in plugs.manifest
@@ -5,4 +5,4 @@ __all__ = [
     'parametriceq',
 ]
 
-from . import fpc, flex, parametriceq
+# Modules are imported when they are first used, as listed in plugs.manifest
@@ -1,9 +1,18 @@
 
 import plugins
 import channels
-from typing import Any
+from typing import Any, Optional
+from common import getContext
+from common.backgroundtasks import (
+    BackgroundTask,
+    Task,
+    TaskRunner,
+    runToCompletion,
+)
 from common.types import Color
 from common.extensionmanager import ExtensionManager
+from common.focuschanges import FocusChange
+from common.refresh import CHANNELS, RefreshWatcher
 from common.util.apifixes import GeneratorIndex
 from controlsurfaces import DrumPad, Note
 from controlsurfaces import ControlShadowEvent
@@ -11,6 +20,9 @@ from devices import DeviceShadow
 from plugs import StandardPlugin
 from plugs import eventfilters, tickfilters
 
+# Colours of the drum pads, and the colour and name of each note
+PadInfo = tuple[list[Color], dict[int, tuple[Color, str]]]
+
 
 class FPC(StandardPlugin):
     """
@@ -35,6 +47,21 @@ class FPC(StandardPlugin):
 
         self._notes = shadow.bindMatches(Note, self.noteEvent)
 
+        # Pad info only needs to be read when the channels change, or when
+        # a different FPC instance is focused
+        self._refresh = RefreshWatcher(CHANNELS)
+        self._last_index: Optional[GeneratorIndex] = None
+        self._scan: Optional[BackgroundTask[PadInfo]] = None
+        # Task runner that the scan was submitted to
+        self._scan_runner: Optional[TaskRunner] = None
+        # Whether the channels changed while a scan was running, meaning that
+        # the pads need to be read again once the scan finishes
+        self._rescan = False
+        # The scan reads from the focused FPC, so stop it when the focus
+        # changes
+        self._focus = getContext().active.changes
+        self._focus.subscribe(self._onFocusChange)
+
         super().__init__(shadow, [])
 
     @classmethod
@@ -45,16 +72,81 @@ class FPC(StandardPlugin):
     def getPlugIds() -> tuple[str, ...]:
         return ("FPC",)
 
-    @tickfilters.toGeneratorIndex
-    def tick(self, index: GeneratorIndex):
-        for p in self._pads:
-            p.color = Color.fromInteger(
-                plugins.getPadInfo(
-                    index[0], -1, 2, self._coordToIndex(*p.coordinate))
-            )
+    @classmethod
+    def getPollRate(cls) -> float:
+        # Reading the pad info is expensive, and rarely changes
+        return 5.0
+
+    def teardown(self) -> None:
+        self._refresh.stop()
+        self._focus.unsubscribe(self._onFocusChange)
+        self._cancelScan()
+
+    def _cancelScan(self) -> None:
+        """
+        Stop reading the pads in the background
+        """
+        if self._scan is not None:
+            self._scan.cancel()
+            self._scan = None
+        self._rescan = False
+
+    def _isScanning(self) -> bool:
+        """
+        Returns whether a scan is running.
+
+        If the context was reset since the scan started, its task runner is
+        never ticked again, so the scan is cancelled.
+
+        ### Returns:
+        * `bool`: whether a scan is running
+        """
+        if self._scan is None or self._scan.isDone():
+            return False
+        if self._scan_runner is not getContext().tasks:
+            self._cancelScan()
+            return False
+        return True
+
+    def _updateFocusSubscription(self) -> None:
+        """
+        Subscribe to the focus changes of the current context, in case the
+        context was reset
+        """
+        focus = getContext().active.changes
+        if focus is not self._focus:
+            self._focus.unsubscribe(self._onFocusChange)
+            self._focus = focus
+            focus.subscribe(self._onFocusChange)
+
+    def _onFocusChange(self, event: FocusChange) -> None:
+        if self._isScanning():
+            self._cancelScan()
+            # The index may no longer be valid, so read the pads straight
+            # away when an FPC is next focused
+            self._last_index = None
+
+    def readPads(self, index: GeneratorIndex) -> Task[PadInfo]:
+        """
+        Background task to read the colours of the drum pads, and the colours
+        and names of the notes
+
+        ### Args:
+        * `index` (`GeneratorIndex`): index of FPC plugin
+
+        ### Returns:
+        * `Task[PadInfo]`: task returning the pad colours, and the colour and
+          name of each note
+        """
+        pads = [
+            Color.fromInteger(plugins.getPadInfo(
+                index[0], -1, 2, self._coordToIndex(*p.coordinate)))
+            for p in self._pads
+        ]
+        yield
         # Also update notes
         # Hardcoded due to bug with plugins.getPadInfo() returning wrong values
-        notes = set()
+        notes: dict[int, tuple[Color, str]] = {}
         for idx in range(32):
             # Get the note number
             note = plugins.getPadInfo(*index, -1, 1, idx)
@@ -62,18 +154,65 @@ class FPC(StandardPlugin):
             color = plugins.getPadInfo(*index, -1, 2, idx)
             # get the annotation
             annotation = plugins.getName(*index, -1, 2, note)
+            notes[note] = (Color.fromInteger(color), annotation)
+            if idx % 8 == 7:
+                yield
+        return pads, notes
 
-            # Set values
-            self._notes[note].color = Color.fromInteger(color)
-            self._notes[note].annotation = annotation
-            notes.add(note)
+    def applyPads(self, info: PadInfo) -> None:
+        """
+        Set the colours and annotations of the pads and notes
 
-        # Set colors and annotations for the others
+        ### Args:
+        * `info` (`PadInfo`): result of `readPads()`
+        """
+        pads, notes = info
+        for p, color in zip(self._pads, pads):
+            p.color = color
         for i in range(128):
-            if i not in notes:
+            if i in notes:
+                self._notes[i].color, self._notes[i].annotation = notes[i]
+            else:
+                # Set colors and annotations for the others
                 self._notes[i].color = Color()
                 self._notes[i].annotation = ""
 
+    @tickfilters.toGeneratorIndex
+    def tick(self, index: GeneratorIndex):
+        self._updateFocusSubscription()
+        focused = index != self._last_index
+        if not self._refresh.consume() and not focused:
+            return
+        self._last_index = index
+        if focused:
+            # Show the pads of a newly focused FPC straight away
+            self._cancelScan()
+            self.applyPads(runToCompletion(self.readPads(index)))
+        elif self._isScanning():
+            # Let the scan finish, so that it can't be restarted forever, then
+            # read the pads again
+            self._rescan = True
+        else:
+            self._startScan(index)
+
+    def _startScan(self, index: GeneratorIndex) -> None:
+        """
+        Start reading the pads in the background
+
+        ### Args:
+        * `index` (`GeneratorIndex`): index of FPC plugin
+        """
+        self._rescan = False
+        # Reading all the pads is slow, so spread it over a few ticks
+        self._scan_runner = getContext().tasks
+        self._scan = self._scan_runner.submit(
+            "FPC pads", self.readPads(index), self._onScanned)
+
+    def _onScanned(self, info: PadInfo) -> None:
+        self.applyPads(info)
+        if self._rescan and self._last_index is not None:
+            self._startScan(self._last_index)
+
     @staticmethod
     def triggerPad(
         pad_idx: int,
@@ -1,6 +1,6 @@
 
 __all__ = [
-    'vital'
+    'vital',
 ]
 
-from . import vital
+# Modules are imported when they are first used, as listed in plugs.manifest
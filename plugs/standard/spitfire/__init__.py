@@ -1,6 +1,6 @@
 
 __all__ = [
-    'spitfiregeneric'
+    'spitfiregeneric',
 ]
 
-from . import spitfiregeneric
+# Modules are imported when they are first used, as listed in plugs.manifest
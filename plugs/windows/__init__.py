@@ -1,10 +1,8 @@
 
 __all__ = [
-    'Playlist',
-    'Mixer',
-    'ChannelRack'
+    'playlist',
+    'mixer',
+    'channel_rack',
 ]
 
-from .playlist import Playlist
-from .mixer import Mixer
-from .channel_rack import ChannelRack
+# Modules are imported when they are first used, as listed in plugs.manifest
@@ -3,6 +3,7 @@ from typing import Any
 import channels
 from common import getContext
 from common.extensionmanager import ExtensionManager
+from common.refresh import CHANNELS, RefreshWatcher
 from common.util.apifixes import UnsafeIndex
 from controlsurfaces import ControlShadowEvent, ControlShadow
 from controlsurfaces import (
@@ -22,6 +23,8 @@ class ChannelRack(WindowPlugin):
     def __init__(self, shadow: DeviceShadow) -> None:
         self._drums = \
             shadow.bindMatches(DrumPad, self.drumPads, raise_on_failure=False)
+        # Channel colours and names only need updating when channels change
+        self._refresh = RefreshWatcher(CHANNELS)
         super().__init__(shadow, [])
 
     @staticmethod
@@ -47,7 +50,11 @@ class ChannelRack(WindowPlugin):
         return index
 
     def tick(self):
-        self.tickOmniPreview()
+        if self._refresh.consume():
+            self.tickOmniPreview()
+
+    def teardown(self) -> None:
+        self._refresh.stop()
 
     def drumPads(
         self,
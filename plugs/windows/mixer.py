@@ -1,12 +1,16 @@
 
-from typing import Any
+from typing import Any, Optional
 import ui
 import mixer
 from common import getContext
 from common.extensionmanager import ExtensionManager
+from common.settings import Settings
+from common.refresh import MIXER, RefreshWatcher
+from common.backgroundtasks import BackgroundTask, TaskRunner
 from common.util.apifixes import (
     UnsafeIndex,
     getSelectedMixerTracks,
+    scanSelectedMixerTracks,
 )
 from common.util.snap import snap
 from controlsurfaces import consts
@@ -30,6 +34,8 @@ from plugs import WindowPlugin
 
 INDEX = 0
 
+ALLOW_EXTENDED_VOLUME = Settings.handle("plugins.mixer.allow_extended_volume")
+
 
 def snapFaders(value: float) -> float:
     """
@@ -42,7 +48,7 @@ def snapFaders(value: float) -> float:
     ### Returns:
     * `float`: snapped value
     """
-    if getContext().settings.get("plugins.mixer.allow_extended_volume"):
+    if ALLOW_EXTENDED_VOLUME.value:
         return snap(value, 0.8)
     else:
         return value * 0.8
@@ -86,6 +92,15 @@ class Mixer(WindowPlugin):
         self._selection: list[int] = []
         # Length of mapped channels
         self._len = max(map(len, [self._faders, self._knobs]))
+        # The selection only needs updating when the mixer changes
+        self._refresh = RefreshWatcher(MIXER)
+        # Scan for the selected tracks, which runs in the background
+        self._scan: Optional[BackgroundTask[list[int]]] = None
+        # Task runner that the scan was submitted to
+        self._scan_runner: Optional[TaskRunner] = None
+        # Whether the mixer changed while a scan was running, meaning that it
+        # needs to be scanned again once the scan finishes
+        self._rescan = False
 
     @staticmethod
     def getWindowId() -> int:
@@ -98,13 +113,20 @@ class Mixer(WindowPlugin):
     def updateSelected(self):
         """
         Update the list of selected tracks
+        """
+        self.applySelection(getSelectedMixerTracks())
+
+    def applySelection(self, selected: list[int]):
+        """
+        Update the mapped tracks given the list of selected tracks
 
         KNOWN ISSUES:
         * This doesn't respect docking sides: as soon as the mixer rectangle
           can be displayed in a way that respects them, change this
-        """
-        selected = getSelectedMixerTracks()
 
+        ### Args:
+        * `selected` (`list[int]`): selected mixer tracks
+        """
         if len(selected) == 0:
             # No selection, we need to generate one
             if not len(self._selection):
@@ -130,8 +152,61 @@ class Mixer(WindowPlugin):
             self._selection = list(range(first, first+self._len))
             ui.miDisplayRect(first, first+self._len-1, 2000)
 
+    def _startScan(self) -> None:
+        """
+        Start scanning for the selected tracks in the background
+        """
+        self._rescan = False
+        # Scanning all the tracks is slow, so spread it over a few ticks
+        self._scan_runner = getContext().tasks
+        self._scan = self._scan_runner.submit(
+            "Mixer selection",
+            scanSelectedMixerTracks(),
+            self._onScanned,
+        )
+
+    def _isScanning(self) -> bool:
+        """
+        Returns whether a scan is running.
+
+        If the context was reset since the scan started, its task runner is
+        never ticked again, so the scan is cancelled.
+
+        ### Returns:
+        * `bool`: whether a scan is running
+        """
+        if self._scan is None or self._scan.isDone():
+            return False
+        if self._scan_runner is not getContext().tasks:
+            self._scan.cancel()
+            self._scan = None
+            return False
+        return True
+
+    def _onScanned(self, selected: list[int]) -> None:
+        self.applySelection(selected)
+        if self._rescan:
+            self._startScan()
+
     def tick(self):
-        self.updateSelected()
+        if not self._refresh.consume():
+            return
+        if not len(self._selection):
+            # Controls can't be used until there is a selection, so find it
+            # straight away
+            self.updateSelected()
+        elif self._isScanning():
+            # Mixer refreshes arrive continuously during playback, so if the
+            # scan was restarted each time, it might never finish. Instead,
+            # scan again once it is done
+            self._rescan = True
+        else:
+            self._startScan()
+
+    def teardown(self) -> None:
+        self._refresh.stop()
+        if self._scan is not None:
+            self._scan.cancel()
 
     def jogWheel(
         self,
@@ -57,8 +57,13 @@ class DummyDevice(Device):
     """A dummy device so that the script doesn't have a hissy fit during testing
     """
 
-    def __init__(self, device_nam: int = 1) -> None:
-        matcher = BasicControlMatcher()
+    def __init__(
+        self,
+        device_nam: int = 1,
+        matcher: Optional[BasicControlMatcher] = None
+    ) -> None:
+        if matcher is None:
+            matcher = BasicControlMatcher()
         self._num = device_nam
         super().__init__(matcher)
 
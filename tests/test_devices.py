@@ -23,3 +23,77 @@ def test_getUniversalEnquiryResponsePattern():
     for dev in ExtensionManager.getAllDevices():
         d = dev.create(None)
         d.getUniversalEnquiryResponsePattern()
+
+
+def test_tick_registry_skips_idle_controls():
+    """Only controls overriding tick() or with pending updates are ticked"""
+    from common.types import Color
+    from controlsurfaces import Note, TickRegistry
+
+    class TickingNote(Note):
+        def tick(self) -> None:
+            pass
+
+    idle = Note(0)
+    updated = Note(1)
+    ticking = TickingNote(2)
+    registry = TickRegistry()
+    for c in (idle, updated, ticking):
+        registry.register(c)
+
+    updated.color = Color.fromInteger(0xFFFFFF)
+    assert list(registry.getActive()) == [ticking, updated]
+    updated.doTick()
+    assert not updated.got_update
+    # Pending controls are only ticked once
+    assert list(registry.getActive()) == [ticking]
+
+
+def test_tick_registry_includes_added_controls():
+    """Controls added to the matcher after the device is created are ticked"""
+    from controlsurfaces import Note
+    from devices import BasicControlMatcher
+    from tests.helpers import DummyDevice
+
+    ticks = []
+
+    class TickingNote(Note):
+        def tick(self) -> None:
+            ticks.append(self)
+
+    matcher = BasicControlMatcher()
+    device = DummyDevice(1, matcher)
+    note = TickingNote(0)
+    matcher.addControl(note)
+    device.doTick()
+    assert ticks == [note]
+
+
+def test_matcher_registry_rebuilt_on_add():
+    """Cached controls and groups are refreshed when controls are added"""
+    from controlsurfaces import Note
+    from devices import BasicControlMatcher
+    from devices.controlgenerators import NoteMatcher
+
+    matcher = BasicControlMatcher()
+    note = Note(0)
+    matcher.addControl(note)
+    version = matcher.getVersion()
+    assert matcher.getControls() == [note]
+    assert matcher.getGroups() == {"notes"}
+    # Cached results are reused while nothing changes
+    assert matcher.getControls() is matcher.getControls()
+
+    sub = BasicControlMatcher()
+    matcher.addSubMatcher(sub)
+    assert matcher.getVersion() != version
+    version = matcher.getVersion()
+    # Changes to sub-matchers are detected too
+    other = Note(1)
+    sub.addControl(other)
+    assert matcher.getVersion() != version
+    assert matcher.getControls("notes") == [note, other]
+
+    matcher.addSubMatcher(NoteMatcher())
+    assert len(matcher.getControls()) == 130
+    assert matcher.getControls("drum pads") == []
@@ -0,0 +1,267 @@
+"""
+tests > test_deviceshadow
+
+Tests for binding controls using device shadows
+"""
+
+import pytest
+
+from common.eventpattern import BasicPattern
+from controlsurfaces import Fader, Knob
+from controlsurfaces.valuestrategies import Data2Strategy
+from devices import BasicControlMatcher, DeviceShadow
+
+from tests.helpers import DummyDevice
+
+
+class FaderDevice(DummyDevice):
+    """A dummy device with some faders and knobs"""
+
+    def __init__(self, device_num: int = 1) -> None:
+        matcher = BasicControlMatcher()
+        # Add faders in reverse order to ensure they're sorted by coordinate
+        for i in reversed(range(4)):
+            matcher.addControl(Fader(
+                BasicPattern(0xB0, i, ...), Data2Strategy(), (0, i)
+            ))
+        for i in range(2):
+            matcher.addControl(Knob(
+                BasicPattern(0xB0, 0x10 + i, ...), Data2Strategy(), (0, i)
+            ))
+        super().__init__(device_num, matcher)
+
+
+def callback(*args) -> bool:
+    return True
+
+
+def test_bind_matches_sorted():
+    shadow = DeviceShadow(FaderDevice())
+    faders = shadow.bindMatches(Fader, callback)
+    assert [f.coordinate for f in faders] == [(0, i) for i in range(4)]
+    # All faders are now bound
+    assert shadow.bindMatches(Fader, callback, raise_on_failure=False) == []
+
+
+def test_bind_matches_target():
+    shadow = DeviceShadow(FaderDevice())
+    first = shadow.bindMatches(Fader, callback, target_num=3)
+    assert len(first) == 3
+    # Not enough faders remain
+    with pytest.raises(ValueError):
+        shadow.bindMatches(Fader, callback, target_num=3)
+    assert len(shadow.bindMatches(Fader, callback)) == 1
+
+
+def test_bind_matches_substitution():
+    shadow = DeviceShadow(FaderDevice())
+    shadow.bindMatches(Fader, callback)
+    knobs = shadow.bindMatches(
+        Fader, callback, target_num=2, allow_substitution=True)
+    assert all(isinstance(k.getControl(), Knob) for k in knobs)
+
+
+def test_bind_control_not_free():
+    shadow = DeviceShadow(FaderDevice())
+    fader = shadow.bindMatch(Fader, callback)
+    assert fader is not None
+    with pytest.raises(ValueError):
+        shadow.bindControl(fader, callback)
+
+
+def test_shadows_share_index():
+    device = FaderDevice()
+    a = DeviceShadow(device)
+    b = DeviceShadow(device)
+    a.bindMatches(Fader, callback)
+    # Binding in one shadow doesn't affect the other
+    assert len(b.bindMatches(Fader, callback)) == 4
+
+
+def test_shadows_created_lazily():
+    device = FaderDevice()
+    shadow = DeviceShadow(device)
+    assert shadow.getNumControlMatches(Fader) == 4
+    assert len(shadow._shadows) == 0
+    shadow.bindMatch(Fader, callback)
+    assert len(shadow._shadows) == 1
+
+
+def test_apply_untouched_controls_default():
+    from common.types import Color
+    device = FaderDevice()
+    for c in device.getControls():
+        c.color = Color.fromInteger(0xFFFFFF)
+    shadow = DeviceShadow(device)
+    fader = shadow.bindMatch(Fader, callback)
+    assert fader is not None
+    fader.color = Color.fromInteger(0xFF0000)
+    shadow.apply(thorough=True)
+    assert fader.getControl().color == Color.fromInteger(0xFF0000)
+    # Controls that were never touched are reset to their default state
+    assert all(
+        c.color == Color()
+        for c in device.getControls() if c is not fader.getControl()
+    )
+
+
+def test_binding_plan_replay():
+    from devices import BindingPlan
+    device = FaderDevice()
+    plan = BindingPlan(device)
+    first = DeviceShadow(device, plan)
+    recorded = first.bindMatches(Fader, callback, target_num=3)
+    plan.finishRecording()
+    # A new device of the same type binds to the same controls
+    other = FaderDevice()
+    second = DeviceShadow(other, plan)
+    replayed = second.bindMatches(Fader, callback, target_num=3)
+    assert plan.isValid()
+    assert [c.coordinate for c in replayed] \
+        == [c.coordinate for c in recorded]
+    assert all(c.getControl() in other.getControls() for c in replayed)
+
+
+def test_binding_plan_invalidated():
+    from devices import BindingPlan
+    device = FaderDevice()
+    plan = BindingPlan(device)
+    DeviceShadow(device, plan).bindMatches(Fader, callback, target_num=3)
+    plan.finishRecording()
+    # Different searches are made normally
+    shadow = DeviceShadow(device, plan)
+    assert len(shadow.bindMatches(Knob, callback)) == 2
+    assert not plan.isValid()
+
+
+def test_binding_plan_layout():
+    from devices import BindingPlan
+    plan = BindingPlan(FaderDevice())
+    assert plan.matchesDevice(FaderDevice())
+    # A device with the same number of controls in a different layout
+    matcher = BasicControlMatcher()
+    for i in range(6):
+        matcher.addControl(Knob(
+            BasicPattern(0xB0, i, ...), Data2Strategy(), (0, i)
+        ))
+    assert not plan.matchesDevice(DummyDevice(1, matcher))
+
+
+def test_compositor_single_update():
+    from common.types import Color
+    device = FaderDevice()
+    base = DeviceShadow(device)
+    top = DeviceShadow(device)
+    top.setTransparent(True)
+    base_fader = base.bindMatch(Fader, callback)
+    top_fader = top.bindMatch(Fader, callback)
+    assert base_fader is not None and top_fader is not None
+    fader = base_fader.getControl()
+    changes = []
+    fader.onColorChange = lambda: changes.append(fader.color)  # type: ignore
+    base_fader.color = Color.fromInteger(0xFF0000)
+    top_fader.color = Color.fromInteger(0x00FF00)
+    compositor = device.getCompositor()
+    base.apply(True, compositor)
+    top.apply(True, compositor)
+    # Nothing is sent until the frame is committed
+    assert changes == []
+    compositor.commit()
+    # Only the top layer's colour is sent
+    assert changes == [Color.fromInteger(0x00FF00)]
+
+
+def test_compositor_reuses_skipped_layer():
+    from common.types import Color
+    device = FaderDevice()
+    base = DeviceShadow(device)
+    top = DeviceShadow(device)
+    base_fader = base.bindMatch(Fader, callback)
+    top_fader = top.bindMatch(Fader, callback)
+    assert base_fader is not None and top_fader is not None
+    fader = base_fader.getControl()
+    base_fader.color = Color.fromInteger(0xFF0000)
+    top_fader.color = Color.fromInteger(0x00FF00)
+    compositor = device.getCompositor()
+    for applied in (True, False):
+        compositor.beginLayer(base)
+        base.apply(True, compositor)
+        compositor.endLayer()
+        # The top layer is only applied on the first frame, as if it were
+        # skipped by its apply rate on the second
+        compositor.beginLayer(top)
+        if applied:
+            top.apply(True, compositor)
+        compositor.endLayer(applied)
+        compositor.commit()
+        assert fader.color == Color.fromInteger(0x00FF00)
+        base_fader.color = Color.fromInteger(0x0000FF)
+
+
+def test_routing_table_order():
+    from controlsurfaces import ControlEvent
+    from plugs import Plugin, RoutingTable
+    device = FaderDevice()
+    calls = []
+
+    class RoutedPlugin(Plugin):
+        @classmethod
+        def create(cls, shadow: DeviceShadow) -> 'RoutedPlugin':
+            return cls(shadow, [])
+
+    def make(name: str, handle: bool) -> Plugin:
+        shadow = DeviceShadow(device)
+        shadow.bindMatch(Fader, lambda *_: calls.append(name) or handle)
+        return RoutedPlugin.create(shadow)
+
+    table = RoutingTable()
+    table.update([make("first", False), make("second", True)])
+    faders = {
+        c.coordinate: c for c in device.getControls() if isinstance(c, Fader)
+    }
+    # Both plugins bind the first fader
+    first = faders[(0, 0)]
+    assert table.processEvent(ControlEvent(first, 0.5, 0, False), None)
+    assert calls == ["first", "second"]
+    # Controls that nobody bound are rejected immediately
+    other = faders[(0, 1)]
+    assert not table.processEvent(ControlEvent(other, 0.5, 0, False), None)
+    assert calls == ["first", "second"]
+
+
+def test_routes_invalidated_on_focus_change():
+    from common import getContext, unsafeResetContext
+    from common.states.mainstate import MainState
+    unsafeResetContext()
+    state = MainState(FaderDevice())
+    active = getContext().active
+    active.setSplitWindowsPlugins(True)
+    state._updateRoutes(None)
+    # Toggling between plugins and windows from an event changes the active
+    # plugin, so events before the next tick need new routes
+    active.toggleWindowsPlugins()
+    assert not state._routes.isBuilt()
+    unsafeResetContext()
+
+
+def test_scan_restarted_after_context_reset():
+    from common import getContext, unsafeResetContext
+    from common.refresh import MIXER
+    from plugs.windows.mixer import Mixer
+    unsafeResetContext()
+    plug = Mixer(DeviceShadow(FaderDevice()))
+    # The first tick finds the selection straight away
+    plug.tick()
+    getContext().refreshes.publish(MIXER)
+    plug.tick()
+    old_scan = plug._scan
+    assert old_scan is not None and not old_scan.isDone()
+    # The old task runner is never ticked again, so a new scan should be
+    # started using the new one
+    unsafeResetContext()
+    plug.tick()
+    assert old_scan.isDone()
+    assert plug._scan is not old_scan
+    assert len(getContext().tasks) == 1
+    plug.teardown()
+    unsafeResetContext()
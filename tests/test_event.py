@@ -22,3 +22,53 @@ def test_event_filter_standard():
 def test_event_filter_sysex():
     assert isEventSysex(EventData([1, 2, 3]))
     assert not isEventStandard(EventData([4, 5, 6]))
+
+
+def test_input_queue():
+    from common.inputqueue import InputQueue, isEventDeferrable
+    # Notes and sysex are processed immediately
+    assert not isEventDeferrable(EventData(0x91, 60, 127))
+    assert not isEventDeferrable(EventData([0xF0, 0x7E, 0xF7]))
+    assert isEventDeferrable(EventData(0xB0, 1, 64))
+    q = InputQueue(2)
+    assert q.push(EventData(0xB0, 1, 1))
+    assert q.push(EventData(0xB0, 1, 2))
+    assert not q.push(EventData(0xB0, 1, 3))
+    assert q.drain() == [EventData(0xB0, 1, 1), EventData(0xB0, 1, 2)]
+    # Wraps around the end of the buffer
+    assert q.push(EventData(0xB0, 2, 1))
+    assert q.drain() == [EventData(0xB0, 2, 1)]
+    assert len(q) == 0 and q.overflows == 1
+
+
+def test_input_queue_overflow_order():
+    from common.contextmanager import getContext, unsafeResetContext
+    from common.inputqueue import InputQueue
+    from common.states import IScriptState
+
+    class RecordingState(IScriptState):
+        def __init__(self) -> None:
+            self.events: list[EventData] = []
+
+        def initialise(self) -> None:
+            pass
+
+        def deinitialise(self) -> None:
+            pass
+
+        def tick(self) -> None:
+            pass
+
+        def processEvent(self, event: EventData) -> None:
+            self.events.append(event)
+
+    unsafeResetContext()
+    context = getContext()
+    state = RecordingState()
+    context.state = state
+    context.input_queue = InputQueue(1)
+    context.processEvent(EventData(0xB0, 1, 1))
+    # When the queue is full, queued events are processed first
+    context.processEvent(EventData(0xB0, 1, 2))
+    assert [e.data2 for e in state.events] == [1, 2]
+    unsafeResetContext()
@@ -0,0 +1,36 @@
+"""
+tests > test_manifest
+
+Tests that the manifests used to lazily import extensions are up to date
+"""
+
+import os
+
+from common.util.genmanifest import (
+    ROOT,
+    generatePluginManifest,
+    generateDeviceManifest,
+)
+
+
+def test_plugin_manifest_up_to_date():
+    with open(os.path.join(ROOT, 'plugs', 'manifest.py')) as f:
+        assert f.read() == generatePluginManifest(), \
+            "Plugin manifest is out of date. Run " \
+            "`python -m common.util.genmanifest` to update it."
+
+
+def test_device_manifest_up_to_date():
+    with open(os.path.join(ROOT, 'devices', 'manifest.py')) as f:
+        assert f.read() == generateDeviceManifest(), \
+            "Device manifest is out of date. Run " \
+            "`python -m common.util.genmanifest` to update it."
+
+
+def test_device_manifest_enquiry():
+    from common import ExtensionManager
+    from common.types import EventData
+    # Launchkey Mk2 25 enquiry response
+    sysex = [0xF0, 0x7E, 0x00, 0x06, 0x02, 0x00, 0x20, 0x29, 0x7B, 0xF7]
+    dev = ExtensionManager.getDevice(EventData(sysex))
+    assert type(dev).__name__ == 'LaunchkeyMk2_25'
@@ -9,7 +9,8 @@ Authors:
 
 from common.util.dicttools import (
     recursiveMergeDictionaries,
-    expandDictShorthand
+    expandDictShorthand,
+    flattenDict,
 )
 from common.util.snap import snap
 
@@ -82,7 +83,265 @@ def test_recursive_merge_simple():
     assert recursiveMergeDictionaries(ref, over) == exp
 
 
+def test_flatten_dict():
+    t = {
+        "a": {
+            "b": 1,
+            "c": {
+                "d": 2,
+            },
+        },
+        "e": 3,
+    }
+    assert flattenDict(t) == {
+        "a": t["a"],
+        "a.b": 1,
+        "a.c": t["a"]["c"],
+        "a.c.d": 2,
+        "e": 3,
+    }
+
+
+def test_setting_handles():
+    from common.contextmanager import getContext, unsafeResetContext
+    from common.settings import Settings
+    h = Settings.handle("controls.double_press_time")
+    assert Settings.handle("controls.double_press_time") is h
+    h.value = None
+    # Loading the settings updates existing handles
+    unsafeResetContext()
+    assert h.value == getContext().settings.get("controls.double_press_time")
+
+
 def test_snap():
     # TODO: Use contexts to set settings
     assert snap(0.1, 0.2) == 0.1
     assert snap(0.181, 0.2) == 0.2
+
+
+def test_lru_cache_eviction():
+    from common.util.lrucache import LruCache
+    discarded = []
+    cache: LruCache[str, int] = LruCache(2, discarded.append)
+    cache.add("a", 1)
+    cache.add("b", 2)
+    # Using a makes b the least recently used
+    assert cache.get("a") == 1
+    cache.add("c", 3)
+    assert discarded == [2]
+    assert "b" not in cache
+    assert cache.get("b") is None
+    assert (cache.hits, cache.misses, cache.evictions) == (1, 1, 1)
+    cache.setCapacity(1)
+    assert discarded == [2, 1]
+    assert list(cache.keys()) == ["c"]
+
+
+def test_startup_profile_dump():
+    import json
+    from common.profiler import StartupProfile
+    profile = StartupProfile()
+    profile.start(0.0)
+    profile.addPhase('Load "settings"', 0.5, 1.0)
+    profile.importModule("json")
+    profile.finish()
+    profile.addPhase("Ignored", 2.0, 3.0)
+    dump = json.loads(profile.dump())
+    assert dump["phases"][0] == {
+        "name": 'Load "settings"', "start": 500.0, "time": 500.0
+    }
+    assert [p["name"] for p in dump["phases"]] \
+        == ['Load "settings"', "Finished"]
+    assert abs(dump["total"] - profile.getTotal()) < 0.001
+
+
+def test_scheduler_rotates_deferred_tasks():
+    from common.scheduler import TickScheduler
+    scheduler = TickScheduler()
+    ran = []
+    # Without any budget, only essential tasks run
+    scheduler.beginTick(0.0)
+    assert scheduler.run("Apply", ran.append, "apply", essential=True)
+    assert not scheduler.run("Tick", ran.append, "tick")
+    assert ran == ["apply"]
+    # Deferred tasks are guaranteed to run on the next tick
+    scheduler.beginTick(0.0)
+    assert scheduler.run("Tick", ran.append, "tick")
+    assert ran == ["apply", "tick"]
+    stats = scheduler.getStats()["Tick"]
+    assert (stats.runs, stats.deferrals) == (1, 1)
+    assert scheduler.getOverruns() == {}
+
+
+def test_scheduler_rate_limit():
+    from common.scheduler import TickScheduler
+    scheduler = TickScheduler()
+    ran = []
+    scheduler.beginTick(100.0)
+    assert scheduler.run("Poll", ran.append, 1, rate=0.001)
+    # The rate limit applies even to essential tasks
+    scheduler.beginTick(100.0)
+    assert not scheduler.run("Poll", ran.append, 2, rate=0.001, essential=True)
+    # Without a rate, tasks can run every tick
+    assert scheduler.run("Poll", ran.append, 3)
+    assert ran == [1, 3]
+
+
+def test_refresh_watcher():
+    import midi
+    from common.contextmanager import getContext, unsafeResetContext
+    from common.refresh import RefreshWatcher, decodeRefreshFlags
+    unsafeResetContext()
+    watcher = RefreshWatcher(midi.HW_Dirty_LEDs)
+    # Watchers start in the changed state
+    assert watcher.consume()
+    assert not watcher.consume()
+    getContext().refreshes.publish(midi.HW_Dirty_Mixer_Sel)
+    assert not watcher.consume()
+    getContext().refreshes.publish(midi.HW_Dirty_LEDs)
+    assert watcher.consume()
+    assert decodeRefreshFlags(
+        midi.HW_Dirty_LEDs | midi.HW_Dirty_Mixer_Sel
+    ) == ["Mixer selection", "LEDs"]
+    # Refreshes may be missed when the context is reset
+    unsafeResetContext()
+    assert watcher.consume()
+    watcher.stop()
+
+
+def test_load_controller_levels():
+    from common.contextmanager import unsafeResetContext
+    from common.loadcontroller import LoadController, NORMAL, NO_FADES
+    unsafeResetContext()
+    load = LoadController()
+    # The level rises one step at a time as the average increases
+    for _ in range(100):
+        load.record(100.0)
+    assert load.getLevel() == 4
+    assert load.scalePollRate(0) > 0
+    # And recovers once the load falls
+    for _ in range(100):
+        load.record(1.0)
+    assert load.getLevel() == NORMAL
+    assert load.shouldUpdateAnnotations()
+    load.record(12.0 / 0.1)
+    assert load.getLevel() == NO_FADES
+
+
+def test_idle_detector():
+    from common.contextmanager import unsafeResetContext
+    from common.idledetector import IdleDetector
+    unsafeResetContext()
+    idle = IdleDetector()
+    assert not idle.shouldSkipTick()
+    # Pretend that nothing has happened for a while
+    idle._last_activity -= 60
+    assert idle.shouldSkipTick()
+    assert idle.isIdle()
+    # Maintenance ticks still run occasionally
+    idle._last_maintenance -= 60
+    assert not idle.shouldSkipTick()
+    assert idle.shouldSkipTick()
+    idle.wake("input")
+    assert not idle.isIdle()
+    assert not idle.shouldSkipTick()
+
+
+def test_background_tasks():
+    from common.backgroundtasks import TaskRunner, runToCompletion
+
+    def count(n: int):
+        for i in range(n):
+            yield
+        return n
+
+    assert runToCompletion(count(3)) == 3
+    runner = TaskRunner()
+    results = []
+    runner.submit("a", count(2), results.append)
+    cancelled = runner.submit("b", count(2), results.append)
+    # Without a budget, a single slice is run each tick, alternating between
+    # tasks
+    runner.tick(0)
+    cancelled.cancel()
+    runner.tick(0)
+    runner.tick(0)
+    assert results == []
+    runner.tick(0)
+    assert results == [2]
+    assert len(runner) == 0
+
+
+def test_focus_snapshot_reused(monkeypatch):
+    import ui
+    from common.activitystate import ActivityState
+    calls = []
+
+    def getFocused(index):
+        calls.append(index)
+        return index == 6
+
+    monkeypatch.setattr(ui, "getFocusedFormID", lambda: 4194304 + 65536)
+    monkeypatch.setattr(ui, "getFocused", getFocused)
+    state = ActivityState()
+    state.tick()
+    assert state.getPlugin() == (1, 1)
+    assert len(calls) == 2
+    # The form ID hasn't changed, so the focus isn't checked again
+    state.tick()
+    assert len(calls) == 2
+    assert state.reused_snapshots == 1
+    # Unless FL Studio says that the focus changed
+    state.invalidateFocus()
+    state.tick()
+    assert len(calls) == 4
+
+
+def test_focus_changes_published(monkeypatch):
+    import ui
+    from common.activitystate import ActivityState
+    from common.focuschanges import GeneratorChanged, SplitToggled
+    events = []
+    form = {"id": 1, "channel": True}
+    monkeypatch.setattr(ui, "getFocusedFormID", lambda: form["id"])
+    monkeypatch.setattr(
+        ui, "getFocused", lambda i: i == 7 and form["channel"])
+    state = ActivityState()
+    state.changes.subscribe(events.append)
+    state.tick()
+    assert [type(e) for e in events] == [GeneratorChanged]
+    assert events[0].new == (1,)
+    # Nothing changed, so nothing is published
+    state.tick()
+    assert len(events) == 1
+    # Focusing a window switches to addressing windows
+    form["channel"] = False
+    state.invalidateFocus()
+    state.tick()
+    assert isinstance(events[-1], SplitToggled)
+    assert not events[-1].plugins
+
+
+def test_config_reloaded_when_changed(tmp_path, monkeypatch):
+    import sys
+    from common.settings import ConfigCache
+    config = tmp_path / "config.py"
+    config.write_text("CONFIG = {}\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "config", raising=False)
+    cache = ConfigCache()
+    changes = []
+    cache.subscribe(changes.append)
+    cache.load()
+    # The file hasn't changed, so it isn't loaded again
+    cache.load()
+    assert cache.loads == 1
+    config.write_text("CONFIG = {'controls.double_press_time': 1.0}\n")
+    flat, changed = cache.load()
+    cache.notify(changed)
+    assert cache.loads == 2
+    assert flat["controls.double_press_time"] == 1.0
+    assert changes == [["controls.double_press_time"]]
+    # Each load gets its own copy of the categories
+    flat["controls"]["double_press_time"] = 2.0
+    assert cache.load()[0]["controls"]["double_press_time"] == 1.0